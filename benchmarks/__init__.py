@@ -0,0 +1,12 @@
+"""
+Offline benchmarks for Jawa.
+
+Every ``bench_*`` function in a ``bench_*.py`` module in this package performs
+its own setup and returns a zero-argument callable, which is what actually
+gets timed. Run them all with ``python -m benchmarks``, which can also save
+the results as JSON and compare them against an earlier run.
+
+Benchmarks that need a classpath use the synthetic JARs built by
+:mod:`benchmarks.generate`, scaled by the ``JAWA_BENCH_SCALE`` environment
+variable.
+"""
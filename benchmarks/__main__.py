@@ -0,0 +1,139 @@
+"""
+Runs every benchmark in this package and optionally saves the results as
+JSON, to compare against the results from another commit::
+
+    python -m benchmarks --output benchmarks/results/before.json
+    git checkout my-branch
+    python -m benchmarks --output benchmarks/results/after.json \
+        --compare benchmarks/results/before.json
+
+Results saved under ``benchmarks/results/`` are ignored by git.
+"""
+import re
+import sys
+import json
+import time
+import timeit
+import pkgutil
+import argparse
+import platform
+import importlib
+import subprocess
+from pathlib import Path
+
+
+def discover(pattern: str=None):
+    """
+    Yields a ``(name, function)`` tuple for every ``bench_*`` function in
+    every ``bench_*`` module of this package, sorted by name.
+
+    :param pattern: Only include benchmarks whose full name, such as
+                    ``bench_tables.bench_locals_at``, contains a match for
+                    this regular expression.
+    """
+    package = Path(__file__).parent
+    for info in sorted(pkgutil.iter_modules([str(package)]),
+                       key=lambda info: info.name):
+        if not info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module(f'{__package__}.{info.name}')
+        for attr in sorted(dir(module)):
+            if not attr.startswith('bench_'):
+                continue
+            name = f'{info.name}.{attr}'
+            if pattern is None or re.search(pattern, name):
+                yield name, getattr(module, attr)
+
+
+def run(bench, number: int, repeat: int) -> dict:
+    """Set up and time a single benchmark, returning its results."""
+    start = time.perf_counter()
+    func = bench()
+    setup = time.perf_counter() - start
+
+    timings = [t / number for t in timeit.repeat(
+        func,
+        number=number,
+        repeat=repeat
+    )]
+    return {
+        'min': min(timings),
+        'mean': sum(timings) / len(timings),
+        'number': number,
+        'repeat': repeat,
+        'setup': setup
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=Path(__file__).parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '-k',
+        dest='pattern',
+        help='Only run benchmarks matching this regular expression.'
+    )
+    parser.add_argument(
+        '--number',
+        type=int,
+        default=3,
+        help='Calls per timing. [default: 3]'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timings per benchmark, of which the fastest is reported.'
+             ' [default: 3]'
+    )
+    parser.add_argument('--output', help='Save the results to this file.')
+    parser.add_argument(
+        '--compare',
+        help='Compare against the results saved in this file.'
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fin:
+            baseline = json.load(fin)['results']
+
+    results = {}
+    for name, bench in discover(args.pattern):
+        result = results[name] = run(bench, args.number, args.repeat)
+        line = f'{name}: {result["min"] * 1000:.3f}ms'
+        previous = baseline.get(name)
+        if previous is not None:
+            ratio = result['min'] / previous['min']
+            line += f' ({ratio:.2f}x {previous["min"] * 1000:.3f}ms)'
+        print(line, flush=True)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as out:
+            json.dump({
+                'commit': _commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': results
+            }, out, indent=2, sort_keys=True)
+
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
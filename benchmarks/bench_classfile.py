@@ -0,0 +1,56 @@
+"""
+Benchmarks for parsing, saving and disassembling ClassFiles, on generated
+JARs held in memory so that only Jawa itself is timed.
+"""
+import io
+
+from jawa.cf import ClassFile
+from benchmarks.generate import cached_jar, read_classes
+
+
+def _parse(preset):
+    classes = list(read_classes(cached_jar(preset)).values())
+    return lambda: [ClassFile(buff) for buff in classes]
+
+
+def _disassemble(preset):
+    codes = [
+        method.code
+        for buff in read_classes(cached_jar(preset)).values()
+        for method in ClassFile(buff).methods
+    ]
+
+    def run():
+        for code in codes:
+            for ins in code.disassemble(transforms=[]):
+                pass
+    return run
+
+
+def bench_parse():
+    return _parse('default')
+
+
+def bench_parse_big_pools():
+    return _parse('big-pools')
+
+
+def bench_save():
+    classes = [
+        ClassFile(buff)
+        for buff in read_classes(cached_jar('default')).values()
+    ]
+
+    def run():
+        for cf in classes:
+            with io.BytesIO() as out:
+                cf.save(out)
+    return run
+
+
+def bench_disassemble():
+    return _disassemble('default')
+
+
+def bench_disassemble_huge_methods():
+    return _disassemble('huge-methods')
@@ -0,0 +1,46 @@
+"""
+Benchmarks for searching and indexing a whole classpath through the
+ClassLoader, and for its class cache.
+"""
+import re
+
+from jawa.classloader import ClassLoader
+from benchmarks.generate import cached_jar
+
+
+def bench_grep():
+    # The same search as ``jawa grep --jobs 1``.
+    loader = ClassLoader(cached_jar('default'), max_cache=-1)
+    classes = list(loader.classes)
+    r = re.compile(r'bench/p1/C\d+\.m3 #12')
+    return lambda: list(loader.grep(r, classes=classes, workers=1,
+                                    first=True))
+
+
+def bench_dependencies():
+    loader = ClassLoader(cached_jar('default'))
+    return lambda: loader.dependency_graph(workers=1)
+
+
+def bench_hierarchy_deep():
+    path = cached_jar('deep-hierarchy')
+
+    def run():
+        hierarchy = ClassLoader(path).hierarchy()
+        hierarchy.subclasses('java/lang/Object')
+    return run
+
+
+def bench_cache_hits():
+    loader = ClassLoader(cached_jar('default'), max_cache=-1)
+    classes = list(loader.classes)
+    for klass in classes:
+        loader.load(klass)
+    return lambda: [loader.load(klass) for klass in classes]
+
+
+def bench_cache_misses():
+    # Cycling through more classes than fit in the cache misses every time.
+    loader = ClassLoader(cached_jar('default'), max_cache=50)
+    classes = list(loader.classes)
+    return lambda: [loader.load(klass) for klass in classes]
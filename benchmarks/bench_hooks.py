@@ -0,0 +1,80 @@
+"""
+Benchmarks for the overhead of :mod:`jawa.hooks` on the hot paths they
+instrument. Compare each ``_disabled`` benchmark against its ``_enabled``
+counterpart, and against the same benchmark from before hooks existed.
+"""
+from pathlib import Path
+
+from jawa import hooks
+from jawa.cf import ClassFile
+
+#: The number of times each class is parsed per run.
+ROUNDS = 200
+
+_DATA = Path(__file__).parent.parent / 'tests' / 'data'
+
+
+def _classes():
+    return [path.read_bytes() for path in sorted(_DATA.glob('*.class'))]
+
+
+def _noop(event, subject):
+    return _noop_end
+
+
+def _noop_end(details):
+    pass
+
+
+def _with_hooks(func):
+    # Registered only while running, so other benchmarks aren't affected.
+    def run():
+        for event in hooks.EVENTS:
+            hooks.on(event, _noop)
+        try:
+            func()
+        finally:
+            for event in hooks.EVENTS:
+                hooks.off(event, _noop)
+    return run
+
+
+def _parse(classes):
+    def run():
+        for _ in range(ROUNDS):
+            for buff in classes:
+                cf = ClassFile(buff)
+                for attribute in cf.attributes:
+                    pass
+    return run
+
+
+def _disassemble(classes):
+    methods = [
+        method.code
+        for buff in classes
+        for method in ClassFile(buff).methods if method.code
+    ]
+
+    def run():
+        for _ in range(ROUNDS):
+            for code in methods:
+                for ins in code.disassemble(transforms=[]):
+                    pass
+    return run
+
+
+def bench_parse_hooks_disabled():
+    return _parse(_classes())
+
+
+def bench_parse_hooks_enabled():
+    return _with_hooks(_parse(_classes()))
+
+
+def bench_disassemble_hooks_disabled():
+    return _disassemble(_classes())
+
+
+def bench_disassemble_hooks_enabled():
+    return _with_hooks(_disassemble(_classes()))
@@ -0,0 +1,85 @@
+"""
+Benchmarks for the packed u2 tables used by debug attributes.
+"""
+from array import array
+
+from jawa.cf import ClassFile
+from jawa.util.stream import BufferStreamReader
+from jawa.attributes.line_number_table import LineNumberTableAttribute
+from jawa.attributes.local_variable import LocalVariableTableAttribute
+
+#: The number of rows in each benchmarked table.
+ROWS = 50000
+#: The number of locals in the table of nested scopes.
+NESTED = 3000
+
+
+def _code():
+    cf = ClassFile.create('BenchTables')
+    return cf.methods.create('test', '()V', code=True).code
+
+
+def _line_numbers():
+    a = _code().attributes.create(LineNumberTableAttribute)
+    a.line_no = ((i, i % 65536) for i in range(ROWS))
+    return a
+
+
+def _local_variables():
+    a = _code().attributes.create(LocalVariableTableAttribute)
+    a.local_variables = ((i % 65536, 1, 2, 3, i % 256) for i in range(ROWS))
+    return a
+
+
+def _nested_local_variables():
+    # Every local stays in scope until the end of the method, as with
+    # locals declared one after another in a long method body.
+    a = _code().attributes.create(LocalVariableTableAttribute)
+    a.local_variables = (
+        (i, NESTED - i, 2, 3, i % 256) for i in range(NESTED)
+    )
+    return a
+
+
+def bench_line_number_pack():
+    return _line_numbers().pack
+
+
+def bench_line_number_unpack():
+    a = _line_numbers()
+    info = a.pack()
+    return lambda: a.unpack(BufferStreamReader(info))
+
+
+def bench_local_variable_pack():
+    return _local_variables().pack
+
+
+def bench_local_variable_unpack():
+    a = _local_variables()
+    info = a.pack()
+    return lambda: a.unpack(BufferStreamReader(info))
+
+
+def bench_line_for_pc():
+    a = _line_numbers()
+    pcs = range(0, ROWS, 7)
+    return lambda: [a.line_for_pc(pc) for pc in pcs]
+
+
+def bench_lines_for_pcs():
+    a = _line_numbers()
+    pcs = array('H', range(0, ROWS, 7))
+    return lambda: a.lines_for_pcs(pcs)
+
+
+def bench_locals_at():
+    a = _local_variables()
+    pcs = range(0, ROWS, 7)
+    return lambda: [a.locals_at(pc) for pc in pcs]
+
+
+def bench_nested_locals_at():
+    a = _nested_local_variables()
+    pcs = range(0, NESTED, 7)
+    return lambda: [a.locals_at(pc) for pc in pcs]
@@ -0,0 +1,196 @@
+"""
+Generates synthetic JARs to benchmark against, so the suite can run offline
+and without a JDK.
+
+Every class is built with :meth:`~jawa.cf.ClassFile.create`,
+:meth:`~jawa.methods.MethodTable.create` and :func:`~jawa.assemble.assemble`,
+and the output only depends on the options, so the same options always
+produce the same JAR::
+
+    python -m benchmarks.generate app.jar --classes 10000 --depth 8
+"""
+import os
+import hashlib
+import argparse
+import tempfile
+import zipfile
+from io import BytesIO
+
+from jawa.cf import ClassFile
+from jawa.assemble import assemble
+
+
+#: Named sets of options for :func:`generate_jar`, each stressing something
+#: different.
+PRESETS = {
+    'default': {},
+    'many-classes': {'classes': 10000},
+    'big-pools': {'classes': 200, 'constants': 5000},
+    'huge-methods': {'classes': 50, 'methods': 4, 'method_size': 8000},
+    'deep-hierarchy': {'classes': 2000, 'depth': 200}
+}
+
+_DEFAULTS = {
+    'classes': 1000,
+    'packages': 20,
+    'constants': 50,
+    'methods': 5,
+    'method_size': 20,
+    'depth': 4
+}
+
+
+def class_name(i: int, packages: int) -> str:
+    """Returns the name of the `i`th generated class."""
+    return f'bench/p{i % packages}/C{i}'
+
+
+def generate_class(i: int, *, classes: int, packages: int, constants: int,
+                   methods: int, method_size: int, depth: int) -> ClassFile:
+    """
+    Build the `i`th class of a generated JAR.
+
+    Classes extend the previous class in chains of `depth`, have
+    `constants` extra String constants, and `methods` static methods that
+    each run `method_size` instructions alternating between loading a
+    String and calling a method on another class.
+    """
+    name = class_name(i, packages)
+    if i % depth:
+        super_ = class_name(i - 1, packages)
+    else:
+        super_ = 'java/lang/Object'
+
+    cf = ClassFile.create(name, super_)
+    for j in range(constants):
+        cf.constants.create_string(f'{name} constant #{j}')
+
+    # Constants are reused between instructions, so that huge methods
+    # don't overflow the constant pool.
+    refs = {}
+
+    def method_ref(k):
+        key = (i * 31 + k) % classes, k % methods
+        if key not in refs:
+            refs[key] = cf.constants.create_method_ref(
+                class_name(key[0], packages),
+                f'm{key[1]}',
+                '()V'
+            )
+        return refs[key]
+
+    strings = {}
+
+    def string(m, k):
+        key = m, k % 1024
+        if key not in strings:
+            strings[key] = cf.constants.create_string(f'{name}.m{m} #{k}')
+        return strings[key]
+
+    for m in range(methods):
+        method = cf.methods.create(f'm{m}', '()V', code=True)
+        method.access_flags.acc_static = True
+        method.code.max_stack = 1
+        method.code.max_locals = 0
+
+        body = []
+        for k in range(method_size):
+            if k % 2:
+                body.append(('invokestatic', method_ref(k)))
+            else:
+                body.append(('ldc_w', string(m, k)))
+                body.append(('pop',))
+        body.append(('return',))
+        method.code.assemble(assemble(body))
+
+    return cf
+
+
+def generate_jar(path: str, **options) -> str:
+    """
+    Write a JAR of generated classes to `path`, returning `path`.
+
+    :param classes: The number of classes. [default: 1000]
+    :param packages: The number of packages they're spread over.
+    :param constants: Extra String constants in each class.
+    :param methods: Methods in each class.
+    :param method_size: Instructions in each method.
+    :param depth: The length of each chain of subclasses.
+    """
+    options = {**_DEFAULTS, **options}
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(options['classes']):
+            cf = generate_class(i, **options)
+            with BytesIO() as out:
+                cf.save(out)
+                # A fixed timestamp, so the JAR is reproducible.
+                info = zipfile.ZipInfo(f'{cf.this.name.value}.class')
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, out.getvalue())
+    return path
+
+
+def cached_jar(preset: str='default', **options) -> str:
+    """
+    Returns the path to a generated JAR for `preset`, overridden by
+    `options`, generating it in the temporary directory the first time.
+
+    The number of classes is multiplied by the ``JAWA_BENCH_SCALE``
+    environment variable, if set.
+    """
+    options = {**_DEFAULTS, **PRESETS[preset], **options}
+    scale = float(os.environ.get('JAWA_BENCH_SCALE', 1))
+    options['classes'] = max(1, int(options['classes'] * scale))
+
+    key = hashlib.sha1(repr(sorted(options.items())).encode()).hexdigest()
+    path = os.path.join(
+        tempfile.gettempdir(),
+        f'jawa-bench-{preset}-{key[:12]}.jar'
+    )
+    if not os.path.exists(path):
+        # Written under a temporary name, so an interrupted run doesn't
+        # leave a truncated JAR behind.
+        partial = f'{path}.{os.getpid()}.tmp'
+        generate_jar(partial, **options)
+        os.replace(partial, path)
+    return path
+
+
+def read_classes(path: str) -> dict:
+    """Returns the contents of every class in the JAR at `path`."""
+    with zipfile.ZipFile(path) as zf:
+        return {
+            name: zf.read(name)
+            for name in zf.namelist() if name.endswith('.class')
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('path', help='Where to write the JAR.')
+    parser.add_argument(
+        '--preset',
+        choices=sorted(PRESETS),
+        default='default',
+        help='Start from a named set of options.'
+    )
+    for option in sorted(_DEFAULTS):
+        parser.add_argument(
+            f'--{option.replace("_", "-")}',
+            dest=option,
+            type=int,
+            help=f'[default: {_DEFAULTS[option]}]'
+        )
+    args = parser.parse_args(argv)
+
+    options = {**_DEFAULTS, **PRESETS[args.preset]}
+    options.update(
+        (option, getattr(args, option))
+        for option in _DEFAULTS if getattr(args, option) is not None
+    )
+    generate_jar(args.path, **options)
+    print(f'{args.path}: {options["classes"]} classes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+An :mod:`asyncio` front-end for the :class:`~jawa.classloader.ClassLoader`.
+
+Reading, decompressing and parsing classes all block, so the
+:class:`AsyncClassLoader` runs them on a bounded pool of threads, leaving
+the event loop free. That includes indexing the sources given to the
+constructor, which happens the first time the loader is used from a
+coroutine, such as when entering an ``async with`` block::
+
+    >>> async with AsyncClassLoader('app.jar') as loader:
+    ...     cf = await loader.load('com/example/Main')
+    ...     async for path, cf in loader.as_completed(['a/A', 'b/B']):
+    ...         print(path, len(cf.methods))
+"""
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Set, Tuple
+
+from jawa.cf import ClassFile
+from jawa.classloader import ClassLoader
+
+
+class AsyncClassLoader(object):
+    """
+    Wraps a :class:`~jawa.classloader.ClassLoader`, sharing its path map and
+    class cache, so the same loader can be used from both synchronous and
+    asynchronous code.
+
+    :param sources: Optional sources to pass into ``ClassLoader.update()``,
+                    which are indexed on a worker thread rather than in the
+                    constructor.
+    :param loader: An existing ClassLoader to wrap. If not given, one is
+                   created from `sources` and `options`.
+    :param workers: The maximum number of threads used for blocking work.
+                    [default: the number of CPUs + 4, at most 32]
+    :param options: Passed to the ClassLoader when one is created.
+    """
+    def __init__(self, *sources, loader: ClassLoader=None,
+                 workers: int=None, **options):
+        if loader is None:
+            loader = ClassLoader(**options)
+
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)
+
+        #: The wrapped ClassLoader.
+        self.loader = loader
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._sources = sources
+        self._indexing = None
+
+    async def indexed(self):
+        """
+        Wait for the sources given to the constructor to be indexed,
+        starting to index them if nothing has yet. Every other coroutine
+        waits for this first.
+        """
+        if self._indexing is None:
+            self._indexing = asyncio.get_event_loop().run_in_executor(
+                self._executor,
+                lambda: self.loader.update(*self._sources)
+            )
+        await self._indexing
+
+    async def _run(self, func, *args):
+        await self.indexed()
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor,
+            func,
+            *args
+        )
+
+    async def update(self, *sources, **options):
+        """
+        Add one or more ClassFile sources. Takes the same arguments as
+        ``ClassLoader.update()``.
+        """
+        await self._run(lambda: self.loader.update(*sources, **options))
+
+    async def load(self, path: str) -> ClassFile:
+        """
+        Load the class at `path` and return it. Concurrent loads of the same
+        class are coalesced by the underlying ClassLoader.
+
+        :param path: Fully-qualified path to a ClassFile.
+        """
+        return await self._run(self.loader.load, path)
+
+    async def dependencies(self, path: str) -> Set[str]:
+        """
+        Returns a set of all classes referenced by the ClassFile at `path`.
+        See ``ClassLoader.dependencies()``.
+        """
+        return await self._run(self.loader.dependencies, path)
+
+    async def as_completed(self, paths: Iterable[str]) \
+            -> AsyncIterator[Tuple[str, ClassFile]]:
+        """
+        Load every class in `paths`, yielding a ``(path, ClassFile)`` tuple
+        for each as soon as it's ready, in completion order.
+
+        At most twice the number of workers are loaded at once, so `paths`
+        may be arbitrarily long.
+
+        :param paths: Fully-qualified paths to ClassFiles.
+        """
+        paths = iter(paths)
+        pending = {}
+        window = self.workers * 2
+
+        try:
+            while True:
+                for path in paths:
+                    task = asyncio.ensure_future(self.load(path))
+                    pending[task] = path
+                    if len(pending) >= window:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[ClassFile]:
+        """Yield every class in the path map, in completion order."""
+        await self.indexed()
+        async for _, cf in self.as_completed(list(self.loader.classes)):
+            yield cf
+
+    def __contains__(self, path: str) -> bool:
+        # Like classes, only complete once indexed() has returned.
+        return path in self.loader
+
+    @property
+    def classes(self) -> Iterable[str]:
+        """
+        Yield the name of all classes discovered in the path map. The
+        sources given to the constructor are only included once
+        :meth:`indexed` has returned.
+        """
+        return self.loader.classes
+
+    def close(self):
+        """Shut down the worker threads, waiting for any running work."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        await self.indexed()
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_event_loop().run_in_executor(None, self.close)
+
+    def __repr__(self):
+        return f'<AsyncClassLoader(loader={self.loader!r})>'
@@ -5,6 +5,7 @@ from typing import IO, Callable, Iterator, Union, Dict, Any, Tuple
 from struct import unpack, pack
 from itertools import repeat
 
+from jawa import hooks
 from jawa.constants import UTF8
 from jawa.util.stream import BufferStreamReader
 
@@ -85,6 +86,8 @@ class AttributeTable(object):
         attr = self._table[key]
 
         if not isinstance(attr, Attribute):
+            span = hooks.enabled and hooks.begin('attribute.load', self)
+
             name_index, info = attr[0], attr[1]
             name = self.cf.constants[name_index].value
 
@@ -95,6 +98,9 @@ class AttributeTable(object):
             else:
                 attr.unpack(BufferStreamReader(info))
 
+            if span:
+                span.end(attributes_loaded=1)
+
         return attr
 
     def __len__(self):
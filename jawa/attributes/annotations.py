@@ -0,0 +1,452 @@
+"""
+Annotation attributes, as described in sections 4.7.16 through 4.7.22 of the
+JVM specification.
+
+Annotation attributes can be large and are frequently never looked at, so
+each one keeps its raw info blob around and only builds the element-value
+trees the first time they're accessed. If they're never accessed, the
+original blob is written back untouched by ``pack()``.
+
+When only the annotation types are needed, :func:`annotation_types` scans a
+blob for them without building anything at all.
+"""
+import io
+from struct import pack, unpack_from
+from collections import namedtuple
+from typing import Iterator, List
+
+from jawa.attribute import Attribute
+
+
+Annotation = namedtuple('Annotation', [
+    'type_index',
+    'element_value_pairs'
+])
+
+ElementValuePair = namedtuple('ElementValuePair', [
+    'element_name_index',
+    'value'
+])
+
+#: The `value` of an ElementValue depends on its `tag`. For the primitive
+#: and string tags (``BCDFIJSZs``) it's a `const_value_index`, for ``c`` a
+#: `class_info_index`, for ``e`` an :class:`EnumConstValue`, for ``@`` a
+#: nested :class:`Annotation` and for ``[`` a list of ElementValues.
+ElementValue = namedtuple('ElementValue', [
+    'tag',
+    'value'
+])
+
+EnumConstValue = namedtuple('EnumConstValue', [
+    'type_name_index',
+    'const_name_index'
+])
+
+TypeAnnotation = namedtuple('TypeAnnotation', [
+    'target_type',
+    'target_info',
+    'type_path',
+    'annotation'
+])
+
+# The format of the fixed-size target_info for each target_type. The
+# localvar_target (0x40, 0x41) is variable-length and handled separately.
+_TARGET_INFO_FMTS = {
+    0x00: '>B', 0x01: '>B',
+    0x10: '>H',
+    0x11: '>BB', 0x12: '>BB',
+    0x13: '>', 0x14: '>', 0x15: '>',
+    0x16: '>B',
+    0x17: '>H',
+    0x42: '>H',
+    0x43: '>H', 0x44: '>H', 0x45: '>H', 0x46: '>H',
+    0x47: '>HB', 0x48: '>HB', 0x49: '>HB', 0x4A: '>HB', 0x4B: '>HB'
+}
+
+
+def _read_element_value(buff, pos):
+    tag = chr(buff[pos])
+    pos += 1
+    if tag == 'e':
+        value = EnumConstValue(*unpack_from('>HH', buff, pos))
+        pos += 4
+    elif tag == '@':
+        value, pos = _read_annotation(buff, pos)
+    elif tag == '[':
+        count = unpack_from('>H', buff, pos)[0]
+        pos += 2
+        value = []
+        for _ in range(count):
+            element, pos = _read_element_value(buff, pos)
+            value.append(element)
+    else:
+        value = unpack_from('>H', buff, pos)[0]
+        pos += 2
+    return ElementValue(tag, value), pos
+
+
+def _read_annotation(buff, pos):
+    type_index, count = unpack_from('>HH', buff, pos)
+    pos += 4
+    pairs = []
+    for _ in range(count):
+        name_index = unpack_from('>H', buff, pos)[0]
+        value, pos = _read_element_value(buff, pos + 2)
+        pairs.append(ElementValuePair(name_index, value))
+    return Annotation(type_index, pairs), pos
+
+
+def _read_annotations(buff, pos):
+    count = unpack_from('>H', buff, pos)[0]
+    pos += 2
+    annotations = []
+    for _ in range(count):
+        annotation, pos = _read_annotation(buff, pos)
+        annotations.append(annotation)
+    return annotations, pos
+
+
+def _read_type_annotation(buff, pos):
+    target_type = buff[pos]
+    pos += 1
+    if target_type in (0x40, 0x41):
+        count = unpack_from('>H', buff, pos)[0]
+        target_info = tuple(
+            unpack_from('>HHH', buff, pos + 2 + 6 * i)
+            for i in range(count)
+        )
+        pos += 2 + 6 * count
+    else:
+        fmt = _TARGET_INFO_FMTS[target_type]
+        target_info = unpack_from(fmt, buff, pos)
+        pos += sum(2 if c == 'H' else 1 for c in fmt[1:])
+
+    path_length = buff[pos]
+    type_path = tuple(
+        unpack_from('>BB', buff, pos + 1 + 2 * i)
+        for i in range(path_length)
+    )
+    pos += 1 + 2 * path_length
+
+    annotation, pos = _read_annotation(buff, pos)
+    return TypeAnnotation(target_type, target_info, type_path, annotation), pos
+
+
+def _write_element_value(out, element):
+    out.write(element.tag.encode('ascii'))
+    if element.tag == 'e':
+        out.write(pack('>HH', *element.value))
+    elif element.tag == '@':
+        _write_annotation(out, element.value)
+    elif element.tag == '[':
+        out.write(pack('>H', len(element.value)))
+        for value in element.value:
+            _write_element_value(out, value)
+    else:
+        out.write(pack('>H', element.value))
+
+
+def _write_annotation(out, annotation):
+    out.write(pack(
+        '>HH',
+        annotation.type_index,
+        len(annotation.element_value_pairs)
+    ))
+    for pair in annotation.element_value_pairs:
+        out.write(pack('>H', pair.element_name_index))
+        _write_element_value(out, pair.value)
+
+
+def _write_annotations(out, annotations):
+    out.write(pack('>H', len(annotations)))
+    for annotation in annotations:
+        _write_annotation(out, annotation)
+
+
+def _write_type_annotation(out, type_annotation):
+    target_type = type_annotation.target_type
+    out.write(pack('>B', target_type))
+    if target_type in (0x40, 0x41):
+        out.write(pack('>H', len(type_annotation.target_info)))
+        for entry in type_annotation.target_info:
+            out.write(pack('>HHH', *entry))
+    else:
+        out.write(pack(
+            _TARGET_INFO_FMTS[target_type],
+            *type_annotation.target_info
+        ))
+
+    out.write(pack('>B', len(type_annotation.type_path)))
+    for entry in type_annotation.type_path:
+        out.write(pack('>BB', *entry))
+
+    _write_annotation(out, type_annotation.annotation)
+
+
+def _skip_element_value(buff, pos):
+    tag = buff[pos]
+    if tag == 0x65:
+        # 'e'
+        return pos + 5
+    elif tag == 0x40:
+        # '@'
+        return _skip_annotation(buff, pos + 1)[1]
+    elif tag == 0x5B:
+        # '['
+        count = unpack_from('>H', buff, pos + 1)[0]
+        pos += 3
+        for _ in range(count):
+            pos = _skip_element_value(buff, pos)
+        return pos
+    return pos + 3
+
+
+def _skip_annotation(buff, pos):
+    type_index, count = unpack_from('>HH', buff, pos)
+    pos += 4
+    for _ in range(count):
+        pos = _skip_element_value(buff, pos + 2)
+    return type_index, pos
+
+
+def annotation_types(buff, parameters: bool=False) -> Iterator[int]:
+    """
+    Yields the `type_index` of every top-level annotation in the info blob
+    of a ``Runtime[In]VisibleAnnotations`` attribute, skipping over
+    element values without decoding them.
+
+    :param buff: Any bytes-like object containing the attribute's info.
+    :param parameters: True if `buff` is instead the info of a
+                       ``Runtime[In]VisibleParameterAnnotations`` attribute.
+    """
+    pos = 0
+    tables = 1
+    if parameters:
+        tables = buff[0]
+        pos = 1
+
+    for _ in range(tables):
+        count = unpack_from('>H', buff, pos)[0]
+        pos += 2
+        for _ in range(count):
+            type_index, pos = _skip_annotation(buff, pos)
+            yield type_index
+
+
+class _LazyAnnotationsMixin(object):
+    # Shared by every annotation attribute: keep the raw info until the
+    # parsed form is asked for, and write the raw info back if it never is.
+    def _lazy_init(self, default):
+        self._info = None
+        self._parsed = default
+
+    def unpack(self, info):
+        self._info = bytes(info.read())
+        self._parsed = None
+
+    def pack(self):
+        if self._parsed is None:
+            if self._info is None:
+                raise ValueError(
+                    f'{type(self).__name__} has no value to pack'
+                )
+            return self._info
+
+        with io.BytesIO() as out:
+            self._pack_parsed(out, self._parsed)
+            return out.getvalue()
+
+    def _value(self):
+        if self._parsed is None and self._info is not None:
+            self._parsed = self._unpack_parsed(self._info)
+        return self._parsed
+
+
+class RuntimeVisibleAnnotationsAttribute(_LazyAnnotationsMixin, Attribute):
+    ATTRIBUTE_NAME = 'RuntimeVisibleAnnotations'
+    ADDED_IN = '5.0.0'
+    MINIMUM_CLASS_VERSION = (49, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                self.ATTRIBUTE_NAME
+            ).index
+        )
+        self._lazy_init([])
+
+    @staticmethod
+    def _unpack_parsed(info):
+        return _read_annotations(info, 0)[0]
+
+    @staticmethod
+    def _pack_parsed(out, annotations):
+        _write_annotations(out, annotations)
+
+    @property
+    def annotations(self) -> List[Annotation]:
+        """
+        The list of :class:`Annotation`, parsed on first access.
+        """
+        return self._value()
+
+    @annotations.setter
+    def annotations(self, value: List[Annotation]):
+        self._parsed = list(value)
+
+    @property
+    def types(self) -> List[str]:
+        """
+        The field descriptor of each annotation's type, such as
+        ``Ljava/lang/Deprecated;``. This never builds element-value trees.
+        """
+        if self._parsed is not None:
+            indexes = (a.type_index for a in self._parsed)
+        else:
+            indexes = annotation_types(self._info)
+        return [self.cf.constants[idx].value for idx in indexes]
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}({self.annotations!r})>'
+
+
+class RuntimeInvisibleAnnotationsAttribute(
+        RuntimeVisibleAnnotationsAttribute):
+    ATTRIBUTE_NAME = 'RuntimeInvisibleAnnotations'
+
+
+class RuntimeVisibleParameterAnnotationsAttribute(_LazyAnnotationsMixin,
+                                                  Attribute):
+    ATTRIBUTE_NAME = 'RuntimeVisibleParameterAnnotations'
+    ADDED_IN = '5.0.0'
+    MINIMUM_CLASS_VERSION = (49, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                self.ATTRIBUTE_NAME
+            ).index
+        )
+        self._lazy_init([])
+
+    @staticmethod
+    def _unpack_parsed(info):
+        pos = 1
+        parameters = []
+        for _ in range(info[0]):
+            annotations, pos = _read_annotations(info, pos)
+            parameters.append(annotations)
+        return parameters
+
+    @staticmethod
+    def _pack_parsed(out, parameters):
+        out.write(pack('>B', len(parameters)))
+        for annotations in parameters:
+            _write_annotations(out, annotations)
+
+    @property
+    def parameters(self) -> List[List[Annotation]]:
+        """
+        A list of :class:`Annotation` lists, one for each method
+        parameter, parsed on first access.
+        """
+        return self._value()
+
+    @parameters.setter
+    def parameters(self, value: List[List[Annotation]]):
+        self._parsed = [list(v) for v in value]
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}({self.parameters!r})>'
+
+
+class RuntimeInvisibleParameterAnnotationsAttribute(
+        RuntimeVisibleParameterAnnotationsAttribute):
+    ATTRIBUTE_NAME = 'RuntimeInvisibleParameterAnnotations'
+
+
+class RuntimeVisibleTypeAnnotationsAttribute(_LazyAnnotationsMixin,
+                                             Attribute):
+    ATTRIBUTE_NAME = 'RuntimeVisibleTypeAnnotations'
+    ADDED_IN = '8'
+    MINIMUM_CLASS_VERSION = (52, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                self.ATTRIBUTE_NAME
+            ).index
+        )
+        self._lazy_init([])
+
+    @staticmethod
+    def _unpack_parsed(info):
+        count = unpack_from('>H', info)[0]
+        pos = 2
+        annotations = []
+        for _ in range(count):
+            annotation, pos = _read_type_annotation(info, pos)
+            annotations.append(annotation)
+        return annotations
+
+    @staticmethod
+    def _pack_parsed(out, annotations):
+        out.write(pack('>H', len(annotations)))
+        for annotation in annotations:
+            _write_type_annotation(out, annotation)
+
+    @property
+    def annotations(self) -> List[TypeAnnotation]:
+        """
+        The list of :class:`TypeAnnotation`, parsed on first access.
+        """
+        return self._value()
+
+    @annotations.setter
+    def annotations(self, value: List[TypeAnnotation]):
+        self._parsed = list(value)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}({self.annotations!r})>'
+
+
+class RuntimeInvisibleTypeAnnotationsAttribute(
+        RuntimeVisibleTypeAnnotationsAttribute):
+    ATTRIBUTE_NAME = 'RuntimeInvisibleTypeAnnotations'
+
+
+class AnnotationDefaultAttribute(_LazyAnnotationsMixin, Attribute):
+    ADDED_IN = '5.0.0'
+    MINIMUM_CLASS_VERSION = (49, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'AnnotationDefault'
+            ).index
+        )
+        self._lazy_init(None)
+
+    @staticmethod
+    def _unpack_parsed(info):
+        return _read_element_value(info, 0)[0]
+
+    @staticmethod
+    def _pack_parsed(out, element):
+        _write_element_value(out, element)
+
+    @property
+    def default_value(self) -> ElementValue:
+        """
+        The default :class:`ElementValue` of an annotation type element,
+        parsed on first access.
+        """
+        return self._value()
+
+    @default_value.setter
+    def default_value(self, value: ElementValue):
+        self._parsed = value
@@ -1,12 +1,14 @@
 import io
 import inspect
 import functools
-from typing import Iterator
+from typing import Iterator, Tuple
 from struct import pack
-from itertools import repeat
 from collections import namedtuple
 
+from jawa import hooks
 from jawa.attribute import Attribute, AttributeTable
+from jawa.util.table import PackedTable
+from jawa.util.intervals import IntervalIndex
 from jawa.util.bytecode import (
     read_instruction,
     write_instruction,
@@ -63,9 +65,53 @@ class CodeAttribute(Attribute):
         )
         self.max_stack = 0
         self.max_locals = 0
-        self.exception_table = []
+        self._exception_table = PackedTable(CodeException)
+        self._exception_index = None
+        self._exception_index_key = None
         self.attributes = AttributeTable(table.cf, parent=self)
-        self._code = ''
+        self._code = b''
+
+    @property
+    def exception_table(self) -> PackedTable:
+        """
+        The table of :class:`CodeException` handlers, in the order the JVM
+        searches them.
+        """
+        return self._exception_table
+
+    @exception_table.setter
+    def exception_table(self, value):
+        self._exception_table = PackedTable(CodeException, value)
+
+    def _handler_index(self) -> IntervalIndex:
+        # Rebuilt lazily whenever the exception table is replaced or
+        # mutated, so lookups never see a stale view.
+        key = (self._exception_table, self._exception_table.version)
+        if self._exception_index_key != key:
+            self._exception_index = IntervalIndex(
+                (e.start_pc, e.end_pc, e) for e in self._exception_table
+            )
+            self._exception_index_key = key
+        return self._exception_index
+
+    def handlers_at(self, pc: int) -> Tuple[CodeException, ...]:
+        """
+        Returns every exception handler whose protected range covers the
+        instruction at `pc`, in exception table order.
+
+        :param pc: The offset of an instruction within this method's code.
+        """
+        return self._handler_index().at(pc)
+
+    def protected_ranges(self) \
+            -> Iterator[Tuple[int, int, Tuple[CodeException, ...]]]:
+        """
+        Yields ``(start_pc, end_pc, handlers)`` for each distinct range of
+        code covered by at least one exception handler, in ascending order.
+        Overlapping handlers are split so that every instruction within a
+        range shares the same handlers.
+        """
+        yield from self._handler_index().ranges()
 
     def unpack(self, info):
         """
@@ -83,10 +129,10 @@ class CodeAttribute(Attribute):
 
         # The exception table
         ex_table_len = info.u2()
-        for _ in repeat(None, ex_table_len):
-            self.exception_table.append(CodeException(
-                *info.unpack('>HHHH')
-            ))
+        self._exception_table = PackedTable.frombytes(
+            CodeException,
+            info.read(ex_table_len * 8)
+        )
         self.attributes = AttributeTable(self.cf, parent=self)
         self.attributes.unpack(info)
 
@@ -103,9 +149,8 @@ class CodeAttribute(Attribute):
             ))
             file_out.write(self._code)
 
-            file_out.write(pack('>H', len(self.exception_table)))
-            for exception in self.exception_table:
-                file_out.write(pack('>HHHH', *exception))
+            file_out.write(pack('>H', len(self._exception_table)))
+            file_out.write(self._exception_table.tobytes())
 
             self.attributes.pack(file_out)
             return file_out.getvalue()
@@ -133,12 +178,20 @@ class CodeAttribute(Attribute):
 
         transforms = [self._bind_transform(t) for t in transforms]
 
-        with io.BytesIO(self._code) as code:
-            ins_iter = iter(lambda: read_instruction(code, code.tell()), None)
-            for ins in ins_iter:
-                for transform in transforms:
-                    ins = transform(ins)
-                yield ins
+        span = hooks.enabled and hooks.begin('code.disassemble', self)
+        try:
+            with io.BytesIO(self._code) as code:
+                ins_iter = iter(
+                    lambda: read_instruction(code, code.tell()),
+                    None
+                )
+                for ins in ins_iter:
+                    for transform in transforms:
+                        ins = transform(ins)
+                    yield ins
+        finally:
+            if span:
+                span.end()
 
     def _bind_transform(self, transform):
         sig = inspect.signature(transform, follow_wrapped=True)
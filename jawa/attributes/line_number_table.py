@@ -1,7 +1,11 @@
+from array import array
+from bisect import bisect_right
 from struct import pack
 from collections import namedtuple
+from typing import Iterable, Optional
 
 from jawa.attribute import Attribute
+from jawa.util.table import PackedTable
 
 
 line_number_entry = namedtuple('line_number_entry', 'start_pc line_number')
@@ -18,23 +22,70 @@ class LineNumberTableAttribute(Attribute):
                 'LineNumberTable'
             ).index
         )
-        self.line_no = []
+        self._line_no = PackedTable(line_number_entry)
+        self._index = None
+        self._index_key = None
+
+    @property
+    def line_no(self) -> PackedTable:
+        """
+        The table of :class:`line_number_entry` rows. Rows are stored packed
+        and only become namedtuples when accessed.
+        """
+        return self._line_no
+
+    @line_no.setter
+    def line_no(self, value):
+        self._line_no = PackedTable(line_number_entry, value)
 
     def unpack(self, info):
         length = info.u2()
-        table = info.unpack('>{0}H'.format(length * 2))
-
-        self.line_no = [
-            line_number_entry(*x)
-            for x in zip(*[iter(table)] * 2)
-        ]
+        self._line_no = PackedTable.frombytes(
+            line_number_entry,
+            info.read(length * 4)
+        )
 
     def pack(self):
-        return pack(
-            '>H{0}H'.format(len(self.line_no) * 2),
-            len(self.line_no),
-            *sum(self.line_no, ())
-        )
+        return pack('>H', len(self._line_no)) + self._line_no.tobytes()
+
+    def _pc_index(self):
+        # Lazily (re)build the sorted pc -> line index the first time it's
+        # needed after the table has changed. Lines are offset by one, with
+        # -1 first for offsets before every entry.
+        key = (self._line_no, self._line_no.version)
+        if self._index_key != key:
+            rows = sorted(self._line_no, key=lambda r: r.start_pc)
+            self._index = (
+                array('H', (r.start_pc for r in rows)),
+                array('l', [-1, *(r.line_number for r in rows)])
+            )
+            self._index_key = key
+        return self._index
+
+    def line_for_pc(self, pc: int) -> Optional[int]:
+        """
+        Returns the source line number for the instruction at `pc`, or
+        `None` if `pc` precedes every entry in the table.
+
+        :param pc: The offset of an instruction within the method's code.
+        """
+        starts, lines = self._pc_index()
+        idx = bisect_right(starts, pc)
+        if idx == 0:
+            return None
+        return lines[idx]
+
+    def lines_for_pcs(self, pcs: Iterable[int]) -> array:
+        """
+        Batch version of :meth:`line_for_pc`, returning an ``array('l')`` of
+        line numbers in the same order as `pcs`. Offsets with no line
+        number are returned as -1.
+
+        :param pcs: Any iterable of instruction offsets, such as an
+                    ``array('H')`` of sampled pcs.
+        """
+        starts, lines = self._pc_index()
+        return array('l', [lines[bisect_right(starts, pc)] for pc in pcs])
 
     def __repr__(self):
         return '<LineNumberTableAttribute({0!r})>'.format(self.line_no)
@@ -1,7 +1,10 @@
 from struct import pack
 from collections import namedtuple
+from typing import Tuple
 
 from jawa.attribute import Attribute
+from jawa.util.table import PackedTable
+from jawa.util.intervals import IntervalIndex
 
 
 local_variable_entry = namedtuple('local_variable_entry', [
@@ -24,23 +27,53 @@ class LocalVariableTableAttribute(Attribute):
                 'LocalVariableTable'
             ).index
         )
-        self.local_variables = []
+        self._local_variables = PackedTable(local_variable_entry)
+        self._index = None
+        self._index_key = None
+
+    @property
+    def local_variables(self) -> PackedTable:
+        """
+        The table of :class:`local_variable_entry` rows. Rows are stored packed
+        and only become namedtuples when accessed.
+        """
+        return self._local_variables
+
+    @local_variables.setter
+    def local_variables(self, value):
+        self._local_variables = PackedTable(local_variable_entry, value)
 
     def unpack(self, info):
         length = info.u2()
-        table = info.unpack('>{0}H'.format(length * 5))
-
-        self.local_variables = [
-            local_variable_entry(*x)
-            for x in zip(*[iter(table)] * 5)
-        ]
+        self._local_variables = PackedTable.frombytes(
+            local_variable_entry,
+            info.read(length * 10)
+        )
 
     def pack(self):
-        return pack(
-            '>H{0}H'.format(len(self.local_variables) * 5),
-            len(self.local_variables),
-            *sum(self.local_variables, ())
+        return (
+            pack('>H', len(self._local_variables)) +
+            self._local_variables.tobytes()
         )
 
+    def locals_at(self, pc: int) -> Tuple[local_variable_entry, ...]:
+        """
+        Returns every local variable whose scope covers the instruction at
+        `pc`, in table order.
+
+        The interval index backing this query is built on first use and
+        rebuilt only after the table has been modified.
+
+        :param pc: The offset of an instruction within the method's code.
+        """
+        key = (self._local_variables, self._local_variables.version)
+        if self._index_key != key:
+            self._index = IntervalIndex(
+                (r.start_pc, r.start_pc + r.length, r)
+                for r in self._local_variables
+            )
+            self._index_key = key
+        return self._index.at(pc)
+
     def __repr__(self):
         return f'<LocalVariableTableAttribute({self.local_variables!r})>'
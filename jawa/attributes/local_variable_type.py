@@ -2,6 +2,7 @@ from struct import pack
 from collections import namedtuple
 
 from jawa.attribute import Attribute
+from jawa.util.table import PackedTable
 
 
 local_variable_type_entry = namedtuple('local_variable_type_entry', [
@@ -24,22 +25,31 @@ class LocalVariableTypeTableAttribute(Attribute):
                 'LocalVariableTypeTable'
             ).index
         )
-        self.local_variables = []
+        self._local_variables = PackedTable(local_variable_type_entry)
+
+    @property
+    def local_variables(self) -> PackedTable:
+        """
+        The table of :class:`local_variable_type_entry` rows. Rows are stored
+        packed and only become namedtuples when accessed.
+        """
+        return self._local_variables
+
+    @local_variables.setter
+    def local_variables(self, value):
+        self._local_variables = PackedTable(local_variable_type_entry, value)
 
     def unpack(self, info):
         length = info.u2()
-        table = info.unpack('>{0}H'.format(length * 5))
-
-        self.local_variables = [
-            local_variable_type_entry(*x)
-            for x in zip(*[iter(table)] * 5)
-        ]
+        self._local_variables = PackedTable.frombytes(
+            local_variable_type_entry,
+            info.read(length * 10)
+        )
 
     def pack(self):
-        return pack(
-            '>H{0}H'.format(len(self.local_variables) * 5),
-            len(self.local_variables),
-            *sum(self.local_variables, ())
+        return (
+            pack('>H', len(self._local_variables)) +
+            self._local_variables.tobytes()
         )
 
     def __repr__(self):
@@ -0,0 +1,219 @@
+import io
+from struct import pack
+from itertools import repeat
+from collections import namedtuple
+
+from jawa.attribute import Attribute
+from jawa.constants import Module, PackageInfo
+
+
+ModuleRequires = namedtuple('ModuleRequires', [
+    'requires_index',
+    'requires_flags',
+    'requires_version_index'
+])
+
+#: Used for both the `exports` and `opens` tables of a Module attribute,
+#: which share the same layout.
+ModuleExports = namedtuple('ModuleExports', [
+    'package_index',
+    'flags',
+    'to_indexes'
+])
+
+ModuleProvides = namedtuple('ModuleProvides', [
+    'provides_index',
+    'with_indexes'
+])
+
+
+def _read_u2_list(info):
+    return list(info.unpack('>{0}H'.format(info.u2())))
+
+
+def _write_u2_list(out, values):
+    out.write(pack('>H{0}H'.format(len(values)), len(values), *values))
+
+
+class ModuleAttribute(Attribute):
+    ADDED_IN = '9'
+    MINIMUM_CLASS_VERSION = (53, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'Module'
+            ).index
+        )
+        self.module_name_index = None
+        self.module_flags = 0
+        self.module_version_index = 0
+        self.requires = []
+        self.exports = []
+        self.opens = []
+        #: ConstantClass indexes of each service interface used.
+        self.uses = []
+        self.provides = []
+
+    def unpack(self, info):
+        (
+            self.module_name_index,
+            self.module_flags,
+            self.module_version_index
+        ) = info.unpack('>HHH')
+
+        self.requires = [
+            ModuleRequires(*info.unpack('>HHH'))
+            for _ in repeat(None, info.u2())
+        ]
+        self.exports = [
+            ModuleExports(*info.unpack('>HH'), _read_u2_list(info))
+            for _ in repeat(None, info.u2())
+        ]
+        self.opens = [
+            ModuleExports(*info.unpack('>HH'), _read_u2_list(info))
+            for _ in repeat(None, info.u2())
+        ]
+        self.uses = _read_u2_list(info)
+        self.provides = [
+            ModuleProvides(info.u2(), _read_u2_list(info))
+            for _ in repeat(None, info.u2())
+        ]
+
+    def pack(self):
+        if self.module_name_index is None:
+            raise ValueError('ModuleAttribute has no module_name')
+
+        with io.BytesIO() as out:
+            out.write(pack(
+                '>HHH',
+                self.module_name_index,
+                self.module_flags,
+                self.module_version_index
+            ))
+
+            out.write(pack('>H', len(self.requires)))
+            for requires in self.requires:
+                out.write(pack('>HHH', *requires))
+
+            for table in (self.exports, self.opens):
+                out.write(pack('>H', len(table)))
+                for entry in table:
+                    out.write(pack('>HH', entry.package_index, entry.flags))
+                    _write_u2_list(out, entry.to_indexes)
+
+            _write_u2_list(out, self.uses)
+
+            out.write(pack('>H', len(self.provides)))
+            for provides in self.provides:
+                out.write(pack('>H', provides.provides_index))
+                _write_u2_list(out, provides.with_indexes)
+
+            return out.getvalue()
+
+    @property
+    def module_name(self) -> Module:
+        """
+        The :class:`~jawa.constants.Module` constant naming this module.
+        """
+        return self.cf.constants[self.module_name_index]
+
+    @module_name.setter
+    def module_name(self, value: Module):
+        self.module_name_index = value.index
+
+    def add_requires(self, module: str, flags: int=0) -> ModuleRequires:
+        """
+        Adds a dependency on `module` to this module.
+
+        :param module: The name of the required module, such as
+                       ``java.base``.
+        :param flags: The ``requires_flags`` of the dependency.
+        """
+        requires = ModuleRequires(
+            self.cf.constants.create_module(module).index,
+            flags,
+            0
+        )
+        self.requires.append(requires)
+        return requires
+
+    def add_exports(self, package: str, to=(), flags: int=0,
+                    opens: bool=False) -> ModuleExports:
+        """
+        Exports (or opens) `package`, optionally only to the modules in `to`.
+
+        :param package: The internal name of the package, such as
+                        ``com/example/api``.
+        :param to: An iterable of module names. If empty, the package is
+                   exported to everyone.
+        :param flags: The ``exports_flags`` or ``opens_flags``.
+        :param opens: True if the package should be opened instead of
+                      exported.
+        """
+        constants = self.cf.constants
+        entry = ModuleExports(
+            constants.create_package(package).index,
+            flags,
+            [constants.create_module(m).index for m in to]
+        )
+        (self.opens if opens else self.exports).append(entry)
+        return entry
+
+    def add_uses(self, service: str):
+        """
+        Declares that this module uses the service interface `service`.
+        """
+        self.uses.append(self.cf.constants.create_class(service).index)
+
+    def add_provides(self, service: str, implementations) -> ModuleProvides:
+        """
+        Declares that this module provides `service` through each of the
+        classes in `implementations`.
+        """
+        constants = self.cf.constants
+        provides = ModuleProvides(
+            constants.create_class(service).index,
+            [constants.create_class(c).index for c in implementations]
+        )
+        self.provides.append(provides)
+        return provides
+
+
+class ModulePackagesAttribute(Attribute):
+    ADDED_IN = '9'
+    MINIMUM_CLASS_VERSION = (53, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'ModulePackages'
+            ).index
+        )
+        #: PackageInfo indexes of every package in the module.
+        self.packages = []
+
+    def unpack(self, info):
+        length = info.u2()
+        self.packages = list(info.unpack('>{0}H'.format(length)))
+
+    def pack(self):
+        return pack(
+            '>H{0}H'.format(len(self.packages)),
+            len(self.packages),
+            *self.packages
+        )
+
+    def add(self, package: str) -> PackageInfo:
+        """
+        Adds the package `package` to the module, returning its new
+        :class:`~jawa.constants.PackageInfo`.
+        """
+        constant = self.cf.constants.create_package(package)
+        self.packages.append(constant.index)
+        return constant
+
+    def __repr__(self):
+        return f'<ModulePackagesAttribute({self.packages!r})>'
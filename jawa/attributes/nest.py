@@ -0,0 +1,78 @@
+from struct import pack
+
+from jawa.attribute import Attribute
+from jawa.constants import ConstantClass
+
+
+class NestHostAttribute(Attribute):
+    ADDED_IN = '11'
+    MINIMUM_CLASS_VERSION = (55, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'NestHost'
+            ).index
+        )
+        self.host_class_index = None
+
+    def unpack(self, info):
+        self.host_class_index = info.u2()
+
+    def pack(self):
+        if self.host_class_index is None:
+            raise ValueError('NestHostAttribute has no host_class')
+        return pack('>H', self.host_class_index)
+
+    @property
+    def host_class(self) -> ConstantClass:
+        """
+        The :class:`~jawa.constants.ConstantClass` of this class's nest host.
+        """
+        return self.cf.constants[self.host_class_index]
+
+    @host_class.setter
+    def host_class(self, value: ConstantClass):
+        self.host_class_index = value.index
+
+    def __repr__(self):
+        return f'<NestHostAttribute({self.host_class_index!r})>'
+
+
+class NestMembersAttribute(Attribute):
+    ADDED_IN = '11'
+    MINIMUM_CLASS_VERSION = (55, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'NestMembers'
+            ).index
+        )
+        #: ConstantClass indexes of every member of this nest.
+        self.classes = []
+
+    def unpack(self, info):
+        length = info.u2()
+        self.classes = list(info.unpack('>{0}H'.format(length)))
+
+    def pack(self):
+        return pack(
+            '>H{0}H'.format(len(self.classes)),
+            len(self.classes),
+            *self.classes
+        )
+
+    def add(self, name: str) -> ConstantClass:
+        """
+        Adds the class `name` to the nest, returning its new
+        :class:`~jawa.constants.ConstantClass`.
+        """
+        constant = self.cf.constants.create_class(name)
+        self.classes.append(constant.index)
+        return constant
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}({self.classes!r})>'
@@ -0,0 +1,18 @@
+from jawa.attributes.nest import NestMembersAttribute
+
+
+class PermittedSubclassesAttribute(NestMembersAttribute):
+    """
+    Lists the classes permitted to extend or implement a sealed class. Its
+    layout is identical to the ``NestMembers`` attribute.
+    """
+    ADDED_IN = '17'
+    MINIMUM_CLASS_VERSION = (61, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'PermittedSubclasses'
+            ).index
+        )
@@ -0,0 +1,85 @@
+import io
+from struct import pack
+from itertools import repeat
+
+from jawa.attribute import Attribute, AttributeTable
+from jawa.constants import UTF8
+
+
+class RecordComponent(object):
+    """
+    A single component of a record class, with its own attributes (such as
+    ``Signature`` or annotations).
+    """
+    def __init__(self, cf, name_index=0, descriptor_index=0):
+        self._cf = cf
+        self.name_index = name_index
+        self.descriptor_index = descriptor_index
+        self.attributes = AttributeTable(cf)
+
+    @property
+    def name(self) -> UTF8:
+        """
+        The UTF8 Constant containing the component's name.
+        """
+        return self._cf.constants[self.name_index]
+
+    @property
+    def descriptor(self) -> UTF8:
+        """
+        The UTF8 Constant containing the component's field descriptor.
+        """
+        return self._cf.constants[self.descriptor_index]
+
+    def __repr__(self):
+        return f'<RecordComponent(name={self.name.value!r})>'
+
+
+class RecordAttribute(Attribute):
+    ADDED_IN = '16'
+    MINIMUM_CLASS_VERSION = (60, 0)
+
+    def __init__(self, table, name_index=None):
+        super().__init__(
+            table,
+            name_index or table.cf.constants.create_utf8(
+                'Record'
+            ).index
+        )
+        self.components = []
+
+    def unpack(self, info):
+        self.components = []
+        for _ in repeat(None, info.u2()):
+            component = RecordComponent(self.cf, *info.unpack('>HH'))
+            component.attributes.unpack(info)
+            self.components.append(component)
+
+    def pack(self):
+        with io.BytesIO() as out:
+            out.write(pack('>H', len(self.components)))
+            for component in self.components:
+                out.write(pack(
+                    '>HH',
+                    component.name_index,
+                    component.descriptor_index
+                ))
+                component.attributes.pack(out)
+            return out.getvalue()
+
+    def create(self, name: str, descriptor: str) -> RecordComponent:
+        """
+        Creates a new record component from `name` and `descriptor`,
+        appending it to the record and returning it.
+        """
+        constants = self.cf.constants
+        component = RecordComponent(
+            self.cf,
+            constants.create_utf8(name).index,
+            constants.create_utf8(descriptor).index
+        )
+        self.components.append(component)
+        return component
+
+    def __repr__(self):
+        return f'<RecordAttribute({self.components!r})>'
@@ -6,7 +6,7 @@ class SignatureAttribute(Attribute):
     ADDED_IN = '5.0.0'
     MINIMUM_CLASS_VERSION = (49, 0)
 
-    def __init__(self, table, name_index):
+    def __init__(self, table, name_index=None):
         super(SignatureAttribute, self).__init__(
             table,
             name_index or table.cf.constants.create_utf8(
@@ -0,0 +1,302 @@
+"""
+Cache policies for the :class:`~jawa.classloader.ClassLoader`.
+
+Every policy can be bounded by a number of entries, a number of bytes, or
+both. The size of a cached :class:`~jawa.cf.ClassFile` is estimated from the
+size of the ClassFile it was parsed from, which scales well with the memory
+it ends up using.
+
+To use a policy other than the default :class:`LRUCache`, pass an instance
+of it to the ClassLoader::
+
+    >>> cache = TwoQueueCache(max_bytes=64 << 20)
+    >>> loader = ClassLoader('rt.jar', cache=cache)
+    >>> for path in loader.classes:
+    ...     loader.load(path)
+    >>> loader.class_cache.stats
+    CacheStats(hits=0, misses=5012, evictions=3871, entries=1141, size=...)
+"""
+from collections import OrderedDict, namedtuple
+from typing import Any, Iterator
+
+
+CacheStats = namedtuple('CacheStats', [
+    'hits',
+    'misses',
+    'evictions',
+    'entries',
+    'size'
+])
+
+
+class ClassCache(object):
+    """
+    The base of all cache policies. Subclasses decide what's kept and what's
+    evicted by implementing ``_lookup()``, ``_insert()``, ``_remove()`` and
+    ``_evict()``.
+
+    :param max_entries: The maximum number of entries to keep, or `None`
+                        for no limit.
+    :param max_bytes: The maximum total size of all entries, or `None` for
+                      no limit.
+    """
+    def __init__(self, max_entries: int=None, max_bytes: int=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        #: The current total size of all entries.
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of this cache's counters."""
+        return CacheStats(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self),
+            self.size
+        )
+
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counters."""
+        self.hits = self.misses = self.evictions = 0
+
+    def empty_copy(self) -> 'ClassCache':
+        """
+        Returns a new, empty cache with the same policy and limits, such as
+        for a ClassLoader in a worker process. Subclasses taking other
+        options should override this.
+        """
+        return type(self)(
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes
+        )
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            return True
+        return False
+
+    def get(self, key: str, default: Any=None) -> Any:
+        """
+        Return the value for `key`, counting a hit or a miss.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, value: Any, size: int=0):
+        """
+        Insert `value` under `key`, evicting entries as needed to stay
+        within budget.
+
+        :param key: The path of the class.
+        :param value: The ClassFile to cache.
+        :param size: The estimated size of `value` in bytes.
+        """
+        self.pop(key)
+        self._insert(key, (value, size))
+        self.size += size
+        while self._over_budget() and len(self):
+            self.size -= self._evict()[1]
+            self.evictions += 1
+
+    def pop(self, key: str, default: Any=None) -> Any:
+        """
+        Remove `key` from the cache, returning its value. This is not counted
+        as an eviction.
+        """
+        entry = self._remove(key)
+        if entry is None:
+            return default
+        self.size -= entry[1]
+        return entry[0]
+
+    def __setitem__(self, key: str, value: Any):
+        self.put(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def __delitem__(self, key: str):
+        entry = self._remove(key)
+        if entry is None:
+            raise KeyError(key)
+        self.size -= entry[1]
+
+    def clear(self):
+        """Remove every entry. Counters are left untouched."""
+        raise NotImplementedError()
+
+    def __contains__(self, key: str) -> bool:
+        raise NotImplementedError()
+
+    def __iter__(self) -> Iterator[str]:
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def _lookup(self, key):
+        raise NotImplementedError()
+
+    def _insert(self, key, entry):
+        raise NotImplementedError()
+
+    def _remove(self, key):
+        raise NotImplementedError()
+
+    def _evict(self):
+        raise NotImplementedError()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}({self.stats!r})>'
+
+
+class LRUCache(ClassCache):
+    """
+    Evicts the least recently used entry first.
+    """
+    def __init__(self, max_entries: int=None, max_bytes: int=None):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self._entries = OrderedDict()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+
+    def _remove(self, key):
+        return self._entries.pop(key, None)
+
+    def _evict(self):
+        return self._entries.popitem(last=False)[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TwoQueueCache(ClassCache):
+    """
+    A scan-resistant cache implementing the "full" 2Q policy.
+
+    New entries go into a small FIFO queue. Entries evicted from it are
+    remembered (by key only) for a while, and only entries requested again
+    during that time are promoted into the main LRU queue. A single pass
+    over an entire classpath therefore only ever churns the FIFO queue,
+    leaving the hot set in the main queue alone.
+
+    :param max_entries: The maximum number of entries to keep, or `None`
+                        for no limit.
+    :param max_bytes: The maximum total size of all entries, or `None` for
+                      no limit.
+    :param in_ratio: The share of the budget given to the FIFO queue.
+                     [default: 0.25]
+    :param ghost_entries: The maximum number of evicted keys to remember.
+                          [default: 1024, or half of max_entries]
+    """
+    def __init__(self, max_entries: int=None, max_bytes: int=None,
+                 in_ratio: float=0.25, ghost_entries: int=None):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self.in_ratio = in_ratio
+        if ghost_entries is None:
+            ghost_entries = max(max_entries // 2, 1) if max_entries else 1024
+        self.ghost_entries = ghost_entries
+        self._in = OrderedDict()
+        self._in_size = 0
+        self._main = OrderedDict()
+        self._ghosts = OrderedDict()
+
+    def empty_copy(self) -> 'TwoQueueCache':
+        return type(self)(
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+            in_ratio=self.in_ratio,
+            ghost_entries=self.ghost_entries
+        )
+
+    def _in_over_budget(self) -> bool:
+        if self.max_entries is not None and (
+                len(self._in) > self.max_entries * self.in_ratio):
+            return True
+        if self.max_bytes is not None and (
+                self._in_size > self.max_bytes * self.in_ratio):
+            return True
+        return False
+
+    def _lookup(self, key):
+        entry = self._main.get(key)
+        if entry is not None:
+            self._main.move_to_end(key)
+            return entry
+        return self._in.get(key)
+
+    def _insert(self, key, entry):
+        if self._ghosts.pop(key, None) is not None:
+            self._main[key] = entry
+        else:
+            self._in[key] = entry
+            self._in_size += entry[1]
+
+    def _remove(self, key):
+        entry = self._main.pop(key, None)
+        if entry is None:
+            entry = self._in.pop(key, None)
+            if entry is not None:
+                self._in_size -= entry[1]
+        return entry
+
+    def _evict(self):
+        if self._in and (self._in_over_budget() or not self._main):
+            key, entry = self._in.popitem(last=False)
+            self._in_size -= entry[1]
+            self._ghosts[key] = True
+            while len(self._ghosts) > self.ghost_entries:
+                self._ghosts.popitem(last=False)
+            return entry
+        return self._main.popitem(last=False)[1]
+
+    def clear(self):
+        self._in.clear()
+        self._main.clear()
+        self._ghosts.clear()
+        self._in_size = 0
+        self.size = 0
+
+    def __contains__(self, key):
+        return key in self._main or key in self._in
+
+    def __iter__(self):
+        return iter(list(self._in) + list(self._main))
+
+    def __len__(self):
+        return len(self._in) + len(self._main)
@@ -8,12 +8,14 @@ from typing import IO, Iterable, Union, Sequence
 from struct import pack, unpack
 from collections import namedtuple
 
+from jawa import hooks
 from jawa.constants import ConstantPool, ConstantClass
 from jawa.fields import FieldTable
 from jawa.methods import MethodTable
 from jawa.attribute import AttributeTable, ATTRIBUTE_CLASSES
 from jawa.util.flags import Flags
 from jawa.attributes.bootstrap import BootstrapMethod
+from jawa.util.stream import BufferStreamReader
 
 
 class ClassVersion(namedtuple('ClassVersion', ['major', 'minor'])):
@@ -61,7 +63,13 @@ class ClassFile(object):
         public class HelloWorld extends java.lang.Object{
         }
 
-    :param source: any file-like object providing ``.read()``.
+    A ClassFile can also be parsed straight from memory, such as a ``bytes``
+    object or a ``memoryview`` of a memory-mapped JAR::
+
+        >>> cf = ClassFile(jar.read('HelloWorld.class'))
+
+    :param source: any file-like object providing ``.read()``, or any
+                   bytes-like object containing a complete ClassFile.
     """
 
     #: The JVM ClassFile magic number.
@@ -91,6 +99,10 @@ class ClassFile(object):
         self.classloader = None
 
         if source:
+            if not hasattr(source, 'read'):
+                # Buffers are copied (a no-op for bytes) so that the
+                # ClassFile never holds a view into someone else's memory.
+                source = BufferStreamReader(bytes(source))
             self._from_io(source)
 
     @classmethod
@@ -144,6 +156,8 @@ class ClassFile(object):
         """
         Loads an existing JVM ClassFile from any file-like object.
         """
+        span = hooks.enabled and hooks.begin('class.parse', self)
+
         read = source.read
 
         if unpack('>I', source.read(4))[0] != ClassFile.MAGIC:
@@ -169,6 +183,9 @@ class ClassFile(object):
         self.methods.unpack(source)
         self.attributes.unpack(source)
 
+        if span:
+            span.end(classes_parsed=1)
+
     @property
     def version(self) -> ClassVersion:
         """
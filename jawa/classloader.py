@@ -1,26 +1,219 @@
 import io
 import os
+import re
 import os.path
-from typing import IO, Callable, Iterable, Set, Iterator
-from itertools import repeat
-from zipfile import ZipFile
-from collections import OrderedDict
+import weakref
+import threading
+import functools
+from typing import IO, Any, Callable, Iterable, List, Set, Iterator, Tuple
+from itertools import count, repeat, islice
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    Future,
+    wait,
+    FIRST_COMPLETED
+)
 from contextlib import contextmanager
+from collections import namedtuple
 
+from jawa import hooks, stats
 from jawa.cf import ClassFile
+from jawa.jar import JarReader, fingerprint, CLASS_ROOTS, LIBRARY_ROOTS
+from jawa.cache import ClassCache, LRUCache
+from jawa.parse_cache import ParseCache, ClassSummary, summarize, entry_key
+from jawa.scan import ClassScan
+from jawa.indexes import AnnotationIndex, NestIndex, HierarchyIndex
+from jawa.dependencies import DependencyGraph, class_references
 from jawa.constants import ConstantPool, ConstantClass
+from jawa.util.trie import PackageTrie
+from jawa.util.executor import bounded_map
 
 
-def _walk(path, follow_links=False, maximum_depth=None):
-    """A modified os.walk with support for maximum traversal depth."""
-    root_level = path.rstrip(os.path.sep).count(os.path.sep)
-    for root, dirs, files in os.walk(path, followlinks=follow_links):
-        yield root, dirs, files
-        if maximum_depth is None:
+def _scan_directory(path, follow_links=False, maximum_depth=None,
+                    prefix='', depth=0):
+    """Yield a (relative path, full path) tuple for every file under `path`.
+
+    Equivalent to, and in the same order as, an ``os.walk`` limited to
+    `maximum_depth` sub-directories, but built on ``os.scandir`` so that
+    relative paths are accumulated rather than recomputed for every file.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    dirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            dirs.append(entry)
+        else:
+            yield prefix + entry.name, entry.path
+
+    if maximum_depth is not None and depth >= maximum_depth:
+        return
+
+    for entry in dirs:
+        if not follow_links and entry.is_symlink():
             continue
+        yield from _scan_directory(
+            entry.path,
+            follow_links=follow_links,
+            maximum_depth=maximum_depth,
+            prefix=prefix + entry.name + os.path.sep,
+            depth=depth + 1
+        )
+
+
+#: The result of indexing a single jar or directory. `stat` is the
+#: fingerprint() of a jar, `entries` the (path, entry) tuples to add to the
+#: path map and `fingerprints` the fingerprint() of each entry or file.
+_SourceIndex = namedtuple('_SourceIndex', [
+    'archive',
+    'stat',
+    'entries',
+    'fingerprints'
+])
+
+
+#: The classes added, removed and modified by ClassLoader.refresh().
+RefreshResult = namedtuple('RefreshResult', ['added', 'removed', 'modified'])
+
+
+def _index_source(source, follow_symlinks, maximum_depth, release=None):
+    """Return a _SourceIndex of the jar, zip or directory at `source`."""
+    if source.lower().endswith(('.zip', '.jar', '.war')):
+        jar = JarReader(source, release=release, roots=CLASS_ROOTS)
+
+        # Libraries nested in the archive come first, so that the archive's
+        # own classes take precedence over them.
+        entries = []
+        for name in jar.namelist():
+            if name.startswith(LIBRARY_ROOTS) and name.endswith('.jar'):
+                nested = jar.nested(name)
+                entries.extend(
+                    zip(nested.classpath_names(), repeat(nested))
+                )
+        entries.extend(zip(jar.classpath_names(), repeat(jar)))
+
+        return _SourceIndex(
+            jar,
+            fingerprint(source),
+            entries,
+            {path: fingerprint(e, path) for path, e in entries}
+        )
+    elif os.path.isdir(source):
+        entries = []
+        fingerprints = {}
+        for path, full_path in _scan_directory(
+                source,
+                follow_links=follow_symlinks,
+                maximum_depth=maximum_depth):
+            try:
+                fingerprints[path] = fingerprint(full_path)
+            except OSError:
+                continue
+            entries.append((path, full_path))
+        return _SourceIndex(None, None, entries, fingerprints)
+    return _SourceIndex(None, None, [], {})
 
-        if root_level + maximum_depth <= root.count(os.path.sep):
-            del dirs[:]
+
+#: Everything a worker process needs to recreate a ClassLoader. `token`
+#: identifies the ClassLoader it was taken from.
+_WorkerSpec = namedtuple('_WorkerSpec', [
+    'token',
+    'sources',
+    'classes',
+    'options'
+])
+
+_worker_tokens = count()
+# The (token, ClassLoader) of the current worker process, created by
+# _worker_loader() the first time the process is handed a task.
+_worker = None
+
+
+def _worker_loader(spec):
+    global _worker
+    if _worker is None or _worker[0] != spec.token:
+        loader = ClassLoader(**spec.options)
+        for source, follow_symlinks, maximum_depth in spec.sources:
+            loader.update(
+                source,
+                follow_symlinks=follow_symlinks,
+                maximum_depth=maximum_depth,
+                workers=1
+            )
+        loader.update(*(loader.klass(buff) for buff in spec.classes))
+        _worker = spec.token, loader
+    return _worker[1]
+
+
+def _map_chunk(spec, func, paths):
+    loader = _worker_loader(spec)
+    return [func(loader.load(path)) for path in paths]
+
+
+def _reduce_chunk(spec, func, combine, initial, paths):
+    loader = _worker_loader(spec)
+    return functools.reduce(
+        combine,
+        (func(loader.load(path)) for path in paths),
+        initial
+    )
+
+
+def _references_chunk(spec, paths):
+    loader = _worker_loader(spec)
+    references = []
+    for path in paths:
+        scan = ClassScan(loader._read(f'{path}.class'))
+        references.append((scan.this, class_references(scan)))
+    return references
+
+
+def _grep_class(loader, pattern, path, first):
+    scan = ClassScan(loader._read(f'{path}.class'))
+    matches = []
+    for idx in scan.constants(1):
+        value = scan.utf8(idx)
+        if pattern.match(value):
+            matches.append(value)
+            if first:
+                break
+    return matches
+
+
+def _grep_chunk(spec, pattern, first, paths):
+    loader = _worker_loader(spec)
+    results = []
+    for path in paths:
+        matches = _grep_class(loader, pattern, path, first)
+        if matches:
+            results.append((path, matches))
+    return results
+
+
+@contextmanager
+def _nothing():
+    # A context manager that does nothing, as contextlib.nullcontext() is
+    # only available from Python 3.7.
+    yield
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class ClassLoader(object):
@@ -29,22 +222,79 @@ class ClassLoader(object):
     Provides utilities for managing a java classpath as well as loading
     classes from those paths.
 
+    A ClassLoader may be shared between threads. Concurrent requests for the
+    same class are coalesced, so it's only ever read and parsed once.
+
     :param sources: Optional sources to pass into update().
     :param max_cache: The maximum number of ClassFile's to store in the cache.
                       If set to 0, the cache will be unlimited. [default: 50]
     :type max_cache: Long
+    :param max_cache_bytes: The maximum total size, in bytes of the ClassFiles
+                            they were parsed from, of all classes in the
+                            cache. [default: no limit]
+    :param cache: The :class:`~jawa.cache.ClassCache` to use. If given,
+                  `max_cache` and `max_cache_bytes` are ignored.
+                  [default: an :class:`~jawa.cache.LRUCache`]
+    :param parse_cache: A :class:`~jawa.parse_cache.ParseCache`, or the path
+                        to the database of one, used to persist class
+                        summaries between runs. [default: None]
     :param klass: The class to use when constructing ClassFiles.
     :type klass: ClassFile or subclass.
     :param bytecode_transforms: Default transforms to apply when disassembling
                                 a method.
+    :param release: The Java release (such as 11) used to pick entries from
+                    multi-release jars. If set to `None`, versioned entries
+                    are ignored. [default: None]
+    :param instrument: True to count and time the work done by this
+                       ClassLoader, which is then returned by
+                       :meth:`stats`, or a :class:`~jawa.stats.Stats` to
+                       record into. [default: False]
     """
     def __init__(self, *sources, max_cache: int=50, klass=ClassFile,
-                 bytecode_transforms: Iterable[Callable]=None):
+                 bytecode_transforms: Iterable[Callable]=None,
+                 max_cache_bytes: int=None, cache: ClassCache=None,
+                 parse_cache=None, release: int=None,
+                 instrument=False):
         self.path_map = {}
         self.max_cache = max_cache
-        self.class_cache = OrderedDict()
+        self.max_cache_bytes = max_cache_bytes
+        if cache is None:
+            cache = LRUCache(
+                max_entries=max_cache if max_cache > 0 else None,
+                max_bytes=max_cache_bytes
+            )
+        self.class_cache = cache
+        if parse_cache is not None and not isinstance(parse_cache,
+                                                      ParseCache):
+            parse_cache = ParseCache(parse_cache)
+        self.parse_cache = parse_cache
         self.bytecode_transforms = bytecode_transforms or []
         self.klass = klass
+        self.release = release
+        # Guards the class cache, the path map and in-flight loads.
+        self._lock = threading.Lock()
+        # Guards building the classpath-wide indexes.
+        self._index_lock = threading.Lock()
+        self._loading = {}
+        # Every source given to update(), so that worker processes can
+        # recreate this ClassLoader.
+        self._sources = []
+        # The _SourceIndex of each source, used by refresh().
+        self._snapshots = []
+        # The name of every class in the path map (as an ordered set), and
+        # the same names arranged by package.
+        self._class_names = {}
+        self._packages = PackageTrie()
+        self._annotation_index = None
+        self._nest_index = None
+        self._hierarchy = None
+
+        if instrument is True:
+            instrument = stats.Stats()
+        self._stats = instrument or None
+        if self._stats is not None:
+            stats.acquire()
+            weakref.finalize(self, stats.release)
 
         if sources:
             self.update(*sources)
@@ -53,22 +303,23 @@ class ClassLoader(object):
         return self.load(path)
 
     def __contains__(self, path: str) -> bool:
-        if path in self.path_map:
-            return True
-        elif path + '.class' in self.path_map:
-            return True
-        return False
+        return path in self._class_names or path in self.path_map
 
     def update(self, *sources, follow_symlinks: bool=False,
-               maximum_depth: int=20):
+               maximum_depth: int=20, workers: int=None):
         """Add one or more ClassFile sources to the class loader.
 
         If a given source is a directory path, it is traversed up to the
         maximum set depth and all files under it are added to the class loader
         lookup table.
 
-        If a given source is a .jar or .zip file it will be opened and the
-        file index added to the class loader lookup table.
+        If a given source is a .jar, .war or .zip file it will be opened and
+        the file index added to the class loader lookup table. Libraries
+        nested under ``BOOT-INF/lib/`` or ``WEB-INF/lib/`` are read from
+        memory and added too. Classes under ``BOOT-INF/classes/`` or
+        ``WEB-INF/classes/`` are added by their name relative to that
+        directory, and the entries of a multi-release jar by the name they
+        resolve to for `release`, never by the name of the entry itself.
 
         If a given source is a ClassFile or a subclass, it's immediately
         added to the class loader lookup table and the class cache.
@@ -80,29 +331,184 @@ class ClassLoader(object):
         :param maximum_depth: The maximum sub-directory depth when traversing
                               filesystem directories. If set to `None` no limit
                               will be enforced. [default: 20]
+        :param workers: The maximum number of threads used to index sources
+                        concurrently. If set to 1, sources are indexed
+                        serially. [default: chosen by ThreadPoolExecutor]
+        """
+        # Indexing each jar and directory is independent, so it's done
+        # concurrently. The results are merged in the order the sources were
+        # given, exactly as if each had been indexed one after the other.
+        pending = [
+            str(source)
+            for source in sources if not isinstance(source, self.klass)
+        ]
+        if workers == 1 or len(pending) < 2:
+            indexed = list(map(
+                _index_source,
+                pending,
+                repeat(follow_symlinks),
+                repeat(maximum_depth),
+                repeat(self.release)
+            ))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                indexed = list(pool.map(
+                    _index_source,
+                    pending,
+                    repeat(follow_symlinks),
+                    repeat(maximum_depth),
+                    repeat(self.release)
+                ))
+
+        indexed = iter(indexed)
+        added = []
+        with self._lock:
+            for source in sources:
+                if isinstance(source, self.klass):
+                    self.path_map[source.this.name.value] = source
+                    self.class_cache[source.this.name.value] = source
+                    added.append(source.this.name.value)
+                    continue
+
+                index = next(indexed)
+                self.path_map.update(index.entries)
+                for path, _ in index.entries:
+                    if path.endswith('.class'):
+                        added.append(path)
+                        name = path[:-6]
+                        if name not in self._class_names:
+                            self._class_names[name] = None
+                            self._packages.add(name)
+                self._sources.append((
+                    str(source),
+                    follow_symlinks,
+                    maximum_depth
+                ))
+                self._snapshots.append(index)
+
+            self._annotation_index = None
+            self._nest_index = None
+
+        # Unlike the other indexes, the hierarchy is kept up to date rather
+        # than rebuilt.
+        with self._index_lock:
+            if self._hierarchy is not None:
+                self._add_to_hierarchy(self._hierarchy, dict.fromkeys(added))
+
+    def _refresh_source(self, source, snapshot):
+        path, follow_symlinks, maximum_depth = source
+        if snapshot.archive is not None:
+            try:
+                if fingerprint(path) == snapshot.stat:
+                    return snapshot
+            except OSError:
+                return _SourceIndex(None, None, [], {})
+        elif snapshot.stat is None and path.lower().endswith(
+                ('.zip', '.jar', '.war')) and not os.path.isfile(path):
+            return snapshot
+        return _index_source(path, follow_symlinks, maximum_depth,
+                             self.release)
+
+    def refresh(self, workers: int=None) -> RefreshResult:
+        """Bring the path map up to date with every jar and directory
+        previously given to :meth:`update`.
+
+        The modification time and size of each jar and of each file under
+        each directory is recorded when it's indexed. Jars that haven't
+        changed are kept as they are, and only classes whose contents
+        changed are evicted from the class cache. The hierarchy index is
+        updated in place, while the other indexes are rebuilt the next time
+        they're requested.
+
+        Classes added directly as ClassFiles are kept.
+
+        :param workers: The maximum number of threads used to re-index
+                        sources concurrently. If set to 1, sources are
+                        re-indexed serially.
+                        [default: chosen by ThreadPoolExecutor]
+        :returns: A :class:`RefreshResult` of the names of the classes that
+                  were added, removed or modified.
         """
-        for source in sources:
-            if isinstance(source, self.klass):
-                self.path_map[source.this.name.value] = source
-                self.class_cache[source.this.name.value] = source
+        with self._lock:
+            sources = list(self._sources)
+            snapshots = list(self._snapshots)
+
+        if workers == 1 or len(sources) < 2:
+            refreshed = list(map(self._refresh_source, sources, snapshots))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                refreshed = list(pool.map(
+                    self._refresh_source,
+                    sources,
+                    snapshots
+                ))
+
+        def merge(indexes):
+            # Later sources replace earlier ones, just as in update().
+            merged = {}
+            for index in indexes:
+                for path, entry in index.entries:
+                    merged[path] = entry, index.fingerprints.get(path)
+            return merged
+
+        before = merge(snapshots)
+        after = merge(refreshed)
+
+        added, removed, modified = set(), set(), set()
+        for path, (_, current) in after.items():
+            if not path.endswith('.class'):
                 continue
+            previous = before.get(path)
+            if previous is None:
+                added.add(path[:-6])
+            elif previous[1] != current:
+                modified.add(path[:-6])
+        removed.update(
+            path[:-6] for path in before
+            if path.endswith('.class') and path not in after
+        )
 
-            # Explicit cast to str to support Path objects.
-            source = str(source)
-            if source.lower().endswith(('.zip', '.jar')):
-                zf = ZipFile(source, 'r')
-                self.path_map.update(zip(zf.namelist(), repeat(zf)))
-            elif os.path.isdir(source):
-                walker = _walk(
-                    source,
-                    follow_links=follow_symlinks,
-                    maximum_depth=maximum_depth
-                )
-                for root, dirs, files in walker:
-                    for file_ in files:
-                        path_full = os.path.join(root, file_)
-                        path_suffix = os.path.relpath(path_full, source)
-                        self.path_map[path_suffix] = path_full
+        with self._lock:
+            # Classes added directly as ClassFiles take precedence, as they
+            # would have if they were added after every source.
+            path_map = {path: entry for path, (entry, _) in after.items()}
+            for path, entry in self.path_map.items():
+                if isinstance(entry, ClassFile):
+                    path_map[path] = entry
+            self.path_map = path_map
+            self._snapshots = refreshed
+
+            for name in removed:
+                self._class_names.pop(name, None)
+                self._packages.remove(name)
+            for name in added:
+                self._class_names[name] = None
+                self._packages.add(name)
+            for name in removed | modified:
+                self.class_cache.pop(name)
+                self._loading.pop(name, None)
+
+            if added or removed or modified:
+                self._annotation_index = None
+                self._nest_index = None
+
+        with self._index_lock:
+            if self._hierarchy is not None:
+                for name in removed:
+                    self._hierarchy.remove(name)
+                self._add_to_hierarchy(self._hierarchy, [
+                    f'{name}.class' for name in added | modified
+                ])
+
+        # Close the jars that were replaced. A jar may still be in use by a
+        # memoryview returned from an earlier read, in which case it's left
+        # for the garbage collector.
+        kept = {id(index.archive) for index in refreshed}
+        for index in snapshots:
+            if index.archive is not None and id(index.archive) not in kept:
+                index.archive.close()
+
+        return RefreshResult(added, removed, modified)
 
     @contextmanager
     def open(self, path: str, mode: str='r') -> IO:
@@ -123,11 +529,54 @@ class ClassLoader(object):
         if isinstance(entry, str):
             with open(entry, 'rb' if mode == 'r' else mode) as source:
                 yield source
-        elif isinstance(entry, ZipFile):
+        elif isinstance(entry, JarReader):
             yield io.BytesIO(entry.read(path))
         else:
             raise NotImplementedError()
 
+    def _read(self, path: str):
+        """Return the complete contents of `path` as a bytes-like object.
+
+        Entries in a :class:`~jawa.jar.JarReader` may be returned as a
+        ``memoryview`` into the JAR, which should not be kept around.
+        """
+        with self._collecting():
+            span = hooks.enabled and hooks.begin('classloader.read', self)
+
+            entry = self.path_map.get(path)
+            if isinstance(entry, JarReader):
+                # The JarReader counts the bytes it reads itself.
+                buff = entry.read(path)
+                size = 0
+            else:
+                with self.open(path) as source:
+                    buff = source.read()
+                size = len(buff)
+
+            if span:
+                span.end(bytes_read=size)
+            return buff
+
+    def _collecting(self):
+        # Record into this ClassLoader's Stats, if it has any.
+        if self._stats is None:
+            return _nothing()
+        return stats.collecting(self._stats)
+
+    def stats(self) -> stats.Stats:
+        """Return a snapshot of everything counted and timed by this
+        ClassLoader, including attributes loaded later from its classes.
+
+        Only available if the ClassLoader was created with `instrument`.
+        To collect stats for a single block of code instead, see
+        :func:`jawa.stats.collect`.
+        """
+        if self._stats is None:
+            raise RuntimeError(
+                'ClassLoader was not created with instrument=True'
+            )
+        return self._stats.snapshot()
+
     def load(self, path: str) -> ClassFile:
         """Load the class at `path` and return it.
 
@@ -137,31 +586,341 @@ class ClassLoader(object):
         :param path: Fully-qualified path to a ClassFile.
         """
         # Try to refresh the class from the cache, loading it from disk
-        # if not found.
-        try:
-            r = self.class_cache.pop(path)
-        except KeyError:
-            with self.open(f'{path}.class') as source:
-                r = self.klass(source)
+        # if not found. If another thread is already loading it, wait for
+        # that instead.
+        with self._lock:
+            r = self.class_cache.get(path)
+            if r is None:
+                future = self._loading.get(path)
+                owner = future is None
+                if owner:
+                    future = self._loading[path] = Future()
 
-        r.classloader = self
-        # Even if it was found re-set the key to update the OrderedDict
-        # ordering.
-        self.class_cache[path] = r
+        if r is None:
+            if not owner:
+                r = future.result()
+            else:
+                try:
+                    with self._collecting():
+                        buff = self._read(f'{path}.class')
+                        r = self.klass(buff)
+                except BaseException as e:
+                    with self._lock:
+                        if self._loading.get(path) is future:
+                            del self._loading[path]
+                    future.set_exception(e)
+                    raise
 
-        # If the cache is enabled remove every item over N started from
-        # the least-used.
-        if self.max_cache > 0:
-            to_pop = max(len(self.class_cache) - self.max_cache, 0)
-            for _ in repeat(None, to_pop):
-                self.class_cache.popitem(last=False)
+                with self._lock:
+                    # Don't cache the class if the loader was cleared while
+                    # it was being loaded.
+                    if self._loading.get(path) is future:
+                        del self._loading[path]
+                        # The size of the class on disk is a cheap, stable
+                        # proxy for how much memory it takes once parsed.
+                        self.class_cache.put(path, r, len(buff))
+                future.set_result(r)
 
+        r.classloader = self
         return r
 
+    def load_many(self, paths: Iterable[str], workers: int=None) \
+            -> Iterator[Tuple[str, ClassFile]]:
+        """Load every class in `paths`, yielding a ``(path, ClassFile)``
+        tuple for each as soon as it's ready.
+
+        Reading and decompressing entries happens on a pool of threads,
+        without sharing any seekable file handles between them, while parsing
+        happens on the calling thread as the results arrive. Results are
+        yielded in completion order, not in the order of `paths`.
+
+        Classes already in the cache are returned from it, but newly loaded
+        classes are not added to it, so a bulk load never flushes the cache.
+
+        :param paths: Fully-qualified paths to ClassFiles.
+        :param workers: The maximum number of reader threads.
+                        [default: the number of CPUs + 4, at most 32]
+        """
+        def _read(path):
+            # JarReaders are safe to share between threads.
+            return self._read(f'{path}.class')
+
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        # Bound the number of decompressed classes waiting to be parsed.
+        window = workers * 4
+        paths = iter(paths)
+        in_flight = {}
+
+        try:
+            while True:
+                for path in paths:
+                    with self._lock:
+                        cached = self.class_cache.get(path)
+                    if cached is not None:
+                        cached.classloader = self
+                        yield path, cached
+                        continue
+
+                    in_flight[pool.submit(_read, path)] = path
+                    if len(in_flight) >= window:
+                        break
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = in_flight.pop(future)
+                    with self._collecting():
+                        r = self.klass(io.BytesIO(future.result()))
+                    r.classloader = self
+                    yield path, r
+        finally:
+            pool.shutdown(wait=True)
+
+    def _worker_spec(self) -> _WorkerSpec:
+        # Classes given directly to update() only exist in this process, so
+        # they're handed to each worker as bytes.
+        classes = []
+        for entry in list(self.path_map.values()):
+            if isinstance(entry, ClassFile):
+                with io.BytesIO() as out:
+                    entry.save(out)
+                    classes.append(out.getvalue())
+
+        parse_cache = None
+        if self.parse_cache is not None:
+            parse_cache = self.parse_cache.path
+
+        return _WorkerSpec(
+            f'{os.getpid()}:{next(_worker_tokens)}',
+            list(self._sources),
+            classes,
+            {
+                'max_cache': self.max_cache,
+                'max_cache_bytes': self.max_cache_bytes,
+                'cache': self.class_cache.empty_copy(),
+                'parse_cache': parse_cache,
+                'release': self.release,
+                'klass': self.klass,
+                'bytecode_transforms': self.bytecode_transforms
+            }
+        )
+
+    def map(self, func: Callable[[ClassFile], Any],
+            classes: Iterable[str]=None, workers: int=None,
+            chunksize: int=64) -> Iterator[Any]:
+        """Call `func` with every class in `classes`, in parallel across
+        a pool of processes, yielding the results in the same order as
+        `classes` as soon as they're available.
+
+        Each worker process opens its own ClassLoader on the same sources,
+        with the same options and an empty cache of the same kind, so
+        `func` and its results must be picklable. Use a function defined
+        at the top level of a module, and return plain values rather than
+        ClassFiles::
+
+            >>> def count_methods(cf):
+            ...     return cf.this.name.value, len(cf.methods)
+            >>> dict(loader.map(count_methods))
+
+        :param func: Called with each loaded ClassFile.
+        :param classes: Fully-qualified paths of the classes to load.
+                        [default: every class in the path map]
+        :param workers: The number of worker processes.
+                        [default: the number of CPUs]
+        :param chunksize: The number of classes handed to a worker at once.
+        """
+        if classes is None:
+            classes = self.classes
+
+        func = functools.partial(_map_chunk, self._worker_spec(), func)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Only a few chunks are submitted ahead of the caller, so that
+            # stopping early doesn't wait for the rest of `classes`.
+            chunks = bounded_map(
+                pool,
+                func,
+                _chunks(classes, chunksize),
+                (workers or os.cpu_count() or 1) * 2
+            )
+            try:
+                for results in chunks:
+                    yield from results
+            finally:
+                chunks.close()
+
+    def reduce(self, func: Callable[[ClassFile], Any],
+               combine: Callable[[Any, Any], Any], initial: Any,
+               classes: Iterable[str]=None, workers: int=None,
+               chunksize: int=64) -> Any:
+        """Call `func` with every class in `classes`, in parallel across a
+        pool of processes, and combine the results with `combine`.
+
+        Each worker combines the results of an entire chunk before sending
+        it back, so only one value per chunk crosses process boundaries.
+        Since each chunk starts from `initial`, it must be an identity for
+        `combine`, such as ``0`` for addition or an empty set for union::
+
+            >>> def method_count(cf):
+            ...     return len(cf.methods)
+            >>> loader.reduce(method_count, operator.add, 0)
+
+        See :meth:`map` for the requirements on `func`, `workers` and
+        `chunksize`.
+
+        :param func: Called with each loaded ClassFile.
+        :param combine: Called with two results, returning a new result.
+        :param initial: The result when there are no classes.
+        :param classes: Fully-qualified paths of the classes to load.
+                        [default: every class in the path map]
+        """
+        if classes is None:
+            classes = self.classes
+
+        func = functools.partial(
+            _reduce_chunk,
+            self._worker_spec(),
+            func,
+            combine,
+            initial
+        )
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return functools.reduce(
+                combine,
+                pool.map(func, _chunks(classes, chunksize)),
+                initial
+            )
+
+    def dependency_graph(self, classes: Iterable[str]=None, workers: int=None,
+                         chunksize: int=256) -> DependencyGraph:
+        """Return a :class:`~jawa.dependencies.DependencyGraph` of every
+        class in `classes`.
+
+        Each class is read with a header-only scan. Unless `workers` is 1,
+        the scans happen across a pool of processes, as with :meth:`map`,
+        and their edges are added to the graph as they arrive.
+
+        :param classes: Fully-qualified paths of the classes to add.
+                        [default: every class in the path map]
+        :param workers: The number of worker processes.
+                        [default: the number of CPUs]
+        :param chunksize: The number of classes handed to a worker at once.
+        """
+        if classes is None:
+            classes = self.classes
+
+        graph = DependencyGraph()
+        if workers == 1:
+            for path in classes:
+                graph.add(ClassScan(self._read(f'{path}.class')))
+            return graph
+
+        func = functools.partial(_references_chunk, self._worker_spec())
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for references in pool.map(func, _chunks(classes, chunksize)):
+                for name, names in references:
+                    graph.add_class(name, names)
+        return graph
+
+    def grep(self, pattern, classes: Iterable[str]=None, workers: int=None,
+             chunksize: int=64, ordered: bool=False,
+             first: bool=False) -> Iterator[Tuple[str, List[str]]]:
+        """Search the UTF8 constants of every class in `classes`, yielding a
+        ``(path, constants)`` tuple for each class with at least one
+        constant matching `pattern`.
+
+        Each class is read with a header-only scan. Unless `workers` is 1,
+        classes are searched across a pool of processes, as with
+        :meth:`map`, and results are yielded as soon as they arrive.
+
+            >>> for path, constants in loader.grep(r'jdbc:'):
+            ...     print(path, constants)
+
+        :param pattern: A regular expression, either as a string or
+                        compiled, matched against the start of each
+                        constant with ``re.match``.
+        :param classes: Fully-qualified paths of the classes to search.
+                        [default: every class in the path map]
+        :param workers: The number of worker processes.
+                        [default: the number of CPUs]
+        :param chunksize: The number of classes handed to a worker at once.
+        :param ordered: If True, yield results in the order of `classes`
+                        rather than as soon as they're found.
+        :param first: If True, stop searching each class at its first
+                      matching constant.
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        if classes is None:
+            classes = self.classes
+
+        if workers == 1:
+            for path in classes:
+                matches = _grep_class(self, pattern, path, first)
+                if matches:
+                    yield path, matches
+            return
+
+        func = functools.partial(
+            _grep_chunk,
+            self._worker_spec(),
+            pattern,
+            first
+        )
+        chunks = _chunks(classes, chunksize)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if ordered:
+                ordered_chunks = bounded_map(
+                    pool,
+                    func,
+                    chunks,
+                    (workers or os.cpu_count() or 1) * 2
+                )
+                try:
+                    for results in ordered_chunks:
+                        yield from results
+                finally:
+                    ordered_chunks.close()
+                return
+
+            # Bound the number of chunks in flight, so that `classes` can be
+            # arbitrarily long.
+            window = (workers or os.cpu_count() or 1) * 2
+            pending = set()
+            try:
+                for chunk in chunks:
+                    pending.add(pool.submit(func, chunk))
+                    if len(pending) < window:
+                        continue
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            finally:
+                # Don't wait for chunks nobody will see if we stopped early.
+                for future in pending:
+                    future.cancel()
+
     def clear(self):
         """Erase all stored paths and all cached classes."""
-        self.path_map.clear()
-        self.class_cache.clear()
+        with self._lock:
+            self.path_map.clear()
+            self.class_cache.clear()
+            self._loading.clear()
+            self._sources.clear()
+            self._snapshots.clear()
+            self._class_names.clear()
+            self._packages = PackageTrie()
+            self._annotation_index = None
+            self._nest_index = None
+            self._hierarchy = None
 
     def dependencies(self, path: str) -> Set[str]:
         """Returns a set of all classes referenced by the ClassFile at
@@ -172,6 +931,9 @@ class ClassLoader(object):
 
         :param path: Fully-qualified path to a ClassFile.
         """
+        if self.parse_cache is not None:
+            return set(self.summary(path).dependencies)
+
         return set(c.name.value for c in self.search_constant_pool(
             path=path,
             type_=ConstantClass
@@ -194,10 +956,132 @@ class ClassLoader(object):
             pool.unpack(source)
             yield from pool.find(**options)
 
+    def scan(self, path: str) -> ClassScan:
+        """Return a header-only :class:`~jawa.scan.ClassScan` of the class at
+        `path`.
+
+        This is an optimization method that does not load a complete ClassFile,
+        nor does it add the results to the ClassLoader cache.
+
+        :param path: Fully-qualified path to a ClassFile.
+        """
+        return ClassScan(bytes(self._read(f'{path}.class')))
+
+    def summary(self, path: str) -> ClassSummary:
+        """Return a :class:`~jawa.parse_cache.ClassSummary` of the class at
+        `path`.
+
+        If the class loader has a parse cache, the summary is taken from it
+        when the class is unchanged, without reading the class at all, and
+        stored in it otherwise. Call ``parse_cache.commit()`` to make sure
+        new summaries are written to disk.
+
+        :param path: Fully-qualified path to a ClassFile.
+        """
+        if self.parse_cache is None:
+            return summarize(self.scan(path))
+
+        entry = self.path_map.get(f'{path}.class')
+        if entry is None:
+            raise FileNotFoundError()
+
+        key = entry_key(entry, f'{path}.class')
+        summary = self.parse_cache.get(*key)
+        if summary is None:
+            summary = summarize(self.scan(path))
+            self.parse_cache.put(*key, summary)
+        return summary
+
+    def annotation_index(self) -> AnnotationIndex:
+        """Return an :class:`~jawa.indexes.AnnotationIndex` of every class in
+        the path map.
+
+        The index is built from header-only scans the first time it's
+        requested and reused until the class loader is next updated or
+        cleared.
+        """
+        with self._index_lock:
+            if self._annotation_index is None:
+                index = AnnotationIndex()
+                for path in self.classes:
+                    index.add(ClassScan(self._read(f'{path}.class')))
+                self._annotation_index = index
+            return self._annotation_index
+
+    def nest_index(self) -> NestIndex:
+        """Return a :class:`~jawa.indexes.NestIndex` of every class in the
+        path map.
+
+        Classes whose constant pool doesn't mention either nest attribute are
+        skipped without being scanned. The index is built the first time it's
+        requested and reused until the class loader is next updated or
+        cleared.
+        """
+        with self._index_lock:
+            if self._nest_index is None:
+                index = NestIndex()
+                for path in self.classes:
+                    buff = bytes(self._read(f'{path}.class'))
+
+                    # Every attribute name is a length-prefixed UTF8
+                    # constant, so this finds them without scanning the pool.
+                    if (b'\x00\x08NestHost' in buff or
+                            b'\x00\x0bNestMembers' in buff):
+                        index.add(ClassScan(buff))
+                self._nest_index = index
+            return self._nest_index
+
+    def _add_to_hierarchy(self, index: HierarchyIndex, paths: Iterable[str]):
+        for path in paths:
+            entry = self.path_map.get(path)
+            if isinstance(entry, ClassFile):
+                with io.BytesIO() as out:
+                    entry.save(out)
+                    buff = out.getvalue()
+            elif entry is not None:
+                buff = self._read(path)
+            else:
+                continue
+            index.add(ClassScan(buff))
+
+    def hierarchy(self) -> HierarchyIndex:
+        """Return a :class:`~jawa.indexes.HierarchyIndex` of every class in
+        the path map, including classes added directly as ClassFiles.
+
+        The index is built from header-only scans the first time it's
+        requested. After that, classes added by :meth:`update` are added to
+        it as they're indexed, rather than rebuilding it.
+        """
+        with self._index_lock:
+            if self._hierarchy is None:
+                index = HierarchyIndex()
+                self._add_to_hierarchy(index, [
+                    path for path, entry in list(self.path_map.items())
+                    if path.endswith('.class') or
+                    isinstance(entry, ClassFile)
+                ])
+                self._hierarchy = index
+            return self._hierarchy
+
+    def packages(self) -> Iterator[str]:
+        """Yield every package that directly contains at least one class
+        in the path map, such as ``java/util``. The default package is the
+        empty string."""
+        with self._lock:
+            packages = list(self._packages.packages())
+        yield from packages
+
+    def classes_in(self, package: str, recursive: bool=False) -> Set[str]:
+        """Return the name of every class in `package`.
+
+        :param package: The package, such as ``java/util``.
+        :param recursive: If True, include classes in sub-packages.
+                          [default: False]
+        """
+        with self._lock:
+            return self._packages.classes_in(package, recursive=recursive)
+
     @property
     def classes(self) -> Iterator[str]:
         """Yield the name of all classes discovered in the path map."""
-        yield from (
-            c[:-6]
-            for c in self.path_map.keys() if c.endswith('.class')
-        )
+        yield from list(self._class_names)
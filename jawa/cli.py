@@ -1,6 +1,13 @@
+import io
+import os
 import re
 import json
+import pstats
+import cProfile
 import importlib
+import tracemalloc
+from time import perf_counter
+from itertools import islice
 
 import click
 
@@ -8,7 +15,8 @@ from jawa.classloader import ClassLoader
 from jawa.cf import ClassVersion, ClassFile
 from jawa.attribute import get_attribute_classes
 from jawa.util import bytecode, shell
-from jawa.constants import UTF8
+from jawa.constant_index import ConstantIndex
+from jawa.scan import ClassScan
 
 
 @click.group()
@@ -132,15 +140,57 @@ def definition_to_json(source):
 
 @cli.command()
 @click.argument('source', type=click.Path(exists=True))
-def dependencies(source):
+@click.option(
+    '--format',
+    'format_',
+    type=click.Choice(['list', 'dot', 'json']),
+    default='list',
+    help='Output a list of classes, or the full graph as DOT or JSON.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    help='Number of processes to use, or 0 for one per CPU. [default: 1]'
+)
+def dependencies(source, format_='list', jobs=1):
     """Output a list of all classes referenced by the given source."""
     loader = ClassLoader(source, max_cache=-1)
-    all_dependencies = set()
-    for klass in loader.classes:
-        new_dependencies = loader.dependencies(klass) - all_dependencies
-        all_dependencies.update(new_dependencies)
-        for new_dep in new_dependencies:
-            click.echo(new_dep)
+    graph = loader.dependency_graph(workers=jobs or None)
+
+    stdout = click.get_text_stream('stdout')
+    if format_ == 'dot':
+        graph.write_dot(stdout)
+    elif format_ == 'json':
+        graph.write_json(stdout)
+    else:
+        for name in graph:
+            click.echo(name)
+
+
+def _default_index_path(source):
+    return os.path.abspath(source).rstrip(os.path.sep) + '.jawa-index'
+
+
+@cli.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option(
+    '--output',
+    '-o',
+    type=click.Path(),
+    default=None,
+    help='Where to write the index. [default: SOURCE.jawa-index]'
+)
+def index(source, output=None):
+    """Build a constant index of all classes in source.
+
+    The index is used by grep to only search classes that could match.
+    """
+    loader = ClassLoader(source, max_cache=-1)
+    output = output or _default_index_path(source)
+    with ConstantIndex.build(loader, output) as constant_index:
+        click.echo(f'Indexed {len(constant_index)} classes into {output}')
 
 
 @cli.command()
@@ -152,17 +202,222 @@ def dependencies(source):
     is_flag=True,
     help='Stop iteration on first matching class.'
 )
-def grep(source, regex, stop_on_first=False):
+@click.option(
+    '--index',
+    'index_path',
+    type=click.Path(),
+    default=None,
+    help='A constant index built by the index command.'
+         ' [default: SOURCE.jawa-index, if it exists]'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    help='Number of processes to use, or 0 for one per CPU. [default: 1]'
+)
+@click.option(
+    '--count',
+    is_flag=True,
+    default=False,
+    help='Print the number of matching constants in each class.'
+)
+@click.option(
+    '--with-constant',
+    is_flag=True,
+    default=False,
+    help='Print every matching constant after its class.'
+)
+@click.option(
+    '--ordered',
+    is_flag=True,
+    default=False,
+    help='Print classes in classpath order, rather than as soon as they'
+         ' match.'
+)
+def grep(source, regex, stop_on_first=False, index_path=None, jobs=1,
+         count=False, with_constant=False, ordered=False):
     """Grep the constant pool of all classes in source."""
+    if count and with_constant:
+        raise click.UsageError(
+            '--count and --with-constant cannot be used together.'
+        )
+
     loader = ClassLoader(source, max_cache=-1)
     r = re.compile(regex)
 
-    def _matches(constant):
-        return r.match(constant.value)
+    classes = loader.classes
+
+    index_path = index_path or _default_index_path(source)
+    if os.path.exists(index_path):
+        with ConstantIndex(index_path) as constant_index:
+            if constant_index.is_current(loader):
+                candidates = constant_index.candidates(r)
+                classes = (c for c in classes if c in candidates)
+            else:
+                click.echo(
+                    f'{index_path} is out of date, searching every class.',
+                    err=True
+                )
 
-    for klass in loader.classes:
-        it = loader.search_constant_pool(path=klass, type_=UTF8, f=_matches)
-        if next(it, None):
-            print(klass)
+    results = loader.grep(
+        r,
+        classes=classes,
+        workers=jobs or None,
+        ordered=ordered,
+        first=not (count or with_constant)
+    )
+    try:
+        for klass, constants in results:
+            if count:
+                click.echo(f'{klass}:{len(constants)}')
+            elif with_constant:
+                for constant in constants:
+                    click.echo(f'{klass}:{constant}')
+            else:
+                click.echo(klass)
             if stop_on_first:
                 break
+    finally:
+        results.close()
+
+
+@cli.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option(
+    '--limit',
+    type=int,
+    default=None,
+    help='Only measure the first N classes.'
+)
+def bench(source, limit=None):
+    """Measure throughput on the classes in source.
+
+    Reports classes/sec and MB/sec for reading every class, peeking at it
+    (a header-only scan), fully parsing it, disassembling every method and
+    saving it again. Sizes are of the uncompressed classes.
+    """
+    loader = ClassLoader(source, max_cache=-1)
+    classes = list(islice(loader.classes, limit))
+    if not classes:
+        raise click.ClickException(f'No classes found in {source}.')
+
+    parsed = []
+    buffers = []
+
+    # Each phase returns the number of classes and bytes it handled.
+    def read():
+        buffers.extend(bytes(loader._read(f'{c}.class')) for c in classes)
+        return len(buffers), sum(map(len, buffers))
+
+    def peek():
+        for buff in buffers:
+            ClassScan(buff)
+        return len(buffers), sum(map(len, buffers))
+
+    def parse():
+        parsed.extend(ClassFile(buff) for buff in buffers)
+        return len(buffers), sum(map(len, buffers))
+
+    def disassemble():
+        for cf in parsed:
+            for method in cf.methods:
+                if method.code:
+                    for _ in method.code.disassemble(transforms=[]):
+                        pass
+        return len(buffers), sum(map(len, buffers))
+
+    def save():
+        count = size = 0
+        for cf, buff in zip(parsed, buffers):
+            with io.BytesIO() as out:
+                try:
+                    cf.save(out)
+                except NotImplementedError:
+                    # Some attributes, such as StackMapTable, can be read
+                    # but not written.
+                    continue
+            count += 1
+            size += len(buff)
+        if count < len(parsed):
+            click.echo(
+                f'Skipped saving {len(parsed) - count} classes with'
+                f' attributes that can\'t be written.',
+                err=True
+            )
+        return count, size
+
+    click.echo(f'{"phase":<12} {"seconds":>10} {"classes/s":>12} '
+               f'{"MB/s":>10}')
+    for phase in (read, peek, parse, disassemble, save):
+        start = perf_counter()
+        count, size = phase()
+        took = max(perf_counter() - start, 1e-9)
+        click.echo(
+            f'{phase.__name__:<12} {took:>10.3f} '
+            f'{count / took:>12.1f} '
+            f'{size / took / 1024 / 1024:>10.2f}'
+        )
+
+
+@cli.command(context_settings={'ignore_unknown_options': True})
+@click.argument('source', type=click.Path(exists=True))
+@click.argument('command', nargs=-1, type=click.UNPROCESSED, required=True)
+@click.option(
+    '--sort',
+    type=click.Choice(['cumulative', 'tottime', 'calls']),
+    default='cumulative',
+    help='How to order the hotspots. [default: cumulative]'
+)
+@click.option(
+    '--top',
+    type=int,
+    default=20,
+    help='The number of hotspots to print. [default: 20]'
+)
+@click.option(
+    '--memory/--no-memory',
+    default=True,
+    help='Trace allocations to report peak memory, which is slower.'
+         ' [default: on]'
+)
+@click.pass_context
+def profile(ctx, source, command, sort='cumulative', top=20, memory=True):
+    """Profile another command on source.
+
+    Runs COMMAND with source as its first argument, followed by anything
+    else given after --, such as:
+
+    \b
+        jawa profile app.jar -- grep 'jdbc:.*'
+
+    The command's output is printed as usual, and the top hotspots and peak
+    memory are printed to stderr once it's finished. Work done in other
+    processes, such as with a --jobs greater than 1, isn't included.
+    """
+    name, *args = command
+    subcommand = cli.get_command(ctx, name)
+    if subcommand is None or subcommand is profile:
+        raise click.UsageError(f'No command named {name!r}.')
+
+    sub_ctx = subcommand.make_context(name, [source, *args], parent=ctx)
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        with sub_ctx:
+            subcommand.invoke(sub_ctx)
+    finally:
+        profiler.disable()
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(sort).print_stats(top)
+        click.echo(report.getvalue(), err=True)
+        if memory:
+            click.echo(f'Peak memory: {peak / 1024 / 1024:.2f} MB', err=True)
@@ -0,0 +1,255 @@
+"""
+A persistent trigram index over the UTF8 constants of a classpath.
+
+Searching the constant pools of a large classpath means reading every
+class. A :class:`ConstantIndex` records which three-character substrings
+(trigrams) appear in the UTF8 constants of each class. Since String
+constants refer to UTF8 constants, they're covered too. A regular
+expression can then only match classes containing every trigram of the
+literal text it requires, which usually narrows a search to a handful of
+classes::
+
+    >>> loader = ClassLoader('app.jar')
+    >>> index = ConstantIndex.build(loader, 'app.jar.jawa-index')
+    >>> index.candidates(re.compile('jdbc:mysql://'))
+    {'com/example/Database'}
+
+The index also records a fingerprint of each class, taken from the JAR's
+central directory or the file's size and modification time, so
+:meth:`ConstantIndex.is_current` can tell whether the index still matches
+a ClassLoader without reading any classes.
+"""
+import re
+import sqlite3
+from array import array
+from typing import Iterable, List, Optional, Set
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from jawa.jar import fingerprint
+from jawa.scan import ClassScan
+
+
+_SCHEMA_VERSION = 2
+
+
+def trigrams(value: str) -> Set[str]:
+    """Returns every three-character substring of `value`."""
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def _literals(parsed, out: List[str]):
+    # Collect the runs of literal characters that every match of the parsed
+    # pattern must contain. Anything that isn't certain to match (such as
+    # alternations and optional repeats) ends the current run and is
+    # otherwise ignored.
+    run = []
+
+    def flush():
+        if run:
+            out.append(''.join(run))
+            del run[:]
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            # Groups with their own (?i) can't be used.
+            if not av[1] & re.IGNORECASE:
+                _literals(av[-1], out)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0]:
+            _literals(av[2], out)
+    flush()
+
+
+def required_trigrams(pattern) -> Optional[Set[str]]:
+    """
+    Returns a set of trigrams that any string matching `pattern` must
+    contain, or `None` if the pattern doesn't require any.
+
+    :param pattern: A regular expression, either as a string or compiled.
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    if pattern.flags & re.IGNORECASE or isinstance(pattern.pattern, bytes):
+        return None
+
+    literals = []
+    _literals(sre_parse.parse(pattern.pattern, pattern.flags), literals)
+    required = set()
+    for literal in literals:
+        required.update(trigrams(literal))
+    return required or None
+
+
+def _fingerprint(entry, path: str) -> str:
+    return '{0}:{1}'.format(*fingerprint(entry, path))
+
+
+class ConstantIndex(object):
+    """
+    A trigram index stored in a SQLite database.
+
+    Use :meth:`build` to create or replace an index, and the constructor to
+    open an existing one.
+
+    :param path: The path to the database.
+    """
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            self._db.executescript(
+                'DROP TABLE IF EXISTS classes;'
+                'DROP TABLE IF EXISTS trigrams;'
+                f'PRAGMA user_version = {_SCHEMA_VERSION};'
+            )
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS classes ('
+            '   id INTEGER PRIMARY KEY,'
+            '   name TEXT NOT NULL UNIQUE,'
+            '   fingerprint TEXT NOT NULL'
+            ');'
+            'CREATE TABLE IF NOT EXISTS trigrams ('
+            '   trigram TEXT PRIMARY KEY,'
+            '   postings BLOB NOT NULL'
+            ');'
+        )
+        self._db.commit()
+
+    @classmethod
+    def build(cls, loader, path: str,
+              classes: Iterable[str]=None) -> 'ConstantIndex':
+        """
+        Index every class in `classes`, replacing anything already stored
+        at `path`, and return the new index.
+
+        :param loader: The :class:`~jawa.classloader.ClassLoader` to read
+                       classes from.
+        :param path: The path to the database.
+        :param classes: Fully-qualified paths of the classes to index.
+                        [default: every class in the path map]
+        """
+        if classes is None:
+            classes = loader.classes
+
+        index = cls(path)
+        db = index._db
+        db.execute('DELETE FROM classes')
+        db.execute('DELETE FROM trigrams')
+
+        postings = {}
+        rows = []
+        for class_id, name in enumerate(classes):
+            path = f'{name}.class'
+            rows.append((
+                class_id,
+                name,
+                _fingerprint(loader.path_map[path], path)
+            ))
+
+            scan = ClassScan(loader._read(path))
+            found = set()
+            for idx in scan.constants(1):
+                found.update(trigrams(scan.utf8(idx)))
+            for trigram in found:
+                try:
+                    postings[trigram].append(class_id)
+                except KeyError:
+                    postings[trigram] = array('I', [class_id])
+
+        db.executemany('INSERT INTO classes VALUES (?, ?, ?)', rows)
+        db.executemany(
+            'INSERT INTO trigrams VALUES (?, ?)',
+            ((k, v.tobytes()) for k, v in postings.items())
+        )
+        db.commit()
+        return index
+
+    def _postings(self, trigram: str) -> Set[int]:
+        row = self._db.execute(
+            'SELECT postings FROM trigrams WHERE trigram = ?',
+            (trigram,)
+        ).fetchone()
+        if row is None:
+            return set()
+        return set(array('I', row[0]))
+
+    def candidates(self, pattern) -> Set[str]:
+        """
+        Returns the classes that may contain a UTF8 constant matching
+        `pattern`. Every class that does is included, but some that are
+        returned may not.
+
+        :param pattern: A regular expression, either as a string or
+                        compiled.
+        """
+        required = required_trigrams(pattern)
+        if required is None:
+            return set(self)
+
+        ids = None
+        # Start with the rarest trigrams to shrink the set quickly.
+        for postings in sorted(map(self._postings, required), key=len):
+            ids = postings if ids is None else ids & postings
+            if not ids:
+                return set()
+
+        names = dict(self._db.execute('SELECT id, name FROM classes'))
+        return {names[class_id] for class_id in ids}
+
+    def is_current(self, loader) -> bool:
+        """
+        True if the index covers exactly the classes in `loader`, and none
+        of them have changed since it was built.
+        """
+        indexed = dict(self._db.execute(
+            'SELECT name, fingerprint FROM classes'
+        ))
+
+        count = 0
+        for name in loader.classes:
+            count += 1
+            fingerprint = indexed.get(name)
+            if fingerprint is None:
+                return False
+
+            entry = loader.path_map[f'{name}.class']
+            try:
+                if fingerprint != _fingerprint(entry, f'{name}.class'):
+                    return False
+            except OSError:
+                return False
+
+        return count == len(indexed)
+
+    def __iter__(self):
+        """Yields the name of every indexed class."""
+        for row in self._db.execute('SELECT name FROM classes'):
+            yield row[0]
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM classes').fetchone()[0]
+
+    def close(self):
+        """Close the database."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f'<ConstantIndex(path={self.path!r})>'
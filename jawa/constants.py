@@ -1,5 +1,6 @@
 from struct import unpack, pack
 
+from jawa import hooks
 from jawa.util.utf import decode_modified_utf8, encode_modified_utf8
 
 
@@ -330,7 +331,9 @@ _constant_fmts = (
     ('>BH', 3),
     ('>H', 2),
     None,
-    ('>HH', 4)
+    ('>HH', 4),
+    ('>H', 2),
+    ('>H', 2)
 )
 
 
@@ -458,6 +461,32 @@ class ConstantPool(object):
         ))
         return self.get(self.raw_count - 1)
 
+    def create_module(self, name: str) -> Module:
+        """
+        Creates a new :class:`Module`, adding it to the pool and returning it.
+
+        :param name: The name of the new module.
+        """
+        self.append((
+            19,
+            self.create_utf8(name).index
+        ))
+        return self.get(self.raw_count - 1)
+
+    def create_package(self, name: str) -> PackageInfo:
+        """
+        Creates a new :class:`PackageInfo`, adding it to the pool and
+        returning it.
+
+        :param name: The internal name of the new package, such as
+                     ``java/lang``.
+        """
+        self.append((
+            20,
+            self.create_utf8(name).index
+        ))
+        return self.get(self.raw_count - 1)
+
     def create_string(self, value: str) -> String:
         """
         Creates a new :class:`ConstantString`, adding it to the pool and
@@ -548,8 +577,11 @@ class ConstantPool(object):
 
         :param fio: Any file-like object providing `read()`
         """
+        span = hooks.enabled and hooks.begin('constants.unpack', self)
+
         # Reads in the ConstantPool (constant_pool in the JVM Spec)
         constant_pool_count = unpack('>H', fio.read(2))[0]
+        decoded = constant_pool_count - 1
 
         # Pull this locally so CPython doesn't do a lookup each time.
         read = fio.read
@@ -580,6 +612,9 @@ class ConstantPool(object):
                     self.append(None)
                     constant_pool_count -= 1
 
+        if span:
+            span.end(constants_decoded=decoded)
+
     def pack(self, fout):
         """
         Write the ConstantPool to the file-like object `fout`.
@@ -0,0 +1,282 @@
+"""
+Class-level dependency graphs.
+
+A class depends on every class it names anywhere in its header: its
+``ConstantClass`` constants, the descriptors of its fields, methods,
+``NameAndType`` and ``MethodType`` constants, and its generic
+``Signature`` attributes. All of these are found with a header-only
+:class:`~jawa.scan.ClassScan`, without loading a complete ClassFile::
+
+    >>> graph = loader.dependency_graph()
+    >>> graph.dependents('com/example/Util')
+    {'com/example/Main'}
+    >>> with open('deps.dot', 'w') as out:
+    ...     graph.write_dot(out)
+"""
+import json
+from array import array
+from struct import unpack_from
+from typing import IO, Iterable, Iterator, List, Set
+
+from jawa.scan import ClassScan
+from jawa.util.descriptor import descriptor_types, signature_types
+
+
+def class_references(scan: ClassScan) -> Set[str]:
+    """
+    Returns the internal name of every class referenced by the ClassFile
+    behind `scan`, excluding the class itself. Array types are reduced to
+    their element type, and arrays of primitives are ignored.
+    """
+    utf8, u2 = scan.utf8, scan.u2
+    references = set()
+
+    for idx in scan.constants(7):
+        name = scan.class_name(idx)
+        if name.startswith('['):
+            references.update(descriptor_types(name))
+        else:
+            references.add(name)
+
+    # NameAndType (12) and MethodType (16) constants.
+    for idx in scan.constants(12):
+        references.update(descriptor_types(utf8(u2(idx, 1))))
+    for idx in scan.constants(16):
+        references.update(descriptor_types(utf8(u2(idx))))
+
+    attributes = [scan.attributes]
+    for member in scan.fields + scan.methods:
+        references.update(descriptor_types(utf8(member.descriptor_index)))
+        attributes.append(member.attributes)
+
+    for table in attributes:
+        for attribute in scan.find_attributes('Signature', table):
+            signature_index = unpack_from('>H', scan.info(attribute))[0]
+            references.update(signature_types(utf8(signature_index)))
+
+    references.discard(scan.this)
+    return references
+
+
+class DependencyGraph(object):
+    """
+    A directed graph from each class to the classes it references.
+
+    Names are interned to integers and each class's edges are stored as an
+    array of them. Classes that are referenced but were never added, such
+    as those from the JDK, are nodes with no edges of their own.
+    """
+    def __init__(self):
+        self._names = []
+        self._ids = {}
+        self._edges = []
+        self._reverse = None
+
+    def _intern(self, name: str) -> int:
+        try:
+            return self._ids[name]
+        except KeyError:
+            pass
+
+        idx = self._ids[name] = len(self._names)
+        self._names.append(name)
+        self._edges.append(None)
+        return idx
+
+    def add(self, scan: ClassScan):
+        """
+        Add the class behind `scan` and its references to the graph.
+        """
+        self.add_class(scan.this, class_references(scan))
+
+    def add_class(self, name: str, references: Iterable[str]):
+        """
+        Add the class `name`, which references each class in `references`,
+        replacing it if it's already in the graph.
+        """
+        idx = self._intern(name)
+        self._edges[idx] = array('L', sorted(
+            self._intern(reference)
+            for reference in set(references) if reference != name
+        ))
+        self._reverse = None
+
+    def _out(self, idx: int):
+        return self._edges[idx] or ()
+
+    def _in(self, idx: int):
+        if self._reverse is None:
+            reverse = [array('L') for _ in self._names]
+            for source, edges in enumerate(self._edges):
+                for target in edges or ():
+                    reverse[target].append(source)
+            self._reverse = reverse
+        return self._reverse[idx]
+
+    def _reachable(self, starts, edges) -> Set[int]:
+        seen = set(starts)
+        stack = list(starts)
+        while stack:
+            for target in edges(stack.pop()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def _names_of(self, ids) -> Set[str]:
+        names = self._names
+        return {names[idx] for idx in ids}
+
+    def dependencies(self, name: str, transitive: bool=False) -> Set[str]:
+        """
+        Returns the classes referenced by `name`.
+
+        :param name: The internal name of a class.
+        :param transitive: If True, also include every class those classes
+                           depend on, and so on.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return set()
+        if not transitive:
+            return self._names_of(self._out(idx))
+        reachable = self._reachable(self._out(idx), self._out)
+        return self._names_of(reachable)
+
+    def dependents(self, name: str, transitive: bool=False) -> Set[str]:
+        """
+        Returns the classes that reference `name`.
+
+        :param name: The internal name of a class.
+        :param transitive: If True, also include every class that depends on
+                           those classes, and so on.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return set()
+        if not transitive:
+            return self._names_of(self._in(idx))
+        return self._names_of(self._reachable(self._in(idx), self._in))
+
+    def closure(self, names: Iterable[str]) -> Set[str]:
+        """
+        Returns `names` and everything they transitively depend on, such as
+        the minimal set of classes needed to run them.
+        """
+        starts = [self._ids[name] for name in names if name in self._ids]
+        return self._names_of(self._reachable(starts, self._out))
+
+    def strongly_connected_components(self) -> Iterator[List[str]]:
+        """
+        Yields every strongly connected component of the graph as a list of
+        names, dependencies before their dependents.
+        """
+        # An iterative version of Tarjan's algorithm, as the recursive one
+        # quickly exceeds Python's stack on real classpaths.
+        count = len(self._names)
+        index = array('l', [-1]) * count
+        low = array('l', [0]) * count
+        on_stack = bytearray(count)
+        stack = []
+        counter = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+
+            work = [(root, iter(self._out(root)))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                node, edges = work[-1]
+                for target in edges:
+                    if index[target] == -1:
+                        index[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = 1
+                        work.append((target, iter(self._out(target))))
+                        break
+                    elif on_stack[target]:
+                        low[node] = min(low[node], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(self._names[member])
+                            if member == node:
+                                break
+                        yield component
+
+    def cycles(self) -> Iterator[List[str]]:
+        """
+        Yields every group of classes that depend on each other, which is
+        every strongly connected component with more than one class.
+        """
+        for component in self.strongly_connected_components():
+            if len(component) > 1:
+                yield component
+
+    def edges(self) -> Iterator[tuple]:
+        """Yields a ``(class, dependency)`` tuple for every edge."""
+        names = self._names
+        for source, targets in enumerate(self._edges):
+            for target in targets or ():
+                yield names[source], names[target]
+
+    @property
+    def classes(self) -> Iterator[str]:
+        """Yields the name of every class added to the graph."""
+        names = self._names
+        for idx, edges in enumerate(self._edges):
+            if edges is not None:
+                yield names[idx]
+
+    def write_dot(self, out: IO[str], name: str='dependencies'):
+        """
+        Write the graph to the text file `out` in Graphviz's DOT format, one
+        edge at a time.
+        """
+        out.write(f'digraph {json.dumps(name)} {{\n')
+        for source, target in self.edges():
+            out.write(f'    {json.dumps(source)} -> {json.dumps(target)};\n')
+        out.write('}\n')
+
+    def write_json(self, out: IO[str]):
+        """
+        Write the graph to the text file `out` as a JSON object mapping
+        each class added to the graph to a list of its dependencies, one
+        class at a time.
+        """
+        names = self._names
+        out.write('{')
+        first = True
+        for source, targets in enumerate(self._edges):
+            if targets is None:
+                continue
+            if not first:
+                out.write(',')
+            first = False
+            out.write(f'\n    {json.dumps(names[source])}: ')
+            out.write(json.dumps([names[target] for target in targets]))
+        out.write('\n}\n')
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields every node, including classes that were only referenced."""
+        return iter(list(self._names))
+
+    def __len__(self):
+        return len(self._names)
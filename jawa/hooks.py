@@ -0,0 +1,118 @@
+"""
+Hooks for tracing the hot paths of reading and parsing classes.
+
+Each hook is called as ``callback(event, subject)`` when an event starts,
+where `subject` is the object doing the work. It may return a callable,
+which is called with a dict of details (such as the number of bytes read)
+when the event ends. This maps neatly onto tracing spans::
+
+    >>> def trace(event, subject):
+    ...     span = tracer.start_span(event)
+    ...     return lambda details: span.end()
+    >>> hooks.on('attribute.load', trace)
+
+If the work raises an exception, the event never ends.
+
+While no hooks are registered, each instrumented call site costs a single
+check of :data:`enabled`. :mod:`jawa.stats` is built on these hooks.
+"""
+import threading
+from typing import Callable, Dict, Optional
+
+
+#: Every event, and the subject each is called with.
+EVENTS = {
+    # Reading the contents of a path, including decompressing it.
+    'classloader.read': 'ClassLoader',
+    # Reading and decompressing a single entry.
+    'jar.read': 'JarReader',
+    # Parsing a complete ClassFile.
+    'class.parse': 'ClassFile',
+    # Parsing a ConstantPool.
+    'constants.unpack': 'ConstantPool',
+    # Loading an attribute the first time it's accessed.
+    'attribute.load': 'AttributeTable',
+    # Disassembling a method, ending once every instruction has been
+    # yielded or the iterator is closed.
+    'code.disassemble': 'CodeAttribute'
+}
+
+#: True while any hook is registered. Instrumented code checks this before
+#: doing anything else.
+enabled = False
+
+_registry: Dict[str, tuple] = {}
+_registry_lock = threading.Lock()
+
+
+def on(event: str, callback: Callable) -> Callable:
+    """
+    Call `callback` every time `event` starts. Returns `callback`, so it
+    can also be used as a decorator.
+
+    :param event: One of :data:`EVENTS`, such as ``attribute.load``.
+    :param callback: Called as ``callback(event, subject)``, optionally
+                     returning a callable to be called as
+                     ``end(details)`` when the event ends.
+    """
+    global enabled, _registry
+    if event not in EVENTS:
+        raise ValueError(f'unknown event {event!r}')
+
+    # The registry is replaced rather than modified, so events can be
+    # started from other threads without taking the lock.
+    with _registry_lock:
+        registry = dict(_registry)
+        registry[event] = registry.get(event, ()) + (callback,)
+        _registry = registry
+        enabled = True
+    return callback
+
+
+def off(event: str, callback: Callable):
+    """Stop calling `callback` for `event`, if it's registered."""
+    global enabled, _registry
+    with _registry_lock:
+        registry = dict(_registry)
+        callbacks = list(registry.get(event, ()))
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if callbacks:
+            registry[event] = tuple(callbacks)
+        else:
+            registry.pop(event, None)
+        _registry = registry
+        enabled = bool(registry)
+
+
+class Span(object):
+    """An event that has started, returned by :func:`begin`."""
+    __slots__ = ('_ends',)
+
+    def __init__(self, ends):
+        self._ends = ends
+
+    def end(self, **details):
+        """End the event, passing `details` to each hook."""
+        for end in reversed(self._ends):
+            end(details)
+
+
+def begin(event: str, subject=None) -> Optional[Span]:
+    """
+    Start `event`, calling every hook registered for it. Returns a
+    :class:`Span` to end, or `None` if no hook needs to know when it ends.
+
+    Call sites should check :data:`enabled` first::
+
+        span = hooks.enabled and hooks.begin('class.parse', self)
+        ...
+        if span:
+            span.end(classes_parsed=1)
+    """
+    ends = []
+    for callback in _registry.get(event, ()):
+        end = callback(event, subject)
+        if end is not None:
+            ends.append(end)
+    return Span(ends) if ends else None
@@ -0,0 +1,404 @@
+"""
+Classpath-wide indexes built from header-only scans.
+
+Each index here is populated from :class:`~jawa.scan.ClassScan` objects,
+never from complete :class:`~jawa.cf.ClassFile` objects, so that building
+one over an entire classpath stays cheap. You'll typically get one from the
+:class:`~jawa.classloader.ClassLoader` rather than building it yourself::
+
+    >>> loader = ClassLoader('app.jar')
+    >>> loader.annotation_index().classes('javax/inject/Singleton')
+    {'com/example/Service'}
+"""
+from array import array
+from struct import unpack_from
+from collections import namedtuple, deque
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from jawa.scan import ClassScan
+from jawa.attributes.annotations import annotation_types
+
+
+#: A field or method within a class.
+MemberRef = namedtuple('MemberRef', ['class_', 'name', 'descriptor'])
+
+_ACC_INTERFACE = 0x0200
+
+_ANNOTATIONS = ('RuntimeVisibleAnnotations', 'RuntimeInvisibleAnnotations')
+_PARAMETER_ANNOTATIONS = (
+    'RuntimeVisibleParameterAnnotations',
+    'RuntimeInvisibleParameterAnnotations'
+)
+
+
+def _type_name(type_: str) -> str:
+    # Accept either a field descriptor or an internal name.
+    if type_.startswith('L') and type_.endswith(';'):
+        return type_[1:-1]
+    return type_
+
+
+class AnnotationIndex(object):
+    """
+    Maps annotation types to the classes and members they're declared on.
+
+    Annotation types may be given either as internal names
+    (``java/lang/Deprecated``) or as descriptors (``Ljava/lang/Deprecated;``)
+    and are always returned as internal names. Both visible and invisible
+    annotations are indexed. Type annotations are not, as they annotate uses
+    of types rather than declarations.
+    """
+    def __init__(self):
+        self._classes = {}
+        self._members = {}
+        self._by_class = {}
+
+    def _types(self, scan, attributes, parameters=False):
+        for name in _PARAMETER_ANNOTATIONS if parameters else _ANNOTATIONS:
+            for attribute in scan.find_attributes(name, attributes):
+                for type_index in annotation_types(
+                        scan.info(attribute),
+                        parameters=parameters):
+                    yield _type_name(scan.utf8(type_index))
+
+    def add(self, scan: ClassScan):
+        """
+        Index the annotations declared in the ClassFile behind `scan`.
+        """
+        this = scan.this
+        declared = self._by_class.setdefault(this, set())
+
+        for type_ in self._types(scan, scan.attributes):
+            self._classes.setdefault(type_, set()).add(this)
+            declared.add(type_)
+
+        for members, parameters in (
+                (scan.fields, False),
+                (scan.methods, False),
+                (scan.methods, True)):
+            for member in members:
+                ref = None
+                for type_ in self._types(scan, member.attributes, parameters):
+                    if ref is None:
+                        ref = MemberRef(
+                            this,
+                            scan.utf8(member.name_index),
+                            scan.utf8(member.descriptor_index)
+                        )
+                    self._members.setdefault(type_, set()).add(ref)
+
+    def classes(self, type_: str) -> Set[str]:
+        """
+        Returns the names of all classes directly annotated with `type_`.
+        """
+        return set(self._classes.get(_type_name(type_), ()))
+
+    def members(self, type_: str) -> Set[MemberRef]:
+        """
+        Returns every field and method annotated with `type_`, including
+        methods with a parameter annotated with `type_`.
+        """
+        return set(self._members.get(_type_name(type_), ()))
+
+    def annotations(self, class_: str) -> Set[str]:
+        """
+        Returns the annotation types declared directly on the class
+        `class_`.
+        """
+        return set(self._by_class.get(class_, ()))
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields every annotation type found on a class or member."""
+        yield from set(self._classes) | set(self._members)
+
+    def __contains__(self, type_: str) -> bool:
+        type_ = _type_name(type_)
+        return type_ in self._classes or type_ in self._members
+
+
+class NestIndex(object):
+    """
+    Groups classes into nests using only their ``NestHost`` and
+    ``NestMembers`` attributes.
+
+    A class that doesn't appear in either attribute is the host of a nest
+    containing only itself, so it never needs to be scanned at all.
+    """
+    def __init__(self):
+        self._hosts = {}
+        self._members = {}
+
+    def _link(self, host: str, member: str):
+        self._hosts[member] = host
+        self._members.setdefault(host, set()).add(member)
+
+    def add(self, scan: ClassScan):
+        """
+        Index the nest attributes of the ClassFile behind `scan`.
+        """
+        this = scan.this
+
+        attribute = scan.find_attribute('NestHost')
+        if attribute is not None:
+            host_index = unpack_from('>H', scan.info(attribute))[0]
+            self._link(scan.class_name(host_index), this)
+
+        attribute = scan.find_attribute('NestMembers')
+        if attribute is not None:
+            info = scan.info(attribute)
+            count = unpack_from('>H', info)[0]
+            for member_index in unpack_from(f'>{count}H', info, 2):
+                self._link(this, scan.class_name(member_index))
+
+    def host(self, class_: str) -> str:
+        """
+        Returns the nest host of `class_`, which is `class_` itself if it
+        isn't a member of another class's nest.
+        """
+        return self._hosts.get(class_, class_)
+
+    def members(self, host: str) -> Set[str]:
+        """
+        Returns the members of the nest hosted by `host`, excluding the host.
+        """
+        return set(self._members.get(host, ()))
+
+    def nestmates(self, class_: str) -> Set[str]:
+        """
+        Returns every class in the same nest as `class_`, including the
+        host and `class_` itself.
+        """
+        host = self.host(class_)
+        return {host} | self.members(host)
+
+    def nests(self) -> Iterator[Tuple[str, Set[str]]]:
+        """
+        Yields ``(host, members)`` for every nest with at least one member.
+        """
+        for host, members in self._members.items():
+            yield host, set(members)
+
+
+class HierarchyIndex(object):
+    """
+    The superclass and superinterface graph of every class on a classpath.
+
+    Names are interned to integers, and the graph is stored as arrays of
+    those integers in both directions, so even classpaths with hundreds of
+    thousands of classes stay small. Adding a class that's already indexed
+    replaces it, just as a later source replaces an earlier one in the
+    :class:`~jawa.classloader.ClassLoader`.
+
+    Classes that are only ever referenced, such as ``java/lang/Object`` when
+    the JDK isn't on the classpath, are treated as having no supertypes.
+    """
+    def __init__(self):
+        self._names = []
+        self._ids = {}
+        #: The id of each class's superclass, or -1.
+        self._supers = array('l')
+        #: The access flags of each class, or 0 if it hasn't been added.
+        self._flags = array('H')
+        #: Whether each class has been added, rather than just referenced.
+        self._known = bytearray()
+        self._interfaces = []
+        self._children = []
+        self._implementors = []
+
+    def _intern(self, name: str) -> int:
+        try:
+            return self._ids[name]
+        except KeyError:
+            pass
+
+        idx = self._ids[name] = len(self._names)
+        self._names.append(name)
+        self._supers.append(-1)
+        self._flags.append(0)
+        self._known.append(0)
+        self._interfaces.append(array('L'))
+        self._children.append(array('L'))
+        self._implementors.append(array('L'))
+        return idx
+
+    def add(self, scan: ClassScan):
+        """
+        Index the superclass and superinterfaces of the ClassFile behind
+        `scan`.
+        """
+        self.add_class(
+            scan.this,
+            scan.super_,
+            scan.interfaces,
+            scan.access_flags
+        )
+
+    def add_class(self, name: str, super_: Optional[str],
+                  interfaces: Iterable[str]=(), access_flags: int=0):
+        """
+        Index the class `name`, replacing it if it's already indexed.
+
+        :param name: The internal name of the class.
+        :param super_: The internal name of its superclass, if any.
+        :param interfaces: The internal names of its direct
+                           superinterfaces.
+        :param access_flags: The class's access flags.
+        """
+        idx = self._intern(name)
+        self._unlink(idx)
+
+        super_idx = -1 if super_ is None else self._intern(super_)
+        self._supers[idx] = super_idx
+        if super_idx != -1:
+            self._children[super_idx].append(idx)
+
+        interface_ids = array('L', (self._intern(i) for i in interfaces))
+        self._interfaces[idx] = interface_ids
+        for interface in interface_ids:
+            self._implementors[interface].append(idx)
+
+        self._flags[idx] = access_flags
+        self._known[idx] = 1
+
+    def _unlink(self, idx: int):
+        # Drop the edges of the previous definition of `idx`, if any.
+        if not self._known[idx]:
+            return
+        if self._supers[idx] != -1:
+            self._children[self._supers[idx]].remove(idx)
+        for interface in self._interfaces[idx]:
+            self._implementors[interface].remove(idx)
+
+    def remove(self, name: str):
+        """
+        Remove the class `name`, if it's indexed. Classes that extend or
+        implement it keep referring to it by name.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return
+        self._unlink(idx)
+        self._supers[idx] = -1
+        self._interfaces[idx] = array('L')
+        self._flags[idx] = 0
+        self._known[idx] = 0
+
+    def _walk(self, start: int, edges) -> Iterator[int]:
+        # Breadth-first over every id reachable from `start` through
+        # `edges`, excluding `start`.
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for child in edges(queue.popleft()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+                    yield child
+
+    def _names_of(self, ids) -> Set[str]:
+        names = self._names
+        return {names[idx] for idx in ids}
+
+    def superclass(self, name: str) -> Optional[str]:
+        """
+        Returns the direct superclass of `name`, or `None` if it has none or
+        isn't indexed.
+        """
+        idx = self._ids.get(name)
+        if idx is None or self._supers[idx] == -1:
+            return None
+        return self._names[self._supers[idx]]
+
+    def interfaces(self, name: str) -> List[str]:
+        """
+        Returns the direct superinterfaces of `name`, in declaration order.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return []
+        return [self._names[i] for i in self._interfaces[idx]]
+
+    def is_interface(self, name: str) -> bool:
+        """True if `name` is an indexed interface."""
+        idx = self._ids.get(name)
+        return idx is not None and bool(self._flags[idx] & _ACC_INTERFACE)
+
+    def subclasses(self, name: str, transitive: bool=True) -> Set[str]:
+        """
+        Returns the classes that extend `name`.
+
+        :param name: The internal name of a class.
+        :param transitive: If False, only direct subclasses are returned.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return set()
+        if not transitive:
+            return self._names_of(self._children[idx])
+        return self._names_of(self._walk(idx, self._children.__getitem__))
+
+    def implementors(self, name: str, transitive: bool=True) -> Set[str]:
+        """
+        Returns the classes and interfaces that implement or extend the
+        interface `name`.
+
+        When `transitive` is True, this includes implementors of every
+        subinterface and every subclass of an implementor.
+
+        :param name: The internal name of an interface.
+        :param transitive: If False, only classes and interfaces listing
+                           `name` as a direct superinterface are returned.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return set()
+        if not transitive:
+            return self._names_of(self._implementors[idx])
+
+        children, implementors = self._children, self._implementors
+
+        def edges(i):
+            yield from implementors[i]
+            yield from children[i]
+
+        return self._names_of(self._walk(idx, edges))
+
+    def ancestors(self, name: str) -> List[str]:
+        """
+        Returns every superclass and superinterface of `name`, nearest
+        first, with each superclass before the interfaces of its subclass.
+        """
+        idx = self._ids.get(name)
+        if idx is None:
+            return []
+
+        supers, interfaces = self._supers, self._interfaces
+
+        def edges(i):
+            if supers[i] != -1:
+                yield supers[i]
+            yield from interfaces[i]
+
+        return [self._names[i] for i in self._walk(idx, edges)]
+
+    def is_assignable(self, from_: str, to: str) -> bool:
+        """
+        True if a reference of type `from_` can be assigned to one of type
+        `to`, meaning `to` is `from_`, one of its ancestors, or
+        ``java/lang/Object``.
+        """
+        if from_ == to or to == 'java/lang/Object':
+            return True
+        return to in self.ancestors(from_)
+
+    def __contains__(self, name: str) -> bool:
+        idx = self._ids.get(name)
+        return idx is not None and bool(self._known[idx])
+
+    def __len__(self):
+        return sum(self._known)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields the name of every indexed class."""
+        names = self._names
+        return (names[i] for i, known in enumerate(self._known) if known)
@@ -0,0 +1,640 @@
+"""
+Low-level helpers for reading entries out of JARs (and any other ZIP
+archive) without going through :class:`zipfile.ZipFile` for every entry,
+and for rewriting the classes in them without recompressing the rest.
+"""
+import io
+import os
+import re
+import mmap
+import zlib
+import threading
+import functools
+from array import array
+from itertools import chain, islice
+from struct import pack, pack_into, unpack_from
+from typing import Callable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from zipfile import (
+    ZipFile,
+    BadZipFile,
+    LargeZipFile,
+    ZIP_STORED,
+    ZIP_DEFLATED
+)
+
+from jawa import hooks
+from jawa.cf import ClassFile
+from jawa.util.executor import bounded_map
+
+
+#: The signature that starts every local file header.
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+#: The size of a local file header, excluding the name and extra fields.
+LOCAL_HEADER_SIZE = 30
+#: Directories of an archive (such as a Spring Boot fat jar or a war) that
+#: hold its own classes.
+CLASS_ROOTS = ('BOOT-INF/classes/', 'WEB-INF/classes/')
+#: Directories of an archive that hold nested library archives.
+LIBRARY_ROOTS = ('BOOT-INF/lib/', 'WEB-INF/lib/')
+
+
+_EOCD_SIGNATURE = b'PK\x05\x06'
+_EOCD_SIZE = 22
+_EOCD64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+_EOCD64_SIGNATURE = b'PK\x06\x06'
+_CENTRAL_SIGNATURE = b'PK\x01\x02'
+_CENTRAL_SIZE = 46
+_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+
+_MANIFEST = 'META-INF/MANIFEST.MF'
+_MULTI_RELEASE = re.compile(rb'^Multi-Release:\s*true\s*$', re.I | re.M)
+_VERSIONS_ROOT = 'META-INF/versions/'
+_VERSIONED = re.compile(r'META-INF/versions/(\d+)/(.*)')
+
+
+class JarReader(object):
+    """
+    A read-only JAR (or ZIP) reader over a memory-mapped archive.
+
+    The central directory is parsed once into compact arrays. Reading an
+    entry then costs a single local header lookup: stored entries are
+    returned as zero-copy ``memoryview`` slices of the mapping, and
+    deflated entries are inflated straight from the mapping with
+    :mod:`zlib`. Since nothing is seeked, a single reader can safely be
+    shared between threads.
+
+    Entries using any other compression method, or that are encrypted, are
+    handed off to a :class:`zipfile.ZipFile` opened on demand.
+
+    Archives nested inside another archive, such as the libraries in a
+    Spring Boot ``BOOT-INF/lib/``, can be opened with :meth:`nested`
+    without extracting them to disk.
+
+    Entries of a multi-release JAR are resolved for the Java release given
+    by `release`: ``com/example/A.class`` reads the entry with the highest
+    ``META-INF/versions/N/com/example/A.class`` where N is at most
+    `release`, falling back to the unversioned entry. Similarly, each
+    entry below one of the directories in `roots` can also be read by its
+    name relative to that directory.
+
+    .. note::
+
+        Stored entries are views into the mapping, and the reader can't be
+        closed while any of them are still alive. Copy them with ``bytes()``
+        if you need to keep them around.
+
+    :param filename: Path to the archive.
+    :param buffer: The contents of the archive, if it should be read from
+                   memory rather than from `filename`.
+    :param release: The Java release (such as 11) used to resolve
+                    multi-release entries, or `None` to ignore them.
+    :param roots: Directories, such as ``BOOT-INF/classes/``, whose entries
+                  are also available relative to them.
+    """
+    def __init__(self, filename: str, buffer=None, release: int=None,
+                 roots=()):
+        #: The path of the underlying archive. For nested archives, this is
+        #: the outer archive's filename and the entry's name joined by
+        #: ``!/``.
+        self.filename = filename
+        self.release = release
+        self.roots = tuple(roots)
+        self._zf = None
+        self._zf_lock = threading.Lock()
+        self._nested = {}
+        self._mmap = None
+
+        if buffer is None:
+            with open(filename, 'rb') as fin:
+                size = os.fstat(fin.fileno()).st_size
+                if size == 0:
+                    raise BadZipFile('File is not a zip file')
+                self._mmap = mmap.mmap(
+                    fin.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ
+                )
+            buffer = self._mmap
+
+        self._buffer = memoryview(buffer)
+        try:
+            self._parse_central_directory()
+            self._add_aliases()
+        except Exception:
+            self.close()
+            raise
+
+    def _find_central_directory(self):
+        buff = self._buffer
+        # The EOCD record is followed by a comment of at most 65535 bytes.
+        start = max(len(buff) - _EOCD_SIZE - 0xFFFF, 0)
+        eocd = bytes(buff[start:]).rfind(_EOCD_SIGNATURE)
+        if eocd == -1:
+            raise BadZipFile('File is not a zip file')
+        eocd += start
+
+        (
+            disk, cd_disk, _, count, cd_size, cd_offset
+        ) = unpack_from('<HHHHII', buff, eocd + 4)
+        if disk != 0 or cd_disk != 0:
+            raise BadZipFile('multi-disk archives are not supported')
+
+        # Archives with data prepended to them (such as self-extracting
+        # jars) have every offset shifted by the size of that data.
+        end = eocd
+        locator = eocd - 20
+        if locator >= 56 and buff[locator:locator + 4] == (
+                _EOCD64_LOCATOR_SIGNATURE):
+            # The ZIP64 end of central directory record immediately
+            # precedes its locator.
+            end = locator - 56
+            if buff[end:end + 4] != _EOCD64_SIGNATURE:
+                raise BadZipFile('corrupt ZIP64 end of central directory')
+            count, _, cd_size, cd_offset = unpack_from('<QQQQ', buff, end + 24)
+
+        concat = end - cd_offset - cd_size
+        return count, cd_offset + concat, concat
+
+    def _parse_central_directory(self):
+        buff = self._buffer
+        count, pos, concat = self._find_central_directory()
+
+        names = []
+        self._centrals = array('Q')
+        self._methods = array('H')
+        self._flags = array('H')
+        self._crcs = array('L')
+        self._compressed_sizes = array('Q')
+        self._sizes = array('Q')
+        self._offsets = array('Q')
+
+        for _ in range(count):
+            if buff[pos:pos + 4] != _CENTRAL_SIGNATURE:
+                raise BadZipFile('bad central directory entry')
+            self._centrals.append(pos)
+
+            (
+                flags, method, crc, compressed_size, size,
+                name_length, extra_length, comment_length,
+                offset
+            ) = unpack_from('<4xHH4xIIIHHH8xI', buff, pos + 4)
+            pos += _CENTRAL_SIZE
+
+            name = bytes(buff[pos:pos + name_length])
+            names.append(name.decode('utf8' if flags & 0x800 else 'cp437'))
+
+            if 0xFFFFFFFF in (compressed_size, size, offset):
+                extra = pos + name_length
+                size, compressed_size, offset = self._zip64_extra(
+                    buff[extra:extra + extra_length],
+                    size,
+                    compressed_size,
+                    offset
+                )
+
+            self._methods.append(method)
+            self._flags.append(flags)
+            self._crcs.append(crc)
+            self._compressed_sizes.append(compressed_size)
+            self._sizes.append(size)
+            self._offsets.append(offset + concat)
+            pos += name_length + extra_length + comment_length
+
+        self._names = names
+        self._index = {name: idx for idx, name in enumerate(names)}
+
+    def _add_aliases(self):
+        index = self._index
+        for root in self.roots:
+            for name, idx in list(index.items()):
+                if name.startswith(root) and name != root:
+                    index.setdefault(name[len(root):], idx)
+
+        if self.release is None or not self._is_multi_release():
+            return
+
+        best = {}
+        for name, idx in list(index.items()):
+            match = _VERSIONED.match(name)
+            if match is None or not match.group(2):
+                continue
+            version, path = int(match.group(1)), match.group(2)
+            if version <= self.release and version > best.get(path, (0,))[0]:
+                best[path] = (version, idx)
+
+        for path, (_, idx) in best.items():
+            index[path] = idx
+
+    def _is_multi_release(self) -> bool:
+        if _MANIFEST not in self._index:
+            return False
+        manifest = bytes(self.read(_MANIFEST))
+        return _MULTI_RELEASE.search(manifest) is not None
+
+    @staticmethod
+    def _zip64_extra(extra, size, compressed_size, offset):
+        pos = 0
+        while pos + 4 <= len(extra):
+            tag, length = unpack_from('<HH', extra, pos)
+            if tag == 0x0001:
+                values = iter(
+                    unpack_from(f'<{length // 8}Q', extra, pos + 4)
+                )
+                if size == 0xFFFFFFFF:
+                    size = next(values)
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = next(values)
+                if offset == 0xFFFFFFFF:
+                    offset = next(values)
+                break
+            pos += 4 + length
+        return size, compressed_size, offset
+
+    def namelist(self) -> List[str]:
+        """Returns the name of every entry in the archive, in order,
+        followed by any names added by `release` or `roots`."""
+        return list(self._index)
+
+    def classpath_names(self) -> List[str]:
+        """Returns the name of every entry as a classpath would see it.
+        Entries below one of `roots`, or below ``META-INF/versions/``, are
+        only included by the names added for them by `roots` or
+        `release`."""
+        hidden = self.roots + (_VERSIONS_ROOT,)
+        return [name for name in self._index if not name.startswith(hidden)]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self):
+        return len(self._names)
+
+    def size(self, name: str) -> int:
+        """Returns the uncompressed size of the entry `name`."""
+        return self._sizes[self._index[name]]
+
+    def crc(self, name: str) -> int:
+        """Returns the CRC-32 of the entry `name`."""
+        return self._crcs[self._index[name]]
+
+    def _data_start(self, idx: int) -> int:
+        # Locate the entry's compressed data just past its local header.
+        offset = self._offsets[idx]
+        header = self._buffer[offset:offset + LOCAL_HEADER_SIZE]
+        if header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise BadZipFile(
+                f'bad local header for {self._names[idx]!r}'
+            )
+        name_length, extra_length = unpack_from('<HH', header, 26)
+        return offset + LOCAL_HEADER_SIZE + name_length + extra_length
+
+    def _data(self, idx: int):
+        start = self._data_start(idx)
+        return self._buffer[start:start + self._compressed_sizes[idx]]
+
+    def _raw_local(self, idx: int):
+        # The entry's local header, compressed data and data descriptor,
+        # exactly as they appear in the archive.
+        end = self._data_start(idx) + self._compressed_sizes[idx]
+        if self._flags[idx] & 0x8:
+            if self._buffer[end:end + 4] == _DESCRIPTOR_SIGNATURE:
+                end += 4
+            zip64 = max(self._sizes[idx], self._compressed_sizes[idx])
+            end += 20 if zip64 >= 0xFFFFFFFF else 12
+        return self._buffer[self._offsets[idx]:end]
+
+    def _raw_central(self, idx: int):
+        # The entry's central directory record.
+        pos = self._centrals[idx]
+        lengths = unpack_from('<HHH', self._buffer, pos + 28)
+        return self._buffer[pos:pos + _CENTRAL_SIZE + sum(lengths)]
+
+    def read(self, name: str):
+        """
+        Returns the uncompressed contents of the entry `name`, as a
+        ``memoryview`` for stored entries and as ``bytes`` otherwise.
+
+        :param name: The name of the entry, such as ``HelloWorld.class``.
+        """
+        try:
+            idx = self._index[name]
+        except KeyError:
+            raise KeyError(
+                f'There is no item named {name!r} in the archive'
+            ) from None
+        return self._read(idx)
+
+    def _read(self, idx: int):
+        name = self._names[idx]
+        method = self._methods[idx]
+        if self._flags[idx] & 0x1 or method not in (ZIP_STORED,
+                                                    ZIP_DEFLATED):
+            return self._fallback().read(name)
+
+        span = hooks.enabled and hooks.begin('jar.read', self)
+
+        data = self._data(idx)
+        if method == ZIP_DEFLATED:
+            inflater = zlib.decompressobj(-15)
+            data = inflater.decompress(data, self._sizes[idx])
+            data += inflater.flush()
+
+        if zlib.crc32(data) != self._crcs[idx]:
+            raise BadZipFile(f'bad CRC-32 for {name!r}')
+
+        if span:
+            span.end(
+                bytes_read=self._compressed_sizes[idx],
+                entries_inflated=int(method == ZIP_DEFLATED)
+            )
+
+        return data
+
+    def nested(self, name: str) -> 'JarReader':
+        """
+        Returns a JarReader for the archive stored in the entry `name`, such
+        as ``BOOT-INF/lib/guava.jar``, with the same `release` and `roots`.
+
+        Stored entries are read straight from this archive's mapping
+        without copying. Compressed entries are decompressed the first time
+        they're opened and kept in memory after that. Nested readers are
+        closed along with this one.
+
+        :param name: The name of the entry.
+        """
+        with self._zf_lock:
+            jar = self._nested.get(name)
+        if jar is not None:
+            return jar
+
+        idx = self._index[name]
+        if self._methods[idx] == ZIP_STORED and not self._flags[idx] & 0x1:
+            buffer = self._data(idx)
+        else:
+            buffer = self.read(name)
+
+        jar = JarReader(
+            f'{self.filename}!/{name}',
+            buffer=buffer,
+            release=self.release,
+            roots=self.roots
+        )
+        with self._zf_lock:
+            return self._nested.setdefault(name, jar)
+
+    def _fallback(self) -> ZipFile:
+        with self._zf_lock:
+            if self._zf is None:
+                if self._mmap is None:
+                    self._zf = ZipFile(io.BytesIO(bytes(self._buffer)), 'r')
+                else:
+                    self._zf = ZipFile(self.filename, 'r')
+            return self._zf
+
+    def close(self):
+        """Releases the mapping, any nested readers and any fallback
+        ZipFile."""
+        for jar in self._nested.values():
+            jar.close()
+        self._nested.clear()
+        if self._zf is not None:
+            self._zf.close()
+            self._zf = None
+        # Views of stored entries that are still alive, such as in a
+        # traceback, stop the mapping from being closed. It's left for the
+        # garbage collector instead, rather than raising over whatever is
+        # being cleaned up after.
+        if self._buffer is not None:
+            try:
+                self._buffer.release()
+            except BufferError:
+                pass
+            self._buffer = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f'<JarReader(filename={self.filename!r})>'
+
+
+def fingerprint(entry, name: str=None) -> Tuple[int, int]:
+    """
+    Identifies the current contents of an entry or file without reading it,
+    so that caches and indexes can tell when it has changed.
+
+    :param entry: A :class:`JarReader`, or the path to a file.
+    :param name: The name of the entry, when `entry` is a JarReader.
+    :returns: The ``(crc, size)`` of a JAR entry, from the central
+              directory, or the ``(modification time in ns, size)`` of a
+              file.
+    """
+    if isinstance(entry, JarReader):
+        return entry.crc(name), entry.size(name)
+    stat = os.stat(entry)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _strip_zip64(extra) -> bytes:
+    # Drop the ZIP64 extended information from an extra field, keeping
+    # everything else (such as timestamps).
+    kept = []
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, length = unpack_from('<HH', extra, pos)
+        if tag != 0x0001:
+            kept.append(bytes(extra[pos:pos + 4 + length]))
+        pos += 4 + length
+    return b''.join(kept)
+
+
+def _deflate_entry(jar: JarReader, idx: int, data: bytes, level: int):
+    # Returns a new local header and compressed data, and a new central
+    # directory record, for the entry `idx` with the contents `data`.
+    # Everything but the contents is taken from the original entry.
+    record = jar._raw_central(idx)
+    (
+        made_by, flags, time, date, name_length, extra_length,
+        comment_length, internal, external
+    ) = unpack_from('<4xH2xH2xHH12xHHH2xHI', record)
+    end = _CENTRAL_SIZE + name_length
+    name = bytes(record[_CENTRAL_SIZE:end])
+    extra = _strip_zip64(record[end:end + extra_length])
+    comment = bytes(record[end + extra_length:end + extra_length +
+                           comment_length])
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    if max(len(data), len(compressed)) >= 0xFFFFFFFF:
+        raise LargeZipFile(f'{jar._names[idx]!r} would require ZIP64')
+
+    # Keep only the UTF-8 name flag. The sizes are known up front, so
+    # there's no data descriptor.
+    flags &= 0x800
+    crc = zlib.crc32(data)
+    local = pack(
+        '<4s5H3L2H',
+        LOCAL_HEADER_SIGNATURE, 20, flags, ZIP_DEFLATED, time, date,
+        crc, len(compressed), len(data), len(name), len(extra)
+    ) + name + extra + compressed
+    central = pack(
+        '<4s6H3L5H2L',
+        _CENTRAL_SIGNATURE, made_by, 20, flags, ZIP_DEFLATED, time, date,
+        crc, len(compressed), len(data), len(name), len(extra),
+        len(comment), 0, internal, external, 0
+    ) + name + extra + comment
+    return local, central
+
+
+def _transform_chunk(transform, entries):
+    results = []
+    for buff in entries:
+        cf = transform(ClassFile(buff))
+        if cf is None:
+            results.append(None)
+            continue
+        with io.BytesIO() as out:
+            cf.save(out)
+            results.append(out.getvalue())
+    return results
+
+
+def _is_class(name: str) -> bool:
+    return name.endswith('.class')
+
+
+def rewrite(src: str, dst: str,
+            transform: Callable[[ClassFile], Optional[ClassFile]],
+            select: Callable[[str], bool]=None, workers: int=None,
+            chunksize: int=16,
+            level: int=zlib.Z_DEFAULT_COMPRESSION) -> List[str]:
+    """
+    Copy the archive `src` to `dst`, passing each selected class through
+    `transform`.
+
+    Only the selected entries are inflated and parsed. Every other entry,
+    and every selected entry that `transform` leaves alone, is copied
+    byte for byte, headers and compressed data included, so rewriting a
+    handful of classes in a large JAR costs little more than copying it.
+    Entries are written in the same order as `src`, so the output only
+    depends on the input and `transform`.
+
+    The selected classes are transformed in a pool of worker processes, so
+    `transform` must be picklable, such as a module-level function::
+
+        >>> def make_public(cf):
+        ...     cf.access_flags.acc_public = True
+        ...     return cf
+        >>> rewrite('app.jar', 'patched.jar', make_public,
+        ...         select=lambda name: name.startswith('com/example/'))
+
+    :param src: Path to the archive to read.
+    :param dst: Path to write the new archive to.
+    :param transform: Called with the :class:`~jawa.cf.ClassFile` of each
+                      selected entry. Returns the ClassFile to write, or
+                      `None` to keep the original entry.
+    :param select: Called with the name of each entry, and returns True if
+                   it should be transformed. [default: every ``.class``]
+    :param workers: The number of worker processes. If set to 1, classes
+                    are transformed in this process.
+                    [default: the number of CPUs]
+    :param chunksize: The number of classes handed to a worker at once.
+    :param level: The zlib compression level for transformed entries.
+    :returns: The name of every entry that was transformed.
+    """
+    if select is None:
+        select = _is_class
+
+    with JarReader(src) as jar:
+        selected = [
+            idx for idx, name in enumerate(jar._names) if select(name)
+        ]
+        if len(jar._names) > 0xFFFF:
+            raise LargeZipFile('archives with more than 65535 entries '
+                               'are not supported')
+
+        def chunks():
+            it = iter(selected)
+            while True:
+                chunk = [bytes(jar._read(idx)) for idx in islice(
+                    it, chunksize
+                )]
+                if not chunk:
+                    return
+                yield chunk
+
+        func = functools.partial(_transform_chunk, transform)
+        if workers == 1 or not selected:
+            results = chain.from_iterable(map(func, chunks()))
+            return _write_archive(jar, dst, selected, results, level)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Entries are only inflated a few chunks ahead of being written.
+            results = bounded_map(
+                pool,
+                func,
+                chunks(),
+                (workers or os.cpu_count() or 1) * 2
+            )
+            try:
+                return _write_archive(
+                    jar,
+                    dst,
+                    selected,
+                    chain.from_iterable(results),
+                    level
+                )
+            finally:
+                results.close()
+
+
+def _write_archive(jar: JarReader, dst: str, selected: List[int], results,
+                   level: int) -> List[str]:
+    selected = set(selected)
+    rewritten = []
+    records = []
+    offset = 0
+
+    with open(dst, 'wb') as out:
+        for idx, name in enumerate(jar._names):
+            data = next(results) if idx in selected else None
+            if data is None:
+                local = jar._raw_local(idx)
+                record = bytearray(jar._raw_central(idx))
+                if unpack_from('<I', record, 42)[0] == 0xFFFFFFFF:
+                    raise LargeZipFile(f'{name!r} requires ZIP64')
+            else:
+                local, record = _deflate_entry(jar, idx, data, level)
+                record = bytearray(record)
+                rewritten.append(name)
+
+            if offset >= 0xFFFFFFFF:
+                raise LargeZipFile(f'{dst!r} would require ZIP64')
+            pack_into('<I', record, 42, offset)
+            out.write(local)
+            offset += len(local)
+            records.append(record)
+
+        size = 0
+        for record in records:
+            out.write(record)
+            size += len(record)
+        if offset + size >= 0xFFFFFFFF:
+            raise LargeZipFile(f'{dst!r} would require ZIP64')
+        out.write(pack(
+            '<4s4H2LH',
+            _EOCD_SIGNATURE, 0, 0, len(records), len(records), size, offset,
+            0
+        ))
+
+    return rewritten
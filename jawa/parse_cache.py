@@ -0,0 +1,319 @@
+"""
+A persistent, on-disk cache of ClassFile summaries.
+
+Third-party JARs rarely change between runs, so there's no reason to
+decompress and scan their classes every time. A :class:`ParseCache` stores
+a :class:`ClassSummary` of each class in a local SQLite database, keyed by
+the JAR it came from, its entry name, and the CRC-32 and size recorded for
+it in the JAR's central directory. Checking the cache therefore never
+touches the entry itself::
+
+    >>> loader = ClassLoader('guava.jar', parse_cache='.jawa-cache.db')
+    >>> loader.summary('com/google/common/base/Optional').super_
+    'java/lang/Object'
+
+Classes loaded from plain directories are keyed by the modification time
+and size of the file instead, so they aren't read either. JARs read for a
+particular Java release have it appended to their source, such as
+``app.jar#17``, since the same name can resolve to a different entry in a
+multi-release JAR.
+"""
+import os
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Optional
+
+from jawa.jar import JarReader, fingerprint, CLASS_ROOTS
+from jawa.scan import ClassScan
+
+
+#: The number of writes batched into a single transaction.
+COMMIT_INTERVAL = 1000
+
+# Bumped whenever the schema or the contents of a summary change, which
+# discards any existing cache.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    crc INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    major INTEGER NOT NULL,
+    minor INTEGER NOT NULL,
+    access_flags INTEGER NOT NULL,
+    this TEXT NOT NULL,
+    super TEXT,
+    interfaces TEXT NOT NULL,
+    dependencies TEXT NOT NULL,
+    strings TEXT NOT NULL,
+    PRIMARY KEY (source, name, crc, size)
+)
+"""
+
+
+#: The header of a ClassFile and the parts of its constant pool most
+#: analyses need. ``version`` is a ``(major, minor)`` tuple, ``interfaces``
+#: and ``strings`` (the value of every ConstantString) are tuples, and
+#: ``dependencies`` is a frozenset of the name of every ConstantClass, as
+#: returned by :meth:`~jawa.classloader.ClassLoader.dependencies`.
+ClassSummary = namedtuple('ClassSummary', [
+    'version',
+    'access_flags',
+    'this',
+    'super_',
+    'interfaces',
+    'dependencies',
+    'strings'
+])
+
+
+def summarize(scan: ClassScan) -> ClassSummary:
+    """
+    Build a :class:`ClassSummary` from a :class:`~jawa.scan.ClassScan`.
+    """
+    return ClassSummary(
+        scan.version,
+        scan.access_flags,
+        scan.this,
+        scan.super_,
+        tuple(scan.interfaces),
+        frozenset(scan.class_name(idx) for idx in scan.constants(7)),
+        tuple(scan.utf8(scan.u2(idx)) for idx in scan.constants(8))
+    )
+
+
+def entry_key(entry, path: str):
+    """
+    Returns the ``(source, name, crc, size)`` key of the class at `path`,
+    where `entry` is its value in a ClassLoader's path map. For loose
+    files, `crc` is the modification time of the file in nanoseconds.
+
+    Building a key never reads the class itself.
+    """
+    if isinstance(entry, JarReader):
+        source = os.path.abspath(entry.filename)
+        if entry.release is not None:
+            source = f'{source}#{entry.release}'
+    else:
+        source = os.path.abspath(entry)
+    return (source, path, *fingerprint(entry, path))
+
+
+def _split_source(source: str):
+    # Undo entry_key(), returning the outer path, the nested archive (if
+    # any) and the release (if any) of a source.
+    path, sep, release = source.rpartition('#')
+    if sep and release.isdigit():
+        source, release = path, int(release)
+    else:
+        release = None
+    outer, _, inner = source.partition('!/')
+    return outer, inner, release
+
+
+class ParseCache(object):
+    """
+    A :class:`ClassSummary` store backed by a SQLite database.
+
+    Writes are batched, and only guaranteed to be on disk after
+    :meth:`commit` or :meth:`close`. A single ParseCache may be shared
+    between threads.
+
+    :param path: The path to the database, which is created if it doesn't
+                 exist. ``:memory:`` gives a cache that lasts only as long
+                 as this object.
+    """
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            self._db.execute('DROP TABLE IF EXISTS summaries')
+            self._db.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def get(self, source: str, name: str, crc: int,
+            size: int) -> Optional[ClassSummary]:
+        """
+        Returns the summary stored for the given key, or `None`.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT major, minor, access_flags, this, super, interfaces,'
+                ' dependencies, strings FROM summaries WHERE source = ? AND'
+                ' name = ? AND crc = ? AND size = ?',
+                (source, name, crc, size)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return ClassSummary(
+            (row[0], row[1]),
+            row[2],
+            row[3],
+            row[4],
+            tuple(json.loads(row[5])),
+            frozenset(json.loads(row[6])),
+            tuple(json.loads(row[7]))
+        )
+
+    def put(self, source: str, name: str, crc: int, size: int,
+            summary: ClassSummary):
+        """
+        Store `summary` under the given key, replacing any summary already
+        stored under it.
+        """
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO summaries VALUES'
+                ' (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    source,
+                    name,
+                    crc,
+                    size,
+                    summary.version[0],
+                    summary.version[1],
+                    summary.access_flags,
+                    summary.this,
+                    summary.super_,
+                    json.dumps(list(summary.interfaces)),
+                    json.dumps(sorted(summary.dependencies)),
+                    json.dumps(list(summary.strings))
+                )
+            )
+            self._pending += 1
+            if self._pending >= COMMIT_INTERVAL:
+                self._commit()
+
+    def _commit(self):
+        self._db.commit()
+        self._pending = 0
+
+    def commit(self):
+        """Write any batched changes to disk."""
+        with self._lock:
+            self._commit()
+
+    def invalidate(self, source: str=None, name: str=None) -> int:
+        """
+        Remove cached summaries, returning the number removed.
+
+        :param source: Only remove summaries from this JAR or file,
+                       including those read from it for a particular
+                       release and from archives nested in it.
+        :param name: Only remove summaries of entries with this name, such
+                     as ``com/example/Foo.class``.
+        """
+        clauses, args = [], []
+        if source is not None:
+            # Sources may have a release (#17) or a nested archive
+            # (!/inner.jar) appended by entry_key(). LIKE isn't used, as
+            # paths may contain its wildcards.
+            source = os.path.abspath(source)
+            clauses.append(
+                '(source = ? OR substr(source, 1, ?) = ?'
+                ' OR substr(source, 1, ?) = ?)'
+            )
+            args.extend((
+                source,
+                len(source) + 1, f'{source}#',
+                len(source) + 2, f'{source}!/'
+            ))
+        if name is not None:
+            clauses.append('name = ?')
+            args.append(name)
+
+        query = 'DELETE FROM summaries'
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+
+        with self._lock:
+            removed = self._db.execute(query, args).rowcount
+            self._commit()
+        return removed
+
+    def compact(self) -> int:
+        """
+        Remove every summary that no longer matches its source, either
+        because the source is gone or because the entry has changed, then
+        reclaim the space they used. Returns the number of summaries removed.
+
+        Only the central directory of each JAR is read, and loose files
+        are only stat'd.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT source, name, crc, size FROM summaries'
+            ).fetchall()
+
+        stale = []
+        by_source = {}
+        for row in rows:
+            by_source.setdefault(row[0], []).append(row)
+
+        for source, rows in by_source.items():
+            outer, inner, release = _split_source(source)
+            if not os.path.isfile(outer):
+                stale.extend(rows)
+                continue
+
+            if outer.lower().endswith(('.zip', '.jar', '.war')):
+                with JarReader(outer, release=release,
+                               roots=CLASS_ROOTS) as jar:
+                    if inner:
+                        if inner not in jar:
+                            stale.extend(rows)
+                            continue
+                        jar = jar.nested(inner)
+                    for row in rows:
+                        _, name, crc, size = row
+                        if (name not in jar or
+                                fingerprint(jar, name) != (crc, size)):
+                            stale.append(row)
+                continue
+
+            current = fingerprint(outer)
+            stale.extend(row for row in rows if row[2:] != current)
+
+        with self._lock:
+            self._db.executemany(
+                'DELETE FROM summaries WHERE source = ? AND name = ? AND'
+                ' crc = ? AND size = ?',
+                stale
+            )
+            self._commit()
+            self._db.execute('VACUUM')
+        return len(stale)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM summaries'
+            ).fetchone()[0]
+
+    def close(self):
+        """Commit any batched changes and close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._commit()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f'<ParseCache(path={self.path!r})>'
@@ -0,0 +1,277 @@
+"""
+Header-only scanning of JVM ClassFiles.
+
+A :class:`ClassScan` walks the raw bytes of a ClassFile just far enough to
+record where everything is, without decoding constants or building
+:class:`~jawa.cf.ClassFile`, :class:`~jawa.methods.Method` or
+:class:`~jawa.attribute.Attribute` objects. UTF8 constants are only decoded
+when asked for.
+
+This is what the :class:`~jawa.classloader.ClassLoader` indexes use to sweep
+an entire classpath cheaply::
+
+    >>> with open('HelloWorld.class', 'rb') as fin:
+    ...     scan = ClassScan(fin.read())
+    >>> scan.this
+    'HelloWorld'
+    >>> scan.super_
+    'java/lang/Object'
+"""
+from array import array
+from struct import unpack_from
+from typing import Iterator, List, Optional, Tuple
+from collections import namedtuple
+
+from jawa.util.utf import decode_modified_utf8
+
+
+# The size-on-disk of each constant type, excluding the tag. UTF8 (1) is
+# variable-length and handled separately.
+_CONSTANT_SIZES = (
+    None, None, None,
+    4,  # Integer
+    4,  # Float
+    8,  # Long
+    8,  # Double
+    2,  # Class
+    2,  # String
+    4,  # FieldRef
+    4,  # MethodRef
+    4,  # InterfaceMethodRef
+    4,  # NameAndType
+    None,
+    None,
+    3,  # MethodHandle
+    2,  # MethodType
+    4,  # Dynamic
+    4,  # InvokeDynamic
+    2,  # Module
+    2   # Package
+)
+
+
+#: The location of a single, undecoded attribute. `offset` and `length`
+#: describe the attribute's info blob within the ClassFile.
+RawAttribute = namedtuple('RawAttribute', [
+    'name_index',
+    'offset',
+    'length'
+])
+
+#: The location of a single, undecoded field or method.
+RawMember = namedtuple('RawMember', [
+    'access_flags',
+    'name_index',
+    'descriptor_index',
+    'attributes'
+])
+
+
+class ClassScan(object):
+    """
+    A read-only, partially decoded view over the bytes of a single
+    ClassFile.
+
+    :param buff: Any bytes-like object containing a complete ClassFile.
+    """
+    __slots__ = (
+        'buff',
+        'version',
+        'tags',
+        'offsets',
+        'access_flags',
+        'this_index',
+        'super_index',
+        'interface_indexes',
+        'fields',
+        'methods',
+        'attributes',
+        '_utf8'
+    )
+
+    def __init__(self, buff):
+        self.buff = buff
+        self._utf8 = {}
+
+        magic, minor, major, count = unpack_from('>IHHH', buff)
+        if magic != 0xCAFEBABE:
+            raise ValueError('invalid magic number')
+
+        #: The (major, minor) version of the ClassFile.
+        self.version = (major, minor)
+        #: The tag of each constant, with 0 used for unusable slots.
+        self.tags = bytearray(count)
+        #: The offset of each constant's data, just past its tag.
+        self.offsets = array('I', bytes(4 * count))
+
+        pos = 10
+        idx = 1
+        tags, offsets = self.tags, self.offsets
+        while idx < count:
+            tag = buff[pos]
+            tags[idx] = tag
+            offsets[idx] = pos + 1
+            if tag == 1:
+                pos += 3 + unpack_from('>H', buff, pos + 1)[0]
+            else:
+                pos += 1 + _CONSTANT_SIZES[tag]
+                if tag == 5 or tag == 6:
+                    # LONG (5) and DOUBLE (6) count as two entries in the
+                    # pool.
+                    idx += 1
+            idx += 1
+
+        (
+            self.access_flags,
+            self.this_index,
+            self.super_index,
+            interfaces_count
+        ) = unpack_from('>HHHH', buff, pos)
+        pos += 8
+        self.interface_indexes = unpack_from(
+            f'>{interfaces_count}H',
+            buff,
+            pos
+        )
+        pos += 2 * interfaces_count
+
+        self.fields, pos = self._members(pos)
+        self.methods, pos = self._members(pos)
+        self.attributes, pos = self._attributes(pos)
+
+    def _attributes(self, pos: int) -> Tuple[Tuple[RawAttribute, ...], int]:
+        buff = self.buff
+        count = unpack_from('>H', buff, pos)[0]
+        pos += 2
+        attributes = []
+        for _ in range(count):
+            name_index, length = unpack_from('>HI', buff, pos)
+            attributes.append(RawAttribute(name_index, pos + 6, length))
+            pos += 6 + length
+        return tuple(attributes), pos
+
+    def _members(self, pos: int) -> Tuple[Tuple[RawMember, ...], int]:
+        buff = self.buff
+        count = unpack_from('>H', buff, pos)[0]
+        pos += 2
+        members = []
+        for _ in range(count):
+            access_flags, name_index, descriptor_index = unpack_from(
+                '>HHH',
+                buff,
+                pos
+            )
+            attributes, pos = self._attributes(pos + 6)
+            members.append(RawMember(
+                access_flags,
+                name_index,
+                descriptor_index,
+                attributes
+            ))
+        return tuple(members), pos
+
+    def raw_utf8(self, index: int) -> bytes:
+        """
+        Returns the undecoded bytes of the UTF8 constant at `index`.
+        Comparing against raw bytes avoids decoding altogether.
+        """
+        if self.tags[index] != 1:
+            raise KeyError(f'constant {index} is not a UTF8 constant')
+        offset = self.offsets[index]
+        length = unpack_from('>H', self.buff, offset)[0]
+        return bytes(self.buff[offset + 2:offset + 2 + length])
+
+    def utf8(self, index: int) -> str:
+        """
+        Returns the decoded value of the UTF8 constant at `index`.
+        """
+        try:
+            return self._utf8[index]
+        except KeyError:
+            pass
+
+        value = self.raw_utf8(index)
+        try:
+            value = value.decode('utf8')
+        except UnicodeDecodeError:
+            value = decode_modified_utf8(value)
+
+        self._utf8[index] = value
+        return value
+
+    def u2(self, index: int, field: int=0) -> int:
+        """
+        Returns the `field`'th u2 of the constant at `index`, such as the
+        ``name_index`` of a ConstantClass or the ``descriptor_index`` (1) of a
+        NameAndType.
+        """
+        return unpack_from('>H', self.buff, self.offsets[index] + 2 * field)[0]
+
+    def class_name(self, index: int) -> Optional[str]:
+        """
+        Returns the name of the ConstantClass at `index`, or `None` if
+        `index` is 0.
+        """
+        if index == 0:
+            return None
+        return self.utf8(self.u2(index))
+
+    def constants(self, tag: int) -> Iterator[int]:
+        """
+        Yields the index of every constant with the given `tag`.
+        """
+        find = self.tags.find
+        idx = find(tag, 1)
+        while idx != -1:
+            yield idx
+            idx = find(tag, idx + 1)
+
+    @property
+    def this(self) -> str:
+        """The name of this class."""
+        return self.class_name(self.this_index)
+
+    @property
+    def super_(self) -> Optional[str]:
+        """The name of this class's superclass, if any."""
+        return self.class_name(self.super_index)
+
+    @property
+    def interfaces(self) -> List[str]:
+        """The names of this class's direct superinterfaces."""
+        return [self.class_name(idx) for idx in self.interface_indexes]
+
+    def info(self, attribute: RawAttribute):
+        """
+        Returns the info blob of `attribute` as a zero-copy ``memoryview``.
+        """
+        return memoryview(self.buff)[
+            attribute.offset:attribute.offset + attribute.length
+        ]
+
+    def find_attributes(self, name: str,
+                        attributes: Tuple[RawAttribute, ...]=None) \
+            -> Iterator[RawAttribute]:
+        """
+        Yields every attribute called `name` in `attributes`, which defaults
+        to the class-level attributes.
+
+        :param name: The name of the attribute, such as ``'Signature'``.
+        :param attributes: Any table of :class:`RawAttribute`, such as those
+                           found on a :class:`RawMember`.
+        """
+        name = name.encode('utf8')
+        if attributes is None:
+            attributes = self.attributes
+
+        for attribute in attributes:
+            if self.raw_utf8(attribute.name_index) == name:
+                yield attribute
+
+    def find_attribute(self, name: str,
+                       attributes: Tuple[RawAttribute, ...]=None) \
+            -> Optional[RawAttribute]:
+        """
+        Same as ``find_attributes()`` but returns only the first result.
+        """
+        return next(self.find_attributes(name, attributes), None)
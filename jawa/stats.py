@@ -0,0 +1,201 @@
+"""
+Opt-in instrumentation of reading and parsing classes.
+
+Counts the bytes read, entries decompressed, classes parsed, constants
+decoded and attributes loaded, along with the time spent in each phase of
+loading a class::
+
+    >>> with collect() as stats:
+    ...     cf = loader.load('com/example/Main')
+    >>> stats.counters['classes_parsed']
+    1
+
+A :class:`~jawa.classloader.ClassLoader` created with ``instrument=True``
+keeps its own :class:`Stats`, returned by ``loader.stats()``.
+
+Phases are timed inclusively, so ``parse`` includes ``constants``, and
+``read`` includes ``inflate``. Collection only covers work done in the
+current thread, or on behalf of an instrumented ClassLoader.
+
+Stats are gathered through :mod:`jawa.hooks`, which are only registered
+while something is collecting.
+"""
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from jawa import hooks
+
+
+#: Every counter kept by :class:`Stats`.
+COUNTERS = (
+    'bytes_read',
+    'entries_inflated',
+    'classes_parsed',
+    'constants_decoded',
+    'attributes_loaded'
+)
+#: Every phase timed by :class:`Stats`.
+PHASES = (
+    'read',
+    'inflate',
+    'parse',
+    'constants',
+    'attributes'
+)
+
+#: The phase timed for each event in :data:`jawa.hooks.EVENTS`.
+EVENT_PHASES = {
+    'classloader.read': 'read',
+    'jar.read': 'inflate',
+    'class.parse': 'parse',
+    'constants.unpack': 'constants',
+    'attribute.load': 'attributes'
+}
+
+_users = 0
+_users_lock = threading.Lock()
+_local = threading.local()
+
+
+class Stats(object):
+    """
+    Counters and per-phase times, which are safe to update from many
+    threads at once.
+
+    :param callback: Called as ``callback(phase, seconds, counters)`` every
+                     time something is recorded, such as to forward it to a
+                     metrics system.
+    """
+    def __init__(self, callback: Callable=None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        #: The total of each counter in :data:`COUNTERS`.
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        #: The total seconds spent in each phase in :data:`PHASES`.
+        self.times = dict.fromkeys(PHASES, 0.0)
+
+    def record(self, phase: str, seconds: float, counters: Dict[str, int]):
+        """Add `seconds` to `phase`, and each of `counters`."""
+        with self._lock:
+            if phase is not None:
+                self.times[phase] += seconds
+            for counter, amount in counters.items():
+                self.counters[counter] += amount
+
+        if self.callback is not None:
+            self.callback(phase, seconds, counters)
+
+    def snapshot(self) -> 'Stats':
+        """Returns a copy of the current totals, without the callback."""
+        copy = Stats()
+        with self._lock:
+            copy.counters.update(self.counters)
+            copy.times.update(self.times)
+        return copy
+
+    def reset(self):
+        """Set every counter and time back to zero."""
+        with self._lock:
+            self.counters = dict.fromkeys(COUNTERS, 0)
+            self.times = dict.fromkeys(PHASES, 0.0)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns every counter, and every phase as ``time.<phase>``, in a
+        single flat dict.
+        """
+        with self._lock:
+            result = dict(self.counters)
+            result.update(
+                (f'time.{phase}', seconds)
+                for phase, seconds in self.times.items()
+            )
+        return result
+
+    def __repr__(self):
+        counters = ', '.join(f'{k}={v}' for k, v in self.counters.items())
+        return f'<Stats({counters})>'
+
+
+def _begin(event, subject):
+    targets = list(getattr(_local, 'stack', ()))
+    if event == 'attribute.load':
+        # Attributes are usually loaded long after parsing, so they're also
+        # counted against the class's ClassLoader.
+        loader_stats = getattr(subject.cf.classloader, '_stats', None)
+        if loader_stats is not None and loader_stats not in targets:
+            targets.append(loader_stats)
+    if not targets:
+        return None
+
+    phase = EVENT_PHASES[event]
+    start = perf_counter()
+
+    def end(details):
+        seconds = perf_counter() - start
+        for stats in targets:
+            stats.record(phase, seconds, details)
+    return end
+
+
+def acquire():
+    """
+    Register the hooks used to collect stats until a matching
+    :func:`release`. Used by anything that collects outside of
+    :func:`collecting`, such as an instrumented ClassLoader.
+    """
+    global _users
+    with _users_lock:
+        _users += 1
+        if _users == 1:
+            for event in EVENT_PHASES:
+                hooks.on(event, _begin)
+
+
+def release():
+    """Undo a single call to :func:`acquire`."""
+    global _users
+    with _users_lock:
+        _users -= 1
+        if _users == 0:
+            for event in EVENT_PHASES:
+                hooks.off(event, _begin)
+
+
+@contextmanager
+def collecting(stats: Stats) -> Iterator[Stats]:
+    """
+    Record everything done by the current thread into `stats` until the
+    block exits. Blocks may be nested, and each records into every
+    enclosing Stats.
+    """
+    try:
+        stack = _local.stack
+    except AttributeError:
+        stack = _local.stack = []
+
+    if stats in stack:
+        # Already collecting into `stats` further up.
+        yield stats
+        return
+
+    acquire()
+    stack.append(stats)
+    try:
+        yield stats
+    finally:
+        stack.remove(stats)
+        release()
+
+
+def collect(callback: Callable=None):
+    """
+    Record everything done by the current thread into a new :class:`Stats`
+    until the block exits.
+
+    :param callback: Passed to :class:`Stats`.
+    """
+    return collecting(Stats(callback=callback))
+
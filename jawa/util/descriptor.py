@@ -1,6 +1,8 @@
 """
 Methods for parsing standard JVM type descriptors for fields and methods.
 """
+import re
+from typing import List
 from collections import namedtuple
 
 
@@ -90,3 +92,107 @@ def parse_descriptor(descriptor: str) -> list:
         elif state == 20:
             token.append(char)
     return tokens
+
+
+# Class names in a descriptor can't contain ';', and the only other
+# characters that can appear outside of a class name are base types, '[',
+# '(' and ')', none of which are 'L'.
+_CLASS_TYPE = re.compile(r'L([^;]+);')
+
+
+def descriptor_types(descriptor: str) -> List[str]:
+    """
+    Returns the internal name of every class referenced by a field or method
+    descriptor, in order, without parsing the entire descriptor.
+    """
+    return _CLASS_TYPE.findall(descriptor)
+
+
+def signature_types(signature: str) -> List[str]:
+    """
+    Returns the internal name of every class referenced by a generic
+    signature (the value of a ``Signature`` attribute), as described in
+    section 4.7.9.1 of the JVM specification.
+
+    Type variables are not classes, and are skipped. Inner classes of
+    parameterized types, such as ``Lcom/Outer<TT;>.Inner;``, are returned
+    by their binary name (``com/Outer$Inner``).
+    """
+    names = []
+
+    def reference(pos):
+        char = signature[pos]
+        if char == 'T':
+            return signature.index(';', pos) + 1
+        elif char == '[':
+            pos += 1
+            if signature[pos] in 'BCDFIJSZ':
+                return pos + 1
+            return reference(pos)
+
+        # A ClassTypeSignature.
+        pos += 1
+        start = pos
+        name = None
+        while True:
+            char = signature[pos]
+            if char not in ';<.':
+                pos += 1
+                continue
+
+            segment = signature[start:pos]
+            name = segment if name is None else f'{name}${segment}'
+            if char == '<':
+                pos = arguments(pos)
+                char = signature[pos]
+            if char == '.':
+                pos += 1
+                start = pos
+                continue
+
+            names.append(name)
+            return pos + 1
+
+    def arguments(pos):
+        pos += 1
+        while signature[pos] != '>':
+            char = signature[pos]
+            if char == '*':
+                pos += 1
+                continue
+            elif char in '+-':
+                pos += 1
+            pos = reference(pos)
+        return pos + 1
+
+    def java_type(pos):
+        if signature[pos] in 'BCDFIJSZV':
+            return pos + 1
+        return reference(pos)
+
+    pos = 0
+    end = len(signature)
+    if signature.startswith('<'):
+        # TypeParameters, each an identifier followed by a class bound and
+        # any number of interface bounds.
+        pos = 1
+        while signature[pos] != '>':
+            pos = signature.index(':', pos) + 1
+            if signature[pos] != ':' and signature[pos] != '>':
+                pos = reference(pos)
+            while signature[pos] == ':':
+                pos = reference(pos + 1)
+        pos += 1
+
+    if pos < end and signature[pos] == '(':
+        pos += 1
+        while signature[pos] != ')':
+            pos = java_type(pos)
+        pos = java_type(pos + 1)
+        while pos < end and signature[pos] == '^':
+            pos = reference(pos + 1)
+    else:
+        while pos < end:
+            pos = reference(pos)
+
+    return names
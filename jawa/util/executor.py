@@ -0,0 +1,34 @@
+"""
+Helpers for feeding work to a :mod:`concurrent.futures` executor without
+submitting all of it up front.
+"""
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Iterator
+
+
+def bounded_map(pool: Executor, func: Callable, iterable: Iterable,
+                window: int) -> Iterator[Any]:
+    """
+    Like ``pool.map(func, iterable)``, yielding results in the same order
+    as `iterable`, but with at most `window` calls submitted and not yet
+    yielded at once. `iterable` is consumed only as results are taken,
+    and calls still queued are cancelled if the iterator is closed before
+    it's exhausted.
+
+    :param pool: The executor to submit calls to.
+    :param func: Called with each item of `iterable`.
+    :param iterable: The items to call `func` with.
+    :param window: The maximum number of calls in flight.
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,117 @@
+"""
+A static stabbing-query index over half-open integer intervals, used to
+answer questions like "which local variables are live at pc X" without
+scanning every entry.
+"""
+from array import array
+from typing import Iterable, Iterator, Tuple, Any
+
+
+class IntervalIndex(object):
+    """
+    Sorts intervals by their start and lays them out as an implicit
+    balanced tree, where each node also records the furthest end in its
+    subtree. A query descends only into subtrees that can still contain
+    `point`, costing O(log n + k) for k matches, and the index takes space
+    linear in the number of intervals no matter how much they overlap.
+
+    Values are returned in the order their intervals were given, which
+    matters when that order carries meaning (such as exception handlers).
+
+        >>> index = IntervalIndex([(0, 10, 'a'), (5, 15, 'b')])
+        >>> index.at(7)
+        ('a', 'b')
+        >>> index.at(12)
+        ('b',)
+
+    :param intervals: An iterable of ``(start, end, value)`` tuples, where
+                      `start` is inclusive and `end` is exclusive.
+    """
+    __slots__ = ('starts', 'ends', 'orders', 'max_ends', 'values')
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, Any]]):
+        intervals = [i for i in intervals if i[0] < i[1]]
+        by_start = sorted(
+            range(len(intervals)),
+            key=lambda order: intervals[order][0]
+        )
+
+        #: The value of each interval, in the order they were given.
+        self.values = [i[2] for i in intervals]
+        #: The start of each interval, sorted.
+        self.starts = array('q', (intervals[o][0] for o in by_start))
+        #: The end of each interval, in the same order as :attr:`starts`.
+        self.ends = array('q', (intervals[o][1] for o in by_start))
+        #: The position of each interval in :attr:`values`, in the same
+        #: order as :attr:`starts`.
+        self.orders = array('q', by_start)
+        #: The furthest end within the subtree rooted at each node.
+        self.max_ends = array('q', self.ends)
+
+        # Fill in max_ends bottom-up, visiting children before parents.
+        stack = [(0, len(by_start), False)]
+        while stack:
+            lo, hi, ready = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if not ready:
+                stack.append((lo, hi, True))
+                stack.append((lo, mid, False))
+                stack.append((mid + 1, hi, False))
+                continue
+            furthest = self.ends[mid]
+            if lo < mid:
+                furthest = max(furthest, self.max_ends[(lo + mid) // 2])
+            if mid + 1 < hi:
+                furthest = max(furthest, self.max_ends[(mid + 1 + hi) // 2])
+            self.max_ends[mid] = furthest
+
+    def at(self, point: int) -> tuple:
+        """
+        Returns a tuple of every value whose interval contains `point`.
+        """
+        starts, ends, max_ends = self.starts, self.ends, self.max_ends
+        found = []
+        stack = [(0, len(starts))]
+        while stack:
+            lo, hi = stack.pop()
+            # Every interval in the subtree starts after point.
+            if lo >= hi or starts[lo] > point:
+                continue
+            mid = (lo + hi) // 2
+            # Every interval in the subtree ends at or before point.
+            if max_ends[mid] <= point:
+                continue
+            stack.append((lo, mid))
+            if starts[mid] <= point:
+                if ends[mid] > point:
+                    found.append(self.orders[mid])
+                stack.append((mid + 1, hi))
+
+        found.sort()
+        return tuple(self.values[order] for order in found)
+
+    def ranges(self) -> Iterator[Tuple[int, int, tuple]]:
+        """
+        Yields ``(start, end, values)`` for every non-empty elementary
+        segment (the spans between interval boundaries), in ascending
+        order.
+        """
+        events = {}
+        for start, end, order in zip(self.starts, self.ends, self.orders):
+            events.setdefault(start, []).append((True, order))
+            events.setdefault(end, []).append((False, order))
+
+        active = set()
+        bounds = sorted(events)
+        for idx, bound in enumerate(bounds[:-1]):
+            for is_start, order in events[bound]:
+                if is_start:
+                    active.add(order)
+                else:
+                    active.discard(order)
+            if active:
+                yield bound, bounds[idx + 1], tuple(
+                    self.values[order] for order in sorted(active)
+                )
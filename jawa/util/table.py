@@ -0,0 +1,176 @@
+"""
+Compact storage for the flat tables of unsigned shorts that make up many
+JVM attributes (line numbers, local variables, exception handlers...).
+
+Rather than keeping one namedtuple per row, a :class:`PackedTable` stores
+every field of every row in a single ``array('H')``. Rows are only turned
+into namedtuples when they're accessed, and packing the table back into its
+on-disk form is a single byteswap and copy.
+"""
+import sys
+from array import array
+from collections.abc import MutableSequence
+
+
+_SWAP = sys.byteorder == 'little'
+
+
+class PackedTable(MutableSequence):
+    """
+    A mutable sequence of fixed-width rows of u2 values, backed by a single
+    ``array('H')``.
+
+    Indexing returns instances of `entry`, a namedtuple type whose fields
+    define the row layout::
+
+        >>> entry = namedtuple('entry', 'start_pc line_number')
+        >>> table = PackedTable(entry, [(0, 3), (8, 4)])
+        >>> table[1]
+        entry(start_pc=8, line_number=4)
+
+    :param entry: The namedtuple type describing a single row.
+    :param rows: Optional iterable of rows to initially populate the table.
+    """
+    __slots__ = ('entry', 'width', 'data', 'version')
+
+    def __init__(self, entry, rows=None):
+        #: The namedtuple type returned when accessing a row.
+        self.entry = entry
+        #: The number of u2 values in a single row.
+        self.width = len(entry._fields)
+        #: The flattened, native-endian values of every row.
+        self.data = array('H')
+        #: Incremented on every mutation, allowing derived indexes to
+        #: detect when they've gone stale.
+        self.version = 0
+
+        if rows is not None:
+            self.extend(rows)
+
+    @classmethod
+    def frombytes(cls, entry, buff) -> 'PackedTable':
+        """
+        Create a new table from the big-endian on-disk representation of its
+        rows, *without* the leading row count.
+
+        :param entry: The namedtuple type describing a single row.
+        :param buff: Any bytes-like object.
+        """
+        table = cls(entry)
+        table.data.frombytes(buff)
+        if _SWAP:
+            table.data.byteswap()
+        return table
+
+    def tobytes(self) -> bytes:
+        """
+        The big-endian on-disk representation of every row in the table,
+        *without* the leading row count.
+        """
+        if not _SWAP:
+            return self.data.tobytes()
+
+        data = array('H', self.data)
+        data.byteswap()
+        return data.tobytes()
+
+    def column(self, name: str) -> array:
+        """
+        Returns a copy of a single column of the table as an ``array('H')``.
+
+        :param name: The name of the field in `entry`.
+        """
+        return self.data[self.entry._fields.index(name)::self.width]
+
+    def _row(self, value):
+        value = tuple(value)
+        if len(value) != self.width:
+            raise ValueError(
+                f'expected a row of {self.width} values, got {len(value)}'
+            )
+        return value
+
+    def _index(self, idx: int) -> int:
+        length = len(self)
+        if idx < 0:
+            idx += length
+        if not 0 <= idx < length:
+            raise IndexError('table index out of range')
+        return idx
+
+    def __len__(self):
+        return len(self.data) // self.width
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        w = self.width
+        start = self._index(idx) * w
+        return self.entry._make(self.data[start:start + w])
+
+    def __iter__(self):
+        make = self.entry._make
+        data = self.data
+        w = self.width
+        for start in range(0, len(data), w):
+            yield make(data[start:start + w])
+
+    def __setitem__(self, idx, value):
+        if isinstance(idx, slice):
+            rows = list(self)
+            rows[idx] = value
+            self.clear()
+            self.extend(rows)
+            return
+
+        w = self.width
+        start = self._index(idx) * w
+        self.data[start:start + w] = array('H', self._row(value))
+        self.version += 1
+
+    def __delitem__(self, idx):
+        if isinstance(idx, slice):
+            rows = list(self)
+            del rows[idx]
+            self.clear()
+            self.extend(rows)
+            return
+
+        w = self.width
+        start = self._index(idx) * w
+        del self.data[start:start + w]
+        self.version += 1
+
+    def insert(self, idx, value):
+        start = min(max(idx + len(self) if idx < 0 else idx, 0), len(self))
+        start *= self.width
+        self.data[start:start] = array('H', self._row(value))
+        self.version += 1
+
+    def append(self, value):
+        self.data.extend(self._row(value))
+        self.version += 1
+
+    def extend(self, rows):
+        row = self._row
+        for value in rows:
+            self.data.extend(row(value))
+        self.version += 1
+
+    def clear(self):
+        del self.data[:]
+        self.version += 1
+
+    def __eq__(self, other):
+        if isinstance(other, PackedTable):
+            return self.width == other.width and self.data == other.data
+        try:
+            return len(self) == len(other) and all(
+                a == tuple(b) for a, b in zip(self, other)
+            )
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,135 @@
+"""
+A trie of Java packages, used to list the packages and classes on a
+classpath without scanning every class name.
+"""
+from typing import Iterator, Set
+
+
+class _Node(object):
+    __slots__ = ('children', 'classes')
+
+    def __init__(self):
+        self.children = {}
+        #: The simple (unqualified) name of each class in this package.
+        self.classes = set()
+
+
+class PackageTrie(object):
+    """
+    Stores fully-qualified class names, split on ``/`` into one node per
+    package segment.
+
+        >>> trie = PackageTrie()
+        >>> trie.add('java/util/List')
+        >>> trie.add('java/util/concurrent/Future')
+        >>> trie.classes_in('java/util')
+        {'java/util/List'}
+        >>> sorted(trie.packages())
+        ['java/util', 'java/util/concurrent']
+
+    The default package is the empty string.
+    """
+    __slots__ = ('_root', '_count')
+
+    def __init__(self):
+        self._root = _Node()
+        self._count = 0
+
+    def _find(self, package: str):
+        node = self._root
+        if package:
+            for segment in package.split('/'):
+                node = node.children.get(segment)
+                if node is None:
+                    return None
+        return node
+
+    def add(self, name: str):
+        """Add the class `name`, such as ``java/util/List``."""
+        package, _, simple = name.rpartition('/')
+        node = self._root
+        if package:
+            for segment in package.split('/'):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+
+        if simple not in node.classes:
+            node.classes.add(simple)
+            self._count += 1
+
+    def remove(self, name: str):
+        """Remove the class `name`, pruning any packages left empty."""
+        package, _, simple = name.rpartition('/')
+        path = [self._root]
+        segments = package.split('/') if package else []
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+
+        node = path[-1]
+        if simple not in node.classes:
+            return
+        node.classes.discard(simple)
+        self._count -= 1
+
+        # Walk back up, dropping empty nodes.
+        for segment, parent in zip(reversed(segments), reversed(path[:-1])):
+            child = parent.children[segment]
+            if child.classes or child.children:
+                break
+            del parent.children[segment]
+
+    def __contains__(self, name: str) -> bool:
+        package, _, simple = name.rpartition('/')
+        node = self._find(package)
+        return node is not None and simple in node.classes
+
+    def __len__(self):
+        return self._count
+
+    def packages(self) -> Iterator[str]:
+        """
+        Yields every package that directly contains at least one class.
+        """
+        stack = [('', self._root)]
+        while stack:
+            package, node = stack.pop()
+            if node.classes:
+                yield package
+            for segment, child in node.children.items():
+                stack.append((
+                    f'{package}/{segment}' if package else segment,
+                    child
+                ))
+
+    def classes_in(self, package: str, recursive: bool=False) -> Set[str]:
+        """
+        Returns the fully-qualified name of every class in `package`.
+
+        :param package: The package, such as ``java/util``.
+        :param recursive: If True, include classes in sub-packages.
+        """
+        package = package.strip('/')
+        node = self._find(package)
+        if node is None:
+            return set()
+
+        result = set()
+        stack = [(package, node)]
+        while stack:
+            prefix, node = stack.pop()
+            result.update(
+                f'{prefix}/{simple}' if prefix else simple
+                for simple in node.classes
+            )
+            if recursive:
+                for segment, child in node.children.items():
+                    stack.append((
+                        f'{prefix}/{segment}' if prefix else segment,
+                        child
+                    ))
+        return result
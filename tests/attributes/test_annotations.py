@@ -0,0 +1,106 @@
+import pytest
+
+from jawa.cf import ClassFile
+from jawa.attributes.annotations import (
+    RuntimeVisibleAnnotationsAttribute,
+    RuntimeInvisibleParameterAnnotationsAttribute,
+    RuntimeVisibleTypeAnnotationsAttribute,
+    AnnotationDefaultAttribute,
+    Annotation,
+    ElementValuePair,
+    ElementValue,
+    EnumConstValue,
+    TypeAnnotation,
+    annotation_types
+)
+from jawa.util.stream import BufferStreamReader
+
+
+def _annotation(cf):
+    c = cf.constants
+    return Annotation(c.create_utf8('Lcom/example/Named;').index, [
+        ElementValuePair(
+            c.create_utf8('value').index,
+            ElementValue('s', c.create_utf8('hello').index)
+        ),
+        ElementValuePair(
+            c.create_utf8('scope').index,
+            ElementValue('e', EnumConstValue(
+                c.create_utf8('Lcom/example/Scope;').index,
+                c.create_utf8('SINGLETON').index
+            ))
+        ),
+        ElementValuePair(
+            c.create_utf8('nested').index,
+            ElementValue('[', [
+                ElementValue('@', Annotation(
+                    c.create_utf8('Lcom/example/Inner;').index,
+                    []
+                )),
+                ElementValue('I', c.create_integer(3).index)
+            ])
+        )
+    ])
+
+
+def test_annotations_roundtrip():
+    cf = ClassFile.create('Annotated')
+    a = cf.attributes.create(RuntimeVisibleAnnotationsAttribute)
+    a.annotations.append(_annotation(cf))
+    a.annotations.append(Annotation(
+        cf.constants.create_utf8('Ljava/lang/Deprecated;').index,
+        []
+    ))
+
+    b = cf.attributes.create(RuntimeVisibleAnnotationsAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert b.types == ['Lcom/example/Named;', 'Ljava/lang/Deprecated;']
+    assert b.annotations == a.annotations
+    assert b.pack() == a.pack()
+
+
+def test_annotation_types_skips_values():
+    cf = ClassFile.create('Annotated')
+    a = cf.attributes.create(RuntimeInvisibleParameterAnnotationsAttribute)
+    a.parameters = [[], [_annotation(cf), _annotation(cf)]]
+
+    info = a.pack()
+    assert info[0] == 2
+    types = list(annotation_types(info, parameters=True))
+    assert len(types) == 2
+    assert cf.constants[types[0]] == 'Lcom/example/Named;'
+
+    b = cf.attributes.create(RuntimeInvisibleParameterAnnotationsAttribute)
+    b.unpack(BufferStreamReader(info))
+    assert b.parameters == a.parameters
+
+
+def test_type_annotations_roundtrip():
+    cf = ClassFile.create('Annotated')
+    a = cf.attributes.create(RuntimeVisibleTypeAnnotationsAttribute)
+    a.annotations = [
+        TypeAnnotation(0x10, (1,), ((3, 0),), _annotation(cf)),
+        TypeAnnotation(0x40, ((0, 5, 1), (6, 2, 2)), (), _annotation(cf)),
+        TypeAnnotation(0x47, (9, 0), (), _annotation(cf))
+    ]
+
+    b = cf.attributes.create(RuntimeVisibleTypeAnnotationsAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert b.annotations == a.annotations
+
+
+def test_annotation_default_roundtrip():
+    cf = ClassFile.create('Annotated')
+    a = cf.attributes.create(AnnotationDefaultAttribute)
+    a.default_value = ElementValue('c', cf.constants.create_utf8('V').index)
+
+    b = cf.attributes.create(AnnotationDefaultAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert b.default_value == a.default_value
+
+
+def test_annotation_default_requires_value():
+    cf = ClassFile.create('Annotated')
+    a = cf.attributes.create(AnnotationDefaultAttribute)
+    with pytest.raises(ValueError):
+        a.pack()
@@ -0,0 +1,54 @@
+from jawa.cf import ClassFile
+from jawa.attributes.code import CodeException
+from jawa.util.stream import BufferStreamReader
+
+
+def _code():
+    cf = ClassFile.create('HandlerTest')
+    return cf.methods.create('test', '()V', code=True).code
+
+
+def test_exception_table_roundtrip():
+    code = _code()
+    code.exception_table = [
+        CodeException(0, 10, 20, 0),
+        CodeException(4, 8, 30, 5)
+    ]
+
+    other = _code()
+    other.unpack(BufferStreamReader(code.pack()))
+    assert other.exception_table == code.exception_table
+    assert other.exception_table[1].catch_type == 5
+
+
+def test_handlers_at():
+    code = _code()
+    code.exception_table = [
+        CodeException(0, 10, 20, 0),
+        CodeException(4, 8, 30, 5)
+    ]
+
+    assert code.handlers_at(0) == (CodeException(0, 10, 20, 0),)
+    assert [h.handler_pc for h in code.handlers_at(4)] == [20, 30]
+    assert [h.handler_pc for h in code.handlers_at(8)] == [20]
+    assert code.handlers_at(10) == ()
+
+    assert [
+        (start, end, len(handlers))
+        for start, end, handlers in code.protected_ranges()
+    ] == [(0, 4, 1), (4, 8, 2), (8, 10, 1)]
+
+
+def test_handlers_at_mutation():
+    code = _code()
+    assert code.handlers_at(0) == ()
+
+    code.exception_table.append(CodeException(0, 2, 5, 0))
+    assert len(code.handlers_at(1)) == 1
+
+    code.exception_table[0] = CodeException(3, 4, 5, 0)
+    assert code.handlers_at(1) == ()
+    assert len(code.handlers_at(3)) == 1
+
+    del code.exception_table[0]
+    assert code.handlers_at(3) == ()
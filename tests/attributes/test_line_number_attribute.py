@@ -1,3 +1,13 @@
+from array import array
+
+from jawa.cf import ClassFile
+from jawa.attributes.line_number_table import (
+    LineNumberTableAttribute,
+    line_number_entry
+)
+from jawa.util.stream import BufferStreamReader
+
+
 def test_exceptions_read(loader):
     cf = loader['HelloWorldDebug']
     m = cf.methods.find_one(name='main')
@@ -15,3 +25,47 @@ def test_exceptions_write(loader):
     a = m.code.attributes.find_one(name='LineNumberTable')
 
     assert a.pack() == b'\x00\x02\x00\x00\x00\x03\x00\x08\x00\x04'
+
+
+def test_line_number_large_table():
+    cf = ClassFile.create('LargeLineNumberTable')
+    m = cf.methods.create('test', '()V', code=True)
+    a = m.code.attributes.create(LineNumberTableAttribute)
+
+    a.line_no = [line_number_entry(i, i % 65536) for i in range(20000)]
+    a.line_no.append((20000, 1))
+    assert len(a.line_no) == 20001
+    assert a.line_no[-1] == line_number_entry(20000, 1)
+
+    b = m.code.attributes.create(LineNumberTableAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert b.line_no == a.line_no
+    assert b.line_no[12345] == (12345, 12345)
+
+
+def test_line_for_pc(loader):
+    cf = loader['TableSwitch']
+    m = cf.methods.find_one(name='main')
+    a = m.code.attributes.find_one(name='LineNumberTable')
+
+    assert a.line_for_pc(0) == 4
+    assert a.line_for_pc(27) == 4
+    assert a.line_for_pc(28) == 5
+    assert a.line_for_pc(1000) == 8
+    assert list(a.lines_for_pcs(array('H', [31, 0, 29]))) == [8, 4, 6]
+
+
+def test_line_for_pc_mutation():
+    cf = ClassFile.create('LineForPc')
+    m = cf.methods.create('test', '()V', code=True)
+    a = m.code.attributes.create(LineNumberTableAttribute)
+
+    assert a.line_for_pc(0) is None
+    a.line_no.extend([(10, 2), (0, 1)])
+    assert a.line_for_pc(5) == 1
+    assert a.line_for_pc(10) == 2
+    assert list(a.lines_for_pcs([0, 12])) == [1, 2]
+
+    a.line_no = [(4, 9)]
+    assert a.line_for_pc(3) is None
+    assert list(a.lines_for_pcs([3, 4])) == [-1, 9]
@@ -0,0 +1,74 @@
+from jawa.cf import ClassFile
+from jawa.attributes.local_variable import (
+    LocalVariableTableAttribute,
+    local_variable_entry
+)
+from jawa.util.stream import BufferStreamReader
+
+
+def test_local_variable_read(loader):
+    cf = loader['HelloWorldDebug']
+    m = cf.methods.find_one(name='main')
+    a = m.code.attributes.find_one(name='LocalVariableTable')
+
+    assert a.local_variables == [
+        local_variable_entry(
+            start_pc=0,
+            length=9,
+            name_index=16,
+            descriptor_index=17,
+            index=0
+        )
+    ]
+    assert cf.constants[a.local_variables[0].name_index] == 'args'
+
+
+def test_local_variable_write(loader):
+    cf = loader['HelloWorldDebug']
+    m = cf.methods.find_one(name='main')
+    a = m.code.attributes.find_one(name='LocalVariableTable')
+
+    assert a.pack() == (
+        b'\x00\x01\x00\x00\x00\x09\x00\x10\x00\x11\x00\x00'
+    )
+
+
+def test_local_variable_mutation():
+    cf = ClassFile.create('LocalVariables')
+    m = cf.methods.create('test', '()V', code=True)
+    a = m.code.attributes.create(LocalVariableTableAttribute)
+
+    a.local_variables.extend((i, 1, 2, 3, i) for i in range(10000))
+    a.local_variables[0] = local_variable_entry(7, 1, 2, 3, 4)
+    del a.local_variables[1]
+    a.local_variables.insert(1, (8, 1, 2, 3, 5))
+
+    b = m.code.attributes.create(LocalVariableTableAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert len(b.local_variables) == 10000
+    assert b.local_variables[0] == (7, 1, 2, 3, 4)
+    assert b.local_variables[1] == (8, 1, 2, 3, 5)
+    assert b.local_variables[-1].index == 9999
+
+
+def test_locals_at(loader):
+    cf = loader['ArrayTest']
+    m = cf.methods.find_one(name='addOne')
+    a = m.code.attributes.find_one(name='LocalVariableTable')
+
+    assert [lv.index for lv in a.locals_at(0)] == [0, 1]
+    assert [lv.index for lv in a.locals_at(14)] == [0, 1]
+    assert a.locals_at(15) == ()
+
+
+def test_locals_at_mutation():
+    cf = ClassFile.create('LocalsAt')
+    m = cf.methods.create('test', '()V', code=True)
+    a = m.code.attributes.create(LocalVariableTableAttribute)
+
+    a.local_variables = [(0, 20, 1, 2, 0), (5, 5, 1, 2, 1)]
+    assert [lv.index for lv in a.locals_at(7)] == [0, 1]
+    assert [lv.index for lv in a.locals_at(10)] == [0]
+
+    a.local_variables.append((8, 4, 1, 2, 2))
+    assert [lv.index for lv in a.locals_at(10)] == [0, 2]
@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+from jawa.cf import ClassFile
+from jawa.attributes.module import ModuleAttribute, ModulePackagesAttribute
+from jawa.attributes.record import RecordAttribute
+from jawa.attributes.signature import SignatureAttribute
+
+
+def test_module_roundtrip():
+    cf = ClassFile.create('module-info')
+    cf.version = 53, 0
+    a = cf.attributes.create(ModuleAttribute)
+    a.module_name = cf.constants.create_module('com.example')
+    a.add_requires('java.base', flags=0x8000)
+    a.add_exports('com/example/api')
+    a.add_exports('com/example/impl', to=['com.example.test'], opens=True)
+    a.add_uses('com/example/Plugin')
+    a.add_provides('com/example/Plugin', ['com/example/impl/Default'])
+
+    p = cf.attributes.create(ModulePackagesAttribute)
+    p.add('com/example/api')
+    p.add('com/example/impl')
+
+    with io.BytesIO() as out:
+        cf.save(out)
+        out.seek(0)
+        loaded = ClassFile(out)
+
+    a2 = loaded.attributes.find_one(name='Module')
+    assert a2.pack() == a.pack()
+    assert a2.module_name.name == 'com.example'
+    assert loaded.constants[a2.requires[0].requires_index].name == 'java.base'
+    assert a2.requires[0].requires_flags == 0x8000
+    assert loaded.constants[a2.exports[0].package_index].name == (
+        'com/example/api'
+    )
+    assert a2.exports[0].to_indexes == []
+    assert len(a2.opens[0].to_indexes) == 1
+    assert loaded.constants[a2.uses[0]].name == 'com/example/Plugin'
+    assert len(a2.provides[0].with_indexes) == 1
+
+    p2 = loaded.attributes.find_one(name='ModulePackages')
+    assert [loaded.constants[i].name.value for i in p2.packages] == [
+        'com/example/api',
+        'com/example/impl'
+    ]
+
+
+def test_record_roundtrip():
+    cf = ClassFile.create('Point', 'java/lang/Record')
+    a = cf.attributes.create(RecordAttribute)
+    a.create('x', 'I')
+    y = a.create('y', 'Ljava/util/List;')
+    s = y.attributes.create(SignatureAttribute, None)
+    s.signature = cf.constants.create_utf8(
+        'Ljava/util/List<Ljava/lang/Integer;>;'
+    )
+
+    with io.BytesIO() as out:
+        cf.save(out)
+        out.seek(0)
+        loaded = ClassFile(out)
+
+    a2 = loaded.attributes.find_one(name='Record')
+    assert [(c.name.value, c.descriptor.value) for c in a2.components] == [
+        ('x', 'I'),
+        ('y', 'Ljava/util/List;')
+    ]
+    s2 = a2.components[1].attributes.find_one(name='Signature')
+    assert s2.signature == 'Ljava/util/List<Ljava/lang/Integer;>;'
+
+
+def test_module_requires_name():
+    cf = ClassFile.create('module-info')
+    a = cf.attributes.create(ModuleAttribute)
+    with pytest.raises(ValueError):
+        a.pack()
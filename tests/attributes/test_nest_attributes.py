@@ -0,0 +1,32 @@
+from jawa.cf import ClassFile
+from jawa.attributes.nest import NestHostAttribute, NestMembersAttribute
+from jawa.attributes.permitted_subclasses import PermittedSubclassesAttribute
+from jawa.util.stream import BufferStreamReader
+
+
+def test_nest_host_roundtrip():
+    cf = ClassFile.create('Outer$Inner')
+    a = cf.attributes.create(NestHostAttribute)
+    a.host_class = cf.constants.create_class('Outer')
+
+    b = cf.attributes.create(NestHostAttribute)
+    b.unpack(BufferStreamReader(a.pack()))
+    assert b.host_class.name == 'Outer'
+
+
+def test_nest_members_roundtrip():
+    cf = ClassFile.create('Outer')
+    for type_ in (NestMembersAttribute, PermittedSubclassesAttribute):
+        a = cf.attributes.create(type_)
+        a.add('Outer$A')
+        a.add('Outer$B')
+
+        b = cf.attributes.create(type_)
+        b.unpack(BufferStreamReader(a.pack()))
+        assert [cf.constants[i].name.value for i in b.classes] == [
+            'Outer$A',
+            'Outer$B'
+        ]
+
+    assert cf.attributes[1].name == 'NestMembers'
+    assert cf.attributes[3].name == 'PermittedSubclasses'
@@ -0,0 +1,56 @@
+import asyncio
+from pathlib import Path
+
+from jawa.aio import AsyncClassLoader
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def _run_until_complete(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_load():
+    async def run():
+        loader = AsyncClassLoader(DATA, workers=2)
+        # Sources are indexed off the event loop, once the loader is used.
+        assert 'HelloWorld' not in loader
+        async with loader:
+            assert 'HelloWorld' in loader
+            cf = await loader.load('HelloWorld')
+            assert cf.this.name.value == 'HelloWorld'
+            # The underlying ClassLoader's cache is shared.
+            assert loader.loader.load('HelloWorld') is cf
+
+            paths = ['HelloWorld', 'ArrayTest', 'TableSwitch']
+            loaded = {}
+            async for path, cf in loader.as_completed(paths):
+                loaded[path] = cf
+            assert sorted(loaded) == sorted(paths)
+
+            names = set()
+            async for cf in loader:
+                names.add(cf.this.name.value)
+            assert names == set(loader.classes)
+
+    _run_until_complete(run())
+
+
+def test_async_iterate_fresh_loader():
+    async def run():
+        loader = AsyncClassLoader(DATA, workers=2)
+        try:
+            names = set()
+            async for cf in loader:
+                names.add(cf.this.name.value)
+        finally:
+            loader.close()
+        assert 'HelloWorld' in names
+        assert names == set(loader.classes)
+
+    _run_until_complete(run())
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from jawa.cache import LRUCache, TwoQueueCache
+from jawa.classloader import ClassLoader
+
+
+def test_lru_cache_byte_budget():
+    cache = LRUCache(max_bytes=100)
+    cache.put('A', 'a', 40)
+    cache.put('B', 'b', 40)
+    assert cache.get('A') == 'a'
+
+    # B is now the least recently used, and the only thing evicted.
+    cache.put('C', 'c', 40)
+    assert list(cache) == ['A', 'C']
+    assert cache.get('B') is None
+
+    stats = cache.stats
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.size == 80
+
+    assert cache.pop('A') == 'a'
+    assert cache.size == 40
+    assert cache.stats.evictions == 1
+
+
+def test_two_queue_cache_resists_scans():
+    cache = TwoQueueCache(max_entries=8, ghost_entries=16)
+
+    # Get 'hot' promoted into the main queue by having it evicted and then
+    # requested again while still remembered.
+    cache.put('hot', 'hot')
+    for i in range(8):
+        cache.put(f'warmup{i}', i)
+    assert 'hot' not in cache
+    cache.put('hot', 'hot')
+
+    # A long scan only ever churns the FIFO queue.
+    for i in range(100):
+        cache.put(f'scan{i}', i)
+        assert cache.get(f'scan{i}') == i
+
+    assert cache.get('hot') == 'hot'
+    assert len(cache) <= 8
+
+    lru = LRUCache(max_entries=8)
+    lru.put('hot', 'hot')
+    for i in range(100):
+        lru.put(f'scan{i}', i)
+    assert 'hot' not in lru
+
+
+def test_classloader_cache():
+    loader = ClassLoader(Path(__file__).parent / 'data', max_cache=1)
+    loader.load('HelloWorld')
+    loader.load('HelloWorld')
+    loader.load('ArrayTest')
+
+    stats = loader.class_cache.stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.evictions == 1
+    assert list(loader.class_cache) == ['ArrayTest']
+    assert stats.size == len(loader._read('ArrayTest.class'))
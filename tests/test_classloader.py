@@ -2,8 +2,13 @@ import os.path
 import shutil
 import tempfile
 import zipfile
+import operator
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from jawa.cf import ClassFile
+from jawa.cache import TwoQueueCache
 from jawa.classloader import ClassLoader
 from jawa.transforms import simple_swap
 from jawa.assemble import assemble
@@ -101,3 +106,401 @@ def test_dependencies(loader):
         'HelloWorld',
         'java/lang/System'
     }
+
+
+def test_annotation_index():
+    """Ensure annotations are indexed without loading classes."""
+    from jawa.attributes.annotations import (
+        RuntimeVisibleAnnotationsAttribute,
+        Annotation
+    )
+
+    with tempfile.TemporaryDirectory() as dir:
+        for name, annotated in (('Plain', False), ('Service', True)):
+            cf = ClassFile.create(name)
+            if annotated:
+                a = cf.attributes.create(RuntimeVisibleAnnotationsAttribute)
+                a.annotations.append(Annotation(
+                    cf.constants.create_utf8('Ljavax/inject/Singleton;').index,
+                    []
+                ))
+                field = cf.fields.create('repo', 'Ljava/lang/Object;')
+                a = field.attributes.create(RuntimeVisibleAnnotationsAttribute)
+                a.annotations.append(Annotation(
+                    cf.constants.create_utf8('Ljavax/inject/Inject;').index,
+                    []
+                ))
+
+            with open(os.path.join(dir, f'{name}.class'), 'wb') as out:
+                cf.save(out)
+
+        cl = ClassLoader(dir)
+        index = cl.annotation_index()
+
+        assert index.classes('javax/inject/Singleton') == {'Service'}
+        assert index.classes('Ljavax/inject/Singleton;') == {'Service'}
+        assert index.annotations('Plain') == set()
+        assert [
+            (m.class_, m.name) for m in index.members('javax/inject/Inject')
+        ] == [('Service', 'repo')]
+        assert 'javax/inject/Inject' in index
+        assert not cl.class_cache
+        assert cl.annotation_index() is index
+
+
+def test_nest_index():
+    """Ensure nests are grouped using only the nest attributes."""
+    from jawa.attributes.nest import NestHostAttribute, NestMembersAttribute
+
+    with tempfile.TemporaryDirectory() as dir:
+        host = ClassFile.create('Outer')
+        members = host.attributes.create(NestMembersAttribute)
+        members.add('Outer$A')
+
+        a = ClassFile.create('Outer$A')
+        a.attributes.create(NestHostAttribute).host_class = (
+            a.constants.create_class('Outer')
+        )
+
+        b = ClassFile.create('Outer$B')
+        b.attributes.create(NestHostAttribute).host_class = (
+            b.constants.create_class('Outer')
+        )
+
+        for cf in (host, a, b, ClassFile.create('Alone')):
+            name = cf.this.name.value
+            with open(os.path.join(dir, f'{name}.class'), 'wb') as out:
+                cf.save(out)
+
+        index = ClassLoader(dir).nest_index()
+        assert index.host('Outer$A') == 'Outer'
+        assert index.host('Alone') == 'Alone'
+        assert index.members('Outer') == {'Outer$A', 'Outer$B'}
+        assert index.nestmates('Outer$B') == {'Outer', 'Outer$A', 'Outer$B'}
+        assert index.nestmates('Alone') == {'Alone'}
+        assert list(index.nests()) == [('Outer', {'Outer$A', 'Outer$B'})]
+
+
+def test_update_concurrent():
+    """Ensure concurrent indexing matches serial indexing exactly."""
+    hello_world = os.path.join(
+        os.path.dirname(__file__),
+        'data',
+        'HelloWorld.class'
+    )
+
+    with tempfile.TemporaryDirectory() as dir:
+        os.makedirs(os.path.join(dir, 'classes', 'a', 'b', 'c'))
+        for sub in ('', 'a', os.path.join('a', 'b', 'c')):
+            shutil.copy(hello_world, os.path.join(dir, 'classes', sub))
+
+        jars = []
+        for i in range(3):
+            jar = os.path.join(dir, f'{i}.jar')
+            with zipfile.ZipFile(jar, 'w') as zf:
+                zf.write(hello_world, arcname='HelloWorld.class')
+                zf.write(hello_world, arcname=f'only/{i}/HelloWorld.class')
+            jars.append(jar)
+
+        sources = [os.path.join(dir, 'classes'), *jars]
+
+        serial = ClassLoader()
+        serial.update(*sources, workers=1, maximum_depth=2)
+        concurrent = ClassLoader()
+        concurrent.update(*sources, workers=4, maximum_depth=2)
+
+        assert list(serial.path_map) == list(concurrent.path_map)
+        assert 'a/HelloWorld.class' in concurrent
+        assert 'a/b/c/HelloWorld.class' not in concurrent
+        assert concurrent.path_map['HelloWorld.class'].filename == jars[-1]
+        for path, entry in serial.path_map.items():
+            other = concurrent.path_map[path]
+            assert getattr(entry, 'filename', entry) == getattr(
+                other,
+                'filename',
+                other
+            )
+
+
+def test_load_many():
+    """Ensure classes can be bulk loaded from jars and directories."""
+    data = os.path.join(os.path.dirname(__file__), 'data')
+
+    with tempfile.NamedTemporaryFile(suffix='.jar') as tmp:
+        with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.write(
+                os.path.join(data, 'HelloWorld.class'),
+                arcname='HelloWorld.class'
+            )
+            zf.write(
+                os.path.join(data, 'ArrayTest.class'),
+                arcname='ArrayTest.class',
+                compress_type=zipfile.ZIP_STORED
+            )
+        tmp.flush()
+
+        cl = ClassLoader(tmp.name, data)
+        cl.update(ClassFile.create('InMemory'))
+        paths = ['HelloWorld', 'ArrayTest', 'TableSwitch', 'InMemory']
+
+        loaded = dict(cl.load_many(paths, workers=2))
+
+        assert sorted(loaded) == sorted(paths)
+        for path, cf in loaded.items():
+            assert cf.this.name.value == path
+            assert cf.classloader is cl
+        assert list(cl.class_cache) == ['InMemory']
+
+
+def test_load_coalesced():
+    started = threading.Event()
+    proceed = threading.Event()
+    parsed = []
+
+    class SlowClassFile(ClassFile):
+        def __init__(self, source=None):
+            parsed.append(source)
+            started.set()
+            proceed.wait()
+            super().__init__(source)
+
+    data = os.path.join(os.path.dirname(__file__), 'data')
+    cl = ClassLoader(data, klass=SlowClassFile)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(cl.load, 'HelloWorld')
+        started.wait()
+        rest = [pool.submit(cl.load, 'HelloWorld') for _ in range(3)]
+        proceed.set()
+        results = [first.result()] + [f.result() for f in rest]
+
+    assert len(parsed) == 1
+    assert all(r is results[0] for r in results)
+    assert cl.class_cache.stats.entries == 1
+
+
+def _method_names(cf):
+    return cf.this.name.value, sorted(m.name.value for m in cf.methods)
+
+
+def _method_count(cf):
+    return len(cf.methods)
+
+
+def _loader_options(cf):
+    loader = cf.classloader
+    return (
+        type(loader.class_cache).__name__,
+        loader.class_cache.max_bytes,
+        loader.parse_cache.path
+    )
+
+
+def _record_call(dir, cf):
+    fd, _ = tempfile.mkstemp(dir=dir)
+    os.close(fd)
+    return cf.this.name.value
+
+
+def test_map_stops_early():
+    data = os.path.join(os.path.dirname(__file__), 'data')
+    cl = ClassLoader(data)
+    taken = []
+
+    def classes():
+        for i in range(500):
+            taken.append(i)
+            yield 'HelloWorld'
+
+    with tempfile.TemporaryDirectory() as dir:
+        results = cl.map(
+            functools.partial(_record_call, dir),
+            classes(),
+            workers=2,
+            chunksize=1
+        )
+        assert next(results) == 'HelloWorld'
+        results.close()
+        # Only the few chunks submitted ahead of the first were taken from
+        # `classes`, or run.
+        assert len(taken) < 20
+        assert len(os.listdir(dir)) < 20
+
+
+def test_map_reduce():
+    data = os.path.join(os.path.dirname(__file__), 'data')
+    cl = ClassLoader(data)
+    cl.update(ClassFile.create('InMemory'))
+    paths = ['HelloWorld', 'ArrayTest', 'InMemory']
+
+    results = list(cl.map(_method_names, paths, workers=2, chunksize=1))
+    assert results == [_method_names(cl.load(path)) for path in paths]
+
+    assert cl.reduce(
+        _method_count,
+        operator.add,
+        0,
+        paths,
+        workers=2,
+        chunksize=2
+    ) == sum(len(cl.load(path).methods) for path in paths)
+
+    # Workers are set up with the same cache options.
+    cl = ClassLoader(
+        data,
+        cache=TwoQueueCache(max_bytes=1 << 20),
+        parse_cache=':memory:'
+    )
+    assert set(cl.map(_loader_options, paths[:2], workers=2)) == {
+        ('TwoQueueCache', 1 << 20, ':memory:')
+    }
+
+
+def test_hierarchy():
+    def create(name, super_='java/lang/Object', interfaces=(),
+               interface=False):
+        cf = ClassFile.create(name, super_)
+        cf.access_flags.acc_interface = interface
+        cf._interfaces = [
+            cf.constants.create_class(i).index for i in interfaces
+        ]
+        return cf
+
+    with tempfile.TemporaryDirectory() as dir:
+        for cf in (
+                create('I', interface=True),
+                create('J', interfaces=['I'], interface=True),
+                create('A'),
+                create('B', 'A', interfaces=['J'])):
+            with open(os.path.join(dir, f'{cf.this.name.value}.class'),
+                      'wb') as out:
+                cf.save(out)
+
+        cl = ClassLoader(dir)
+        hierarchy = cl.hierarchy()
+
+        assert hierarchy.subclasses('A') == {'B'}
+        assert hierarchy.implementors('I', transitive=False) == {'J'}
+        assert hierarchy.implementors('I') == {'J', 'B'}
+        assert hierarchy.ancestors('B') == ['A', 'J', 'java/lang/Object', 'I']
+        assert hierarchy.is_interface('J')
+        assert hierarchy.is_assignable('B', 'I')
+        assert not hierarchy.is_assignable('A', 'I')
+
+        # Classes added later are added to the existing index.
+        cl.update(create('C', 'B'))
+        assert cl.hierarchy() is hierarchy
+        assert hierarchy.subclasses('A') == {'B', 'C'}
+        assert hierarchy.subclasses('A', transitive=False) == {'B'}
+        assert hierarchy.implementors('I') == {'J', 'B', 'C'}
+
+        # Replacing a class replaces its edges.
+        cl.update(create('C', 'A'))
+        assert hierarchy.subclasses('B') == set()
+        assert hierarchy.subclasses('A', transitive=False) == {'B', 'C'}
+        assert len(hierarchy) == 5
+
+
+def test_packages():
+    data = os.path.join(os.path.dirname(__file__), 'data')
+    with tempfile.TemporaryDirectory() as dir:
+        for package in ('com/example', 'com/example/impl'):
+            os.makedirs(os.path.join(dir, package))
+        shutil.copy(
+            os.path.join(data, 'HelloWorld.class'),
+            os.path.join(dir, 'com/example/Api.class')
+        )
+        shutil.copy(
+            os.path.join(data, 'HelloWorld.class'),
+            os.path.join(dir, 'com/example/impl/Impl.class')
+        )
+        shutil.copy(os.path.join(data, 'ArrayTest.class'), dir)
+
+        cl = ClassLoader(dir)
+        assert sorted(cl.packages()) == ['', 'com/example', 'com/example/impl']
+        assert cl.classes_in('com/example') == {'com/example/Api'}
+        assert cl.classes_in('com', recursive=True) == {
+            'com/example/Api',
+            'com/example/impl/Impl'
+        }
+        assert 'com/example/Api' in cl
+        assert 'com/example/Missing' not in cl
+        assert 'ArrayTest.class' in cl
+
+
+def test_refresh():
+    def save(path, name, super_='java/lang/Object'):
+        cf = ClassFile.create(name, super_)
+        with open(path, 'wb') as out:
+            cf.save(out)
+
+    def write_jar(path, classes):
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name, super_ in classes:
+                with zf.open(f'{name}.class', 'w') as out:
+                    ClassFile.create(name, super_).save(out)
+
+    with tempfile.TemporaryDirectory() as dir:
+        classes = os.path.join(dir, 'classes')
+        os.mkdir(classes)
+        save(os.path.join(classes, 'A.class'), 'A')
+        save(os.path.join(classes, 'B.class'), 'B')
+        lib = os.path.join(dir, 'lib.jar')
+        write_jar(lib, [('C', 'java/lang/Object'), ('D', 'java/lang/Object')])
+        static = os.path.join(dir, 'static.jar')
+        write_jar(static, [('S', 'java/lang/Object')])
+
+        cl = ClassLoader(classes, lib, static)
+        hierarchy = cl.hierarchy()
+        a, c, s = cl.load('A'), cl.load('C'), cl.load('S')
+        assert cl.refresh() == (set(), set(), set())
+        assert cl.load('A') is a
+
+        save(os.path.join(classes, 'A.class'), 'A', 'SomeBaseClass')
+        os.remove(os.path.join(classes, 'B.class'))
+        save(os.path.join(classes, 'E.class'), 'E', 'A')
+        write_jar(lib, [('C', 'A'), ('F', 'java/lang/Object')])
+
+        result = cl.refresh()
+        assert result.added == {'E', 'F'}
+        assert result.removed == {'B', 'D'}
+        assert result.modified == {'A', 'C'}
+
+        # Only the classes that changed were evicted.
+        assert cl.load('S') is s
+        assert cl.load('A') is not a
+        assert cl.load('C').super_.name.value == 'A'
+        assert 'B' not in cl and 'D' not in cl
+        assert sorted(cl.classes) == ['A', 'C', 'E', 'F', 'S']
+
+        # The hierarchy was updated in place.
+        assert cl.hierarchy() is hierarchy
+        assert hierarchy.superclass('A') == 'SomeBaseClass'
+        assert hierarchy.subclasses('A') == {'C', 'E'}
+        assert 'B' not in hierarchy
+
+
+def test_grep():
+    data = os.path.join(os.path.dirname(__file__), 'data')
+    cl = ClassLoader(data)
+    classes = sorted(cl.classes)
+
+    serial = list(cl.grep('Hello ', classes=classes, workers=1))
+    assert serial == [
+        ('HelloWorld', ['Hello World!']),
+        ('HelloWorldDebug', ['Hello World!'])
+    ]
+
+    pattern = r'java/lang/(Object|String)$'
+    expected = list(cl.grep(pattern, classes=classes, workers=1))
+    assert list(cl.grep(
+        pattern,
+        classes=classes,
+        workers=2,
+        chunksize=2,
+        ordered=True
+    )) == expected
+    assert sorted(cl.grep(pattern, workers=2, chunksize=2)) == expected
+
+    first = dict(cl.grep(pattern, workers=1, first=True))
+    assert all(len(constants) == 1 for constants in first.values())
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from jawa.cli import cli
+
+DATA = str(Path(__file__).parent / 'data')
+
+
+def test_bench():
+    result = CliRunner().invoke(cli, ['bench', DATA])
+    assert result.exit_code == 0, result.output
+    phases = [
+        line.split()[0] for line in result.output.splitlines()
+        if not line.startswith('Skipped')
+    ]
+    assert phases == ['phase', 'read', 'peek', 'parse', 'disassemble',
+                      'save']
+
+
+def test_profile():
+    result = CliRunner().invoke(cli, [
+        'profile', '--top', '3', DATA, '--', 'grep', 'Hello World'
+    ])
+    assert result.exit_code == 0, result.output
+    assert 'HelloWorld\n' in result.output
+    assert 'Ordered by: cumulative time' in result.output
+    assert 'Peak memory' in result.output
+
+    result = CliRunner().invoke(cli, ['profile', DATA, '--', 'profile'])
+    assert result.exit_code != 0
+
+
+def test_grep():
+    runner = CliRunner()
+    for jobs in ('1', '2'):
+        result = runner.invoke(cli, [
+            'grep', DATA, 'Hello ', '--jobs', jobs, '--with-constant',
+            '--ordered'
+        ])
+        assert result.exit_code == 0, result.output
+        assert sorted(result.output.splitlines()) == [
+            'HelloWorld:Hello World!',
+            'HelloWorldDebug:Hello World!'
+        ]
+
+    result = runner.invoke(cli, [
+        'grep', DATA, 'java/lang/Object$', '--jobs', '1', '--count',
+        '--ordered'
+    ])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert 'HelloWorld:1' in lines
+
+    result = runner.invoke(cli, [
+        'grep', DATA, 'Hello', '--count', '--with-constant'
+    ])
+    assert result.exit_code != 0
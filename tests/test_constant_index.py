@@ -0,0 +1,44 @@
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from jawa.classloader import ClassLoader
+from jawa.constant_index import ConstantIndex, required_trigrams
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_required_trigrams():
+    assert required_trigrams('Hello') == {'Hel', 'ell', 'llo'}
+    assert required_trigrams('ab(cd|ef)gh') is None
+    assert required_trigrams(r'java/(lang)+\.x?') == {
+        'jav', 'ava', 'va/', 'lan', 'ang'
+    }
+    assert required_trigrams(re.compile('Hello', re.I)) is None
+
+
+def test_constant_index():
+    with tempfile.TemporaryDirectory() as dir:
+        classes = os.path.join(dir, 'classes')
+        os.mkdir(classes)
+        for name in ('HelloWorld', 'ArrayTest'):
+            shutil.copy(DATA / f'{name}.class', classes)
+
+        loader = ClassLoader(classes)
+        path = os.path.join(dir, 'index')
+        with ConstantIndex.build(loader, path) as index:
+            assert len(index) == 2
+            assert index.candidates('Hello World') == {'HelloWorld'}
+            assert index.candidates('java/lang/Object') == {
+                'HelloWorld',
+                'ArrayTest'
+            }
+            assert index.candidates('no such constant') == set()
+            assert index.is_current(loader)
+
+        shutil.copy(DATA / 'TableSwitch.class', classes)
+        with ConstantIndex(path) as index:
+            assert not index.is_current(ClassLoader(classes))
@@ -0,0 +1,107 @@
+import io
+import json
+from pathlib import Path
+
+from jawa.cf import ClassFile
+from jawa.classloader import ClassLoader
+from jawa.scan import ClassScan
+from jawa.dependencies import DependencyGraph, class_references
+from jawa.attributes.signature import SignatureAttribute
+from jawa.util.descriptor import descriptor_types, signature_types
+
+
+def _save(cf):
+    with io.BytesIO() as out:
+        cf.save(out)
+        return out.getvalue()
+
+
+def test_descriptor_types():
+    assert descriptor_types('(ILjava/lang/String;[[Lcom/Lx;J)V') == [
+        'java/lang/String',
+        'com/Lx'
+    ]
+    assert signature_types(
+        '<K:Ljava/lang/Object;V::Ljava/lang/Comparable<TV;>;>'
+        'Ljava/util/AbstractMap<TK;TV;>;Ljava/io/Serializable;'
+    ) == [
+        'java/lang/Object',
+        'java/lang/Comparable',
+        'java/util/AbstractMap',
+        'java/io/Serializable'
+    ]
+    assert signature_types(
+        '<T:Ljava/lang/Object;>(Ljava/util/List<+TT;>;[TT;[I)'
+        'Lcom/Outer<TT;>.Inner<*>;^Ljava/io/IOException;^TE;'
+    ) == [
+        'java/lang/Object',
+        'java/util/List',
+        'com/Outer$Inner',
+        'java/io/IOException'
+    ]
+
+
+def test_dependency_graph():
+    graph = DependencyGraph()
+    graph.add_class('A', ['B', 'java/lang/Object'])
+    graph.add_class('B', ['C'])
+    graph.add_class('C', ['A', 'D'])
+    graph.add_class('D', [])
+
+    assert graph.dependencies('A') == {'B', 'java/lang/Object'}
+    assert graph.dependencies('B', transitive=True) == {
+        'A', 'B', 'C', 'D', 'java/lang/Object'
+    }
+    assert graph.dependents('D') == {'C'}
+    assert graph.dependents('D', transitive=True) == {'A', 'B', 'C'}
+    assert graph.closure(['D']) == {'D'}
+    assert [sorted(c) for c in graph.cycles()] == [['A', 'B', 'C']]
+
+    components = list(graph.strongly_connected_components())
+    assert len(components) == 3
+    # Dependencies come before their dependents.
+    assert components.index(['java/lang/Object']) < components.index(
+        next(c for c in components if 'A' in c)
+    )
+
+    out = io.StringIO()
+    graph.write_json(out)
+    assert {
+        k: sorted(v) for k, v in json.loads(out.getvalue()).items()
+    } == {
+        'A': ['B', 'java/lang/Object'],
+        'B': ['C'],
+        'C': ['A', 'D'],
+        'D': []
+    }
+
+    out = io.StringIO()
+    graph.write_dot(out)
+    assert '    "C" -> "D";\n' in out.getvalue()
+
+
+def test_loader_dependency_graph():
+    cl = ClassLoader(Path(__file__).parent / 'data')
+
+    graph = cl.dependency_graph(workers=1)
+    assert sorted(graph.edges()) == sorted(
+        cl.dependency_graph(workers=2, chunksize=4).edges()
+    )
+    assert graph.dependencies('HelloWorld') == {
+        'java/lang/Object',
+        'java/lang/String',
+        'java/lang/System',
+        'java/io/PrintStream'
+    }
+
+    cf = ClassFile.create('Generic')
+    field = cf.fields.create('items', 'Ljava/util/List;')
+    signature = field.attributes.create(SignatureAttribute)
+    signature.signature = cf.constants.create_utf8(
+        'Ljava/util/List<Lcom/example/Item;>;'
+    )
+    assert class_references(ClassScan(_save(cf))) == {
+        'java/lang/Object',
+        'java/util/List',
+        'com/example/Item'
+    }
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from jawa import hooks
+from jawa.cf import ClassFile
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_hooks():
+    buff = (DATA / 'HelloWorld.class').read_bytes()
+    calls = []
+
+    def trace(event, subject):
+        calls.append(('begin', event, type(subject).__name__))
+        return lambda details: calls.append(('end', event, details))
+
+    def count(event, subject):
+        calls.append(('count', event))
+
+    for event in ('class.parse', 'attribute.load', 'code.disassemble'):
+        hooks.on(event, trace)
+    hooks.on('class.parse', count)
+    try:
+        assert hooks.enabled
+        cf = ClassFile(buff)
+        method = cf.methods.find_one(name='main')
+        list(method.code.disassemble())
+    finally:
+        for event in ('class.parse', 'attribute.load', 'code.disassemble'):
+            hooks.off(event, trace)
+        hooks.off('class.parse', count)
+
+    assert calls[:3] == [
+        ('begin', 'class.parse', 'ClassFile'),
+        ('count', 'class.parse'),
+        ('end', 'class.parse', {'classes_parsed': 1})
+    ]
+    assert ('begin', 'attribute.load', 'AttributeTable') in calls
+    assert calls[-2:] == [
+        ('begin', 'code.disassemble', 'CodeAttribute'),
+        ('end', 'code.disassemble', {})
+    ]
+
+    # Nothing is called once the hooks are removed.
+    del calls[:]
+    ClassFile(buff)
+    assert calls == []
+
+    with pytest.raises(ValueError):
+        hooks.on('class.parsed', trace)
@@ -0,0 +1,233 @@
+import io
+import os.path
+import tempfile
+import zipfile
+
+import pytest
+
+from jawa.cf import ClassFile
+from jawa.jar import JarReader, rewrite
+from jawa.classloader import ClassLoader
+
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+
+@pytest.fixture
+def jar_path():
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, 'test.jar')
+        # Prepend a launcher script, as seen on self-executing jars.
+        with open(path, 'wb') as out:
+            out.write(b'#!/bin/sh\nexec java -jar "$0" "$@"\n')
+
+        with zipfile.ZipFile(path, 'a') as zf:
+            for name, compression in (
+                    ('HelloWorld.class', zipfile.ZIP_DEFLATED),
+                    ('ArrayTest.class', zipfile.ZIP_STORED),
+                    ('TableSwitch.class', zipfile.ZIP_BZIP2)):
+                zf.write(
+                    os.path.join(DATA, name),
+                    arcname=f'com/example/{name}',
+                    compress_type=compression
+                )
+            zf.writestr('META-INF/MANIFEST.MF', 'Manifest-Version: 1.0\n')
+
+        yield path
+
+
+def test_jar_reader_matches_zipfile(jar_path):
+    with zipfile.ZipFile(jar_path) as zf, JarReader(jar_path) as jar:
+        assert jar.namelist() == zf.namelist()
+        assert len(jar) == 4
+        assert 'com/example/HelloWorld.class' in jar
+        for name in zf.namelist():
+            assert bytes(jar.read(name)) == zf.read(name)
+            assert jar.size(name) == zf.getinfo(name).file_size
+            assert jar.crc(name) == zf.getinfo(name).CRC
+
+        with pytest.raises(KeyError):
+            jar.read('Missing.class')
+
+
+def test_jar_reader_zero_copy(jar_path):
+    with JarReader(jar_path) as jar:
+        stored = jar.read('com/example/ArrayTest.class')
+        assert isinstance(stored, memoryview)
+
+        cf = ClassFile(stored)
+        assert cf.this.name == 'ArrayTest'
+        stored.release()
+
+
+def test_classloader_uses_jar_reader(jar_path):
+    cl = ClassLoader(jar_path)
+    assert isinstance(cl.path_map['com/example/HelloWorld.class'], JarReader)
+    for path in cl.classes:
+        assert cl.load(path).this.name.value == path.rsplit('/', 1)[-1]
+
+
+def _jar_bytes(entries, compression=zipfile.ZIP_DEFLATED):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', compression) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+    return out.getvalue()
+
+
+def _class(name):
+    with open(os.path.join(DATA, f'{name}.class'), 'rb') as fin:
+        return fin.read()
+
+
+def test_nested_jars():
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, 'app.jar')
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr(
+                'BOOT-INF/classes/HelloWorld.class',
+                _class('HelloWorld'),
+                compress_type=zipfile.ZIP_DEFLATED
+            )
+            zf.writestr(
+                'BOOT-INF/lib/stored.jar',
+                _jar_bytes([('ArrayTest.class', _class('ArrayTest'))]),
+                compress_type=zipfile.ZIP_STORED
+            )
+            zf.writestr(
+                'BOOT-INF/lib/deflated.jar',
+                _jar_bytes([('TableSwitch.class', _class('TableSwitch'))]),
+                compress_type=zipfile.ZIP_DEFLATED
+            )
+
+        with JarReader(path) as jar:
+            nested = jar.nested('BOOT-INF/lib/deflated.jar')
+            assert nested is jar.nested('BOOT-INF/lib/deflated.jar')
+            assert nested.filename == f'{path}!/BOOT-INF/lib/deflated.jar'
+            assert nested.namelist() == ['TableSwitch.class']
+
+        cl = ClassLoader(path)
+        for name in ('HelloWorld', 'ArrayTest', 'TableSwitch'):
+            assert name in cl
+            assert cl.load(name).this.name.value == name
+        # Only the names the JVM would resolve are on the classpath.
+        assert sorted(cl.classes) == [
+            'ArrayTest',
+            'HelloWorld',
+            'TableSwitch'
+        ]
+        assert list(cl.packages()) == ['']
+
+
+def test_multi_release_jar():
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, 'mr.jar')
+        with open(path, 'wb') as out:
+            out.write(_jar_bytes([
+                ('META-INF/MANIFEST.MF', b'Multi-Release: true\r\n'),
+                ('Foo.class', _class('HelloWorld')),
+                ('META-INF/versions/9/Foo.class', _class('ArrayTest')),
+                ('META-INF/versions/11/Foo.class', _class('TableSwitch')),
+                ('META-INF/versions/9/Bar.class', _class('LookupSwitch'))
+            ]))
+
+        for release, foo in (
+                (None, 'HelloWorld'),
+                (8, 'HelloWorld'),
+                (10, 'ArrayTest'),
+                (17, 'TableSwitch')):
+            cl = ClassLoader(path, release=release)
+            assert cl.load('Foo').this.name.value == foo
+            assert ('Bar' in cl) == (release is not None and release >= 9)
+            assert sorted(cl.classes) == (
+                ['Foo'] if release is None or release < 9 else ['Bar', 'Foo']
+            )
+            assert list(cl.packages()) == ['']
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self):
+        self.buff = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.buff += b
+        return len(b)
+
+
+def _add_field(cf):
+    if cf.this.name.value != 'HelloWorld':
+        return None
+    cf.fields.create('patched', 'I')
+    return cf
+
+
+def _rewrite_source(dir):
+    # Written to an unseekable stream, so each entry is followed by a data
+    # descriptor.
+    out = _Unseekable()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('META-INF/MANIFEST.MF', b'Manifest-Version: 1.0\n')
+        zf.writestr('HelloWorld.class', _class('HelloWorld'))
+        zf.writestr(
+            'ArrayTest.class',
+            _class('ArrayTest'),
+            compress_type=zipfile.ZIP_STORED
+        )
+        zf.writestr('notes.txt', b'untouched')
+    src = os.path.join(dir, 'app.jar')
+    with open(src, 'wb') as fout:
+        fout.write(out.buff)
+    return src
+
+
+def _fail_on_array_test(cf):
+    if cf.this.name.value == 'ArrayTest':
+        raise ValueError('transform failed')
+    return cf
+
+
+def test_rewrite():
+    with tempfile.TemporaryDirectory() as dir:
+        src = _rewrite_source(dir)
+
+        outputs = []
+        for workers in (1, 2):
+            dst = os.path.join(dir, f'patched-{workers}.jar')
+            assert rewrite(src, dst, _add_field, workers=workers) == [
+                'HelloWorld.class'
+            ]
+            with open(dst, 'rb') as fin:
+                outputs.append(fin.read())
+        assert outputs[0] == outputs[1]
+
+        with zipfile.ZipFile(src) as before, zipfile.ZipFile(dst) as after:
+            assert after.testzip() is None
+            assert after.namelist() == before.namelist()
+            for name in ('META-INF/MANIFEST.MF', 'ArrayTest.class',
+                         'notes.txt'):
+                assert after.getinfo(name).CRC == before.getinfo(name).CRC
+                assert after.read(name) == before.read(name)
+            cf = ClassFile(io.BytesIO(after.read('HelloWorld.class')))
+            assert cf.fields.find_one(name='patched') is not None
+
+        # Untouched entries are copied verbatim.
+        with JarReader(src) as before, JarReader(dst) as after:
+            assert before._flags[3] & 0x8
+            for idx in (0, 2, 3):
+                assert bytes(after._raw_local(idx)) == bytes(
+                    before._raw_local(idx)
+                )
+
+
+def test_rewrite_transform_raises():
+    with tempfile.TemporaryDirectory() as dir:
+        src = _rewrite_source(dir)
+        for workers in (1, 2):
+            # The transform's own exception is raised, even though entries
+            # copied before it are still views into the source.
+            dst = os.path.join(dir, f'failed-{workers}.jar')
+            with pytest.raises(ValueError, match='transform failed'):
+                rewrite(src, dst, _fail_on_array_test, workers=workers)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import zipfile
+import tempfile
+from pathlib import Path
+
+from jawa.cf import ClassFile
+from jawa.classloader import ClassLoader
+from jawa.parse_cache import ParseCache
+
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_parse_cache_round_trip():
+    with tempfile.TemporaryDirectory() as dir:
+        jar = os.path.join(dir, 'test.jar')
+        with zipfile.ZipFile(jar, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.write(DATA / 'HelloWorld.class', arcname='HelloWorld.class')
+        shutil.copy(DATA / 'ArrayTest.class', dir)
+
+        db = os.path.join(dir, 'cache.db')
+        loader = ClassLoader(jar, dir, parse_cache=db)
+        for path in ('HelloWorld', 'ArrayTest'):
+            summary = loader.summary(path)
+            assert summary.this == path
+            assert summary.super_ == 'java/lang/Object'
+            assert loader.dependencies(path) == ClassLoader(
+                jar, dir).dependencies(path)
+        hello = loader.summary('HelloWorld')
+        assert 'Hello World!' in hello.strings
+        loader.parse_cache.close()
+
+        # A fresh loader gets its summaries without reading the entries.
+        loader = ClassLoader(jar, dir, parse_cache=db)
+        loader._read = None
+        assert loader.summary('HelloWorld') == hello
+        assert len(loader.parse_cache) == 2
+
+        # Replacing the class makes the old summary stale.
+        cf = ClassFile.create('HelloWorld')
+        with zipfile.ZipFile(jar, 'w') as zf:
+            with zf.open('HelloWorld.class', 'w') as out:
+                cf.save(out)
+
+        with ParseCache(db) as cache:
+            assert cache.compact() == 1
+            assert len(cache) == 1
+            loose = os.path.join(dir, 'ArrayTest.class')
+            assert cache.invalidate(source=loose) == 1
+            assert len(cache) == 0
+
+
+def test_parse_cache_multi_release():
+    with tempfile.TemporaryDirectory() as dir:
+        jar = os.path.join(dir, 'mr.jar')
+        with zipfile.ZipFile(jar, 'w') as zf:
+            zf.writestr('META-INF/MANIFEST.MF', b'Multi-Release: true\r\n')
+            zf.write(DATA / 'HelloWorld.class', arcname='Foo.class')
+            zf.write(
+                DATA / 'ArrayTest.class',
+                arcname='META-INF/versions/11/Foo.class'
+            )
+
+        db = os.path.join(dir, 'cache.db')
+        for release, this in ((None, 'HelloWorld'), (17, 'ArrayTest')):
+            loader = ClassLoader(jar, release=release, parse_cache=db)
+            assert loader.summary('Foo').this == this
+            loader.parse_cache.close()
+
+        # Both summaries still match the entry they were built from.
+        with ParseCache(db) as cache:
+            assert len(cache) == 2
+            assert cache.compact() == 0
+            assert len(cache) == 2
+
+
+def test_parse_cache_invalidate_source():
+    with tempfile.TemporaryDirectory() as dir:
+        jar = os.path.join(dir, 'app_1.jar')
+        with zipfile.ZipFile(jar, 'w') as zf:
+            zf.write(DATA / 'HelloWorld.class', arcname='HelloWorld.class')
+            inner = os.path.join(dir, 'inner.jar')
+            with zipfile.ZipFile(inner, 'w') as nested:
+                nested.write(
+                    DATA / 'ArrayTest.class',
+                    arcname='ArrayTest.class'
+                )
+            zf.write(inner, arcname='BOOT-INF/lib/inner.jar')
+
+        db = os.path.join(dir, 'cache.db')
+        for release in (None, 11):
+            loader = ClassLoader(jar, release=release, parse_cache=db)
+            for path in ('HelloWorld', 'ArrayTest'):
+                loader.summary(path)
+            loader.parse_cache.close()
+
+        with ParseCache(db) as cache:
+            assert len(cache) == 4
+            # Only exact matches, not other sources sharing a prefix.
+            assert cache.invalidate(source=os.path.join(dir, 'app')) == 0
+            assert cache.invalidate(source=os.path.join(dir, 'appX1.jar')) == 0
+            # Every release, and every archive nested in the jar.
+            assert cache.invalidate(source=jar) == 4
+            assert len(cache) == 0
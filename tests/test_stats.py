@@ -0,0 +1,60 @@
+import os.path
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from jawa import hooks, stats
+from jawa.cf import ClassFile
+from jawa.classloader import ClassLoader
+
+DATA = Path(__file__).parent / 'data'
+
+
+def test_collect():
+    buff = (DATA / 'HelloWorld.class').read_bytes()
+    events = []
+
+    with stats.collect(callback=lambda *args: events.append(args)) as s:
+        assert hooks.enabled
+        cf = ClassFile(buff)
+        assert s.counters['attributes_loaded'] == 0
+        list(cf.attributes)
+
+    # Nothing is recorded once the block exits.
+    ClassFile(buff)
+
+    assert s.counters['classes_parsed'] == 1
+    assert s.counters['constants_decoded'] == cf.constants.raw_count - 1
+    assert s.counters['attributes_loaded'] == len(cf.attributes)
+    assert s.times['parse'] >= s.times['constants'] > 0
+    assert [e[0] for e in events][:2] == ['constants', 'parse']
+    assert s.as_dict()['classes_parsed'] == 1
+
+
+def test_instrumented_classloader():
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, 'test.jar')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.write(DATA / 'HelloWorld.class', 'HelloWorld.class')
+            compressed = zf.getinfo('HelloWorld.class').compress_size
+
+        with pytest.raises(RuntimeError):
+            ClassLoader(path).stats()
+
+        loader = ClassLoader(path, instrument=True)
+        cf = loader.load('HelloWorld')
+        # Loaded outside of any ClassLoader call, but still counted.
+        list(cf.attributes)
+
+        result = loader.stats()
+        assert result.counters['classes_parsed'] == 1
+        assert result.counters['entries_inflated'] == 1
+        assert result.counters['bytes_read'] == compressed
+        assert result.counters['attributes_loaded'] == len(cf.attributes)
+        assert result.times['read'] >= result.times['inflate'] > 0
+
+        # Cached classes aren't read or parsed again.
+        loader.load('HelloWorld')
+        assert loader.stats().counters['classes_parsed'] == 1
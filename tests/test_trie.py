@@ -0,0 +1,32 @@
+from jawa.util.trie import PackageTrie
+
+
+def test_package_trie():
+    trie = PackageTrie()
+    for name in ('java/util/List', 'java/util/Map',
+                 'java/util/concurrent/Future', 'Main'):
+        trie.add(name)
+    trie.add('java/util/List')
+
+    assert len(trie) == 4
+    assert 'java/util/Map' in trie
+    assert 'java/util/Set' not in trie
+    assert 'java/Map' not in trie
+    assert sorted(trie.packages()) == [
+        '',
+        'java/util',
+        'java/util/concurrent'
+    ]
+    assert trie.classes_in('java/util') == {'java/util/List', 'java/util/Map'}
+    assert trie.classes_in('java', recursive=True) == {
+        'java/util/List',
+        'java/util/Map',
+        'java/util/concurrent/Future'
+    }
+    assert trie.classes_in('') == {'Main'}
+    assert trie.classes_in('javax') == set()
+
+    trie.remove('java/util/concurrent/Future')
+    assert sorted(trie.packages()) == ['', 'java/util']
+    assert trie.classes_in('java/util/concurrent') == set()
+    assert len(trie) == 3